@@ -0,0 +1,121 @@
+"""Pack old meetings, response evaluations and reports into compressed monthly bundles.
+
+Usage: python -m core.archive [--older-than-days N] [--dry-run]
+
+Archived items stay visible in History, Reports and Strategy: core.storage reads
+them back from the bundles through the offset index.
+"""
+# Imports
+import argparse
+import json
+import os
+import zlib
+from datetime import datetime, timedelta
+
+from core.config import ARCHIVE_CONFIG
+from core.fileio import atomic_write_text
+from core.storage import (
+    STORES,
+    archive_paths,
+    index_bundle_path,
+    legacy_entries,
+    load_archive_index,
+    parse_stored_timestamp,
+    sharded_entries,
+    sidecar_paths
+)
+
+
+def find_archivable(kind, cutoff):
+    """Plain-file entries of a kind that started before the cutoff, grouped by month"""
+    by_month = {}
+    for entry in list(sharded_entries(kind)) + list(legacy_entries(kind)):
+        modified = entry["path"].stat().st_mtime
+        started = parse_stored_timestamp(entry["timestamp"]) or datetime.fromtimestamp(modified)
+        if started >= cutoff:
+            continue
+        entry["modified"] = modified
+        by_month.setdefault(started.strftime("%Y-%m"), []).append(entry)
+    return by_month
+
+
+def pack_month(kind, month, entries):
+    """Append entries to the month's bundle, then publish the index, then drop the originals"""
+    _, index_path = archive_paths(kind, month)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index = load_archive_index(index_path)
+    bundle_path = index_bundle_path(index_path, index)
+    items = list(index["items"])
+    archived = {(item["customer"], item["name"]) for item in items}
+
+    packed = []
+    with open(bundle_path, "ab") as bundle:
+        for entry in entries:
+            if (entry["customer"], entry["name"]) in archived:
+                # Already packed by an earlier run that stopped before deleting the file
+                packed.append(entry)
+                continue
+            content = entry["path"].read_bytes()
+            if kind == "meeting":
+                try:
+                    content = json.dumps(json.loads(content), separators=(",", ":")).encode("utf-8")
+                except ValueError:
+                    pass
+            compressed = zlib.compress(content, 9)
+            items.append({
+                "customer": entry["customer"],
+                "meeting_id": entry["meeting_id"],
+                "timestamp": entry["timestamp"],
+                "name": entry["name"],
+                "modified": entry["modified"],
+                "offset": bundle.tell(),
+                "length": len(compressed)
+            })
+            bundle.write(compressed)
+            packed.append(entry)
+        bundle.flush()
+        os.fsync(bundle.fileno())
+
+    atomic_write_text(index_path, json.dumps({**index, "items": items}))
+
+    for entry in packed:
+        entry["path"].unlink()
+        for sidecar in sidecar_paths(entry["path"]):
+            sidecar.unlink(missing_ok=True)
+        remove_empty_shards(kind, entry["path"].parent)
+    return len(packed)
+
+
+def remove_empty_shards(kind, directory):
+    """Remove month/year/customer shard directories left empty after archiving"""
+    base, _ = STORES[kind]
+    while directory != base and base in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            return
+        directory = directory.parent
+
+
+def archive_old_items(older_than_days, dry_run=False):
+    """Archive every item older than the given age; returns the number of items packed"""
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    total = 0
+    for kind in STORES:
+        for month, entries in sorted(find_archivable(kind, cutoff).items()):
+            print(f"{'would pack' if dry_run else 'pack'}: {len(entries)} {kind} items into {month}")
+            total += len(entries) if dry_run else pack_month(kind, month, entries)
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old meeting data into monthly bundles")
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=ARCHIVE_CONFIG["archive_after_days"],
+        help="Archive items from meetings that started more than this many days ago"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only print what would be archived")
+    args = parser.parse_args()
+    print(f"{archive_old_items(args.older_than_days, dry_run=args.dry_run)} items archived")
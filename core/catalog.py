@@ -0,0 +1,198 @@
+"""Save, validate and bulk import customer profiles and projects.
+
+Usage: python -m core.catalog {profile,project} SOURCE [--overwrite] [--dry-run]
+
+SOURCE is a directory of .txt files, a .zip/.tar(.gz) archive of them, or a CSV
+with name and content columns.
+"""
+# Imports
+import argparse
+import csv
+import io
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from core.config import CUSTOMERS_DIR, PROFILE_EXTENSION, PROJECTS_DIR, PROJECT_EXTENSION
+from core.fileio import atomic_write_text
+from core.prompt_cache import compile_meeting_prompts, invalidate_meeting_prompt
+
+# Files are validated and written concurrently so their writes share group commits
+IMPORT_WORKERS = 8
+
+# A profile starts with either heading; the shipped profiles use "# YOUR IDENTITY"
+PROFILE_HEADERS = ("CUSTOMER PROFILE:", "# YOUR IDENTITY")
+PROFILE_FIELDS = ("Name:", "Role:")
+PROJECT_HEADER = "PROJECT SPECIFICATION:"
+PROJECT_SECTIONS = ("Objective:",)
+
+
+def safe_filename(name):
+    """File name stem with only letters, digits, spaces, dashes and underscores"""
+    return "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).strip()
+
+
+def profile_path(profile_name):
+    return CUSTOMERS_DIR / f"{safe_filename(profile_name)}{PROFILE_EXTENSION}"
+
+
+def project_path(project_name):
+    return PROJECTS_DIR / f"{safe_filename(project_name)}{PROJECT_EXTENSION}"
+
+
+def save_customer_profile(profile_name, content, refresh_prompts=True):
+    """Save a customer profile; recompiles its meeting prompt unless the caller batches that"""
+    path = profile_path(profile_name)
+    atomic_write_text(path, content)
+    if refresh_prompts:
+        invalidate_meeting_prompt(path.stem)
+        compile_meeting_prompts([path.stem])
+    return path
+
+
+def save_project(project_name, content):
+    """Save a project specification"""
+    path = project_path(project_name)
+    atomic_write_text(path, content)
+    return path
+
+
+def _field_value(lines, prefix):
+    return next((line[len(prefix):].strip() for line in lines if line.startswith(prefix)), None)
+
+
+def validate_profile(content):
+    """Problems with a profile's structure; empty when it is valid"""
+    lines = [line.strip() for line in content.splitlines()]
+    errors = []
+    if not any(line.startswith(PROFILE_HEADERS) for line in lines):
+        errors.append(f"missing {' or '.join(PROFILE_HEADERS)} heading")
+    for field in PROFILE_FIELDS:
+        if not _field_value(lines, field):
+            errors.append(f"missing {field} field")
+    return errors
+
+
+def validate_project(content):
+    """Problems with a project's structure; empty when it is valid"""
+    lines = [line.strip() for line in content.splitlines()]
+    errors = []
+    if not _field_value(lines, PROJECT_HEADER):
+        errors.append(f"missing {PROJECT_HEADER} heading with a project name")
+    for section in PROJECT_SECTIONS:
+        if section not in lines:
+            errors.append(f"missing {section} section")
+    return errors
+
+
+KINDS = {
+    "profile": {"validate": validate_profile, "path": profile_path},
+    "project": {"validate": validate_project, "path": project_path}
+}
+
+
+def read_upload(filename, data):
+    """(name, content) pairs from one .txt, .csv, .zip or .tar(.gz) file given as bytes"""
+    suffixes = "".join(Path(filename).suffixes).lower()
+    if suffixes.endswith(".zip"):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            for member in archive.infolist():
+                if not member.is_dir() and member.filename.endswith(".txt"):
+                    yield Path(member.filename).stem, archive.read(member).decode("utf-8")
+    elif suffixes.endswith((".tar", ".tar.gz", ".tgz")):
+        with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+            for member in archive.getmembers():
+                if member.isfile() and member.name.endswith(".txt"):
+                    yield Path(member.name).stem, archive.extractfile(member).read().decode("utf-8")
+    elif suffixes.endswith(".csv"):
+        for row in csv.DictReader(io.StringIO(data.decode("utf-8-sig"))):
+            yield (row.get("name") or "").strip(), row.get("content") or ""
+    else:
+        yield Path(filename).stem, data.decode("utf-8")
+
+
+def read_source(source):
+    """(name, content) pairs from a directory of .txt files or a single import file"""
+    source = Path(source)
+    if source.is_dir():
+        for path in sorted(source.glob("*.txt")):
+            yield path.stem, path.read_text()
+    else:
+        yield from read_upload(source.name, source.read_bytes())
+
+
+def _import_one(kind, name, content, existing, overwrite, dry_run):
+    """Validate one item and write it when valid; returns its result row"""
+    errors = [] if safe_filename(name) else ["missing name"]
+    errors += KINDS[kind]["validate"](content)
+    path = KINDS[kind]["path"](name) if not errors else None
+    if errors:
+        status = "invalid"
+    elif path.stem in existing and not overwrite:
+        status = "exists"
+    elif dry_run:
+        status = "valid"
+    else:
+        if kind == "profile":
+            save_customer_profile(name, content, refresh_prompts=False)
+        else:
+            save_project(name, content)
+        status = "imported"
+    return {"name": name, "file": path.name if path else "", "status": status, "errors": "; ".join(errors)}
+
+
+def bulk_import(kind, items, overwrite=False, dry_run=False):
+    """Validate and save (name, content) pairs in parallel; returns one result row per item,
+    in input order.
+
+    Meeting prompts of imported profiles are invalidated and recompiled once for the whole batch.
+    """
+    directory = CUSTOMERS_DIR if kind == "profile" else PROJECTS_DIR
+    existing = {path.stem for path in directory.glob("*.txt")}
+    items = list(items)
+
+    # Later duplicates of a name within one import replace earlier ones, which are
+    # reported as duplicates instead of being written
+    last = {}
+    for index, (name, _) in enumerate(items):
+        # Items without a usable name are each reported invalid
+        last[safe_filename(name) or index] = index
+    kept = sorted(last.values())
+
+    with ThreadPoolExecutor(max_workers=IMPORT_WORKERS) as pool:
+        imported = dict(zip(kept, pool.map(
+            lambda index: _import_one(kind, *items[index], existing, overwrite, dry_run),
+            kept
+        )))
+    results = [
+        imported.get(index) or {
+            "name": name,
+            "file": KINDS[kind]["path"](name).name,
+            "status": "duplicate",
+            "errors": f"replaced by item {last[safe_filename(name)] + 1} with the same name"
+        }
+        for index, (name, _) in enumerate(items)
+    ]
+
+    if kind == "profile":
+        imported = [Path(row["file"]).stem for row in results if row["status"] == "imported"]
+        for profile in imported:
+            invalidate_meeting_prompt(profile)
+        if imported:
+            compile_meeting_prompts(imported)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import customer profiles or projects")
+    parser.add_argument("kind", choices=list(KINDS))
+    parser.add_argument("source", type=Path, help="Directory, .zip/.tar(.gz) archive or CSV (name, content)")
+    parser.add_argument("--overwrite", action="store_true", help="Replace existing files with the same name")
+    parser.add_argument("--dry-run", action="store_true", help="Only validate")
+    args = parser.parse_args()
+    results = bulk_import(args.kind, read_source(args.source), overwrite=args.overwrite, dry_run=args.dry_run)
+    for row in results:
+        print(f"{row['status']:>8}  {row['name']}  {row['errors']}")
+    print(f"{sum(row['status'] in ('imported', 'valid') for row in results)} of {len(results)} {args.kind}s "
+          f"{'valid' if args.dry_run else 'imported'}")
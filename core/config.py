@@ -10,14 +10,22 @@ load_dotenv(env_path)
 
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data"
+DATA_DIR = Path(os.getenv("PITCH_PERFECT_DATA_DIR", BASE_DIR / "data"))
 PROJECTS_DIR = DATA_DIR / "projects"
 MEETINGS_DIR = DATA_DIR / "meetings"
 MEETING_EVALUATIONS_DIR = DATA_DIR / "meeting_evaluations"
 RESPONSE_EVALUATIONS_DIR = DATA_DIR / "response_evaluations"
 STRATEGIES_DIR = DATA_DIR / "strategies"
+METRICS_DIR = DATA_DIR / "metrics"
+ARCHIVE_DIR = DATA_DIR / "archive"
+PROMPT_HISTORY_DIR = DATA_DIR / "prompt_history"
+REEVALUATIONS_DIR = DATA_DIR / "reevaluations"
+PROMPT_SNAPSHOTS_DIR = DATA_DIR / "prompt_snapshots"
 PROMPTS_DIR = BASE_DIR / "prompts"
 CUSTOMERS_DIR = BASE_DIR / "customers"
+# Shared by the Streamlit workers of one host: SQLite's WAL mode needs shared memory, so the
+# file must be on a local disk, never on a network share used by workers on other hosts
+SESSION_STORE_PATH = Path(os.getenv("PITCH_PERFECT_SESSION_DB", DATA_DIR / "sessions.db"))
 
 # Create directories if they don't exist (with parents=True)
 PROJECTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -25,6 +33,11 @@ MEETINGS_DIR.mkdir(parents=True, exist_ok=True)
 MEETING_EVALUATIONS_DIR.mkdir(parents=True, exist_ok=True)
 RESPONSE_EVALUATIONS_DIR.mkdir(parents=True, exist_ok=True)
 STRATEGIES_DIR.mkdir(parents=True, exist_ok=True)
+METRICS_DIR.mkdir(parents=True, exist_ok=True)
+ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+PROMPT_HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+REEVALUATIONS_DIR.mkdir(parents=True, exist_ok=True)
+PROMPT_SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
 PROMPTS_DIR.mkdir(parents=True, exist_ok=True)
 CUSTOMERS_DIR.mkdir(parents=True, exist_ok=True)
 # File extensions
@@ -32,6 +45,13 @@ PROJECT_EXTENSION = ".txt"
 PROFILE_EXTENSION = ".txt"
 MEETING_EXTENSION = ".json"
 REPORT_EXTENSION = ".txt"
+METRICS_EXTENSION = ".jsonl"
+ARCHIVE_BUNDLE_EXTENSION = ".bundle"
+ARCHIVE_INDEX_EXTENSION = ".index.json"
+TRANSCRIPT_INDEX_EXTENSION = ".turns"
+
+# Number of turns History shows at once; earlier turns are loaded on demand
+TRANSCRIPT_WINDOW_SIZE = 20
 
 # API Key - Check environment variables first, then Streamlit secrets
 ANTHROPIC_API_KEY = (
@@ -67,4 +87,184 @@ MODEL_CONFIG = {
         "temperature": 0.7,
         "max_tokens": 1500
     }
-}
\ No newline at end of file
+}
+
+# Evaluation output: "structured" records scores through a tool call with compact
+# fields and renders the readable text locally; "text" asks for the free-text format.
+# Cadence: "every_turn" grades each vendor message as it is sent, "every_n_turns"
+# grades pending turns in one batched call every cadence_turns turns, "deferred"
+# grades them all in one batched call when the meeting is frozen.
+# Rolling: a draft meeting evaluation is updated in the background after every turn,
+# so freezing only folds in the turns the latest update missed; finalization waits at
+# most rolling_finalize_wait_s for an update still running.
+EVALUATION_CONFIG = {
+    "output": os.getenv("PITCH_PERFECT_EVALUATION_OUTPUT", "structured"),
+    "structured_max_tokens": {
+        "response_evaluation": 500,
+        "meeting_evaluation": 1000
+    },
+    "cadence": os.getenv("PITCH_PERFECT_EVALUATION_CADENCE", "every_turn"),
+    "cadence_turns": int(os.getenv("PITCH_PERFECT_EVALUATION_CADENCE_TURNS", 3)),
+    "batch_max_tokens": 4000,
+    "rolling": os.getenv("PITCH_PERFECT_ROLLING_EVALUATION", "1") != "0",
+    "rolling_finalize_wait_s": 3,
+    "rolling_workers": 4
+}
+
+# One-token request that opens the connection and writes the meeting prompt to the
+# prompt cache before the first turn; must use the chat model to share its cache
+MODEL_CONFIG["prewarm"] = {**MODEL_CONFIG["chat"], "max_tokens": 1}
+
+# Model routing: each mode tries its tiers in order. A tier that has not started
+# answering within its latency target, or fails with a timeout, overload or rate
+# limit, hands the call to the next tier and is skipped for cooldown_seconds.
+# The last tier waits with the client's default timeout and retries.
+MODEL_ROUTING = {
+    "tiers": {
+        "chat": [
+            {"model": MODEL_CONFIG["chat"]["model"], "latency_target_s": 8},
+            {"model": "claude-3-5-haiku-latest", "latency_target_s": 15}
+        ],
+        # Shares the chat model's prompt cache, so it never falls back
+        "prewarm": [
+            {"model": MODEL_CONFIG["prewarm"]["model"], "latency_target_s": 10}
+        ],
+        "response_evaluation": [
+            {"model": "claude-3-5-haiku-latest", "latency_target_s": 8},
+            {"model": MODEL_CONFIG["response_evaluation"]["model"], "latency_target_s": 20}
+        ],
+        "meeting_evaluation": [
+            {"model": MODEL_CONFIG["meeting_evaluation"]["model"], "latency_target_s": 20},
+            {"model": "claude-3-5-haiku-latest", "latency_target_s": 30}
+        ],
+        "strategy": [
+            {"model": MODEL_CONFIG["strategy"]["model"], "latency_target_s": 20},
+            {"model": "claude-3-5-haiku-latest", "latency_target_s": 30}
+        ]
+    },
+    "cooldown_seconds": 60,
+    # HTTP statuses that move a call to the next tier (429 rate limited, 5xx and 529 overloaded)
+    "fallback_status_codes": [429, 500, 502, 503, 504, 529]
+}
+
+# Hedged chat replies (opt-in): when no first token arrives within the ttft_percentile
+# of recent chat time-to-first-token, clamped to [min_deadline_s, max_deadline_s], a
+# duplicate request is sent; the first to start streaming wins and the other is cancelled.
+# Until min_samples replies have been timed the deadline is default_deadline_s.
+HEDGING_CONFIG = {
+    "enabled": os.getenv("PITCH_PERFECT_HEDGE_CHAT", "0") == "1",
+    "ttft_percentile": 0.95,
+    "min_samples": 20,
+    "sample_size": 200,
+    "default_deadline_s": 3.0,
+    "min_deadline_s": 1.0,
+    "max_deadline_s": 6.0
+}
+
+# Prompt size budget: Settings and the profile viewer warn when a profile's assembled
+# meeting system prompt, re-sent on every chat turn, exceeds meeting_prompt_max_tokens.
+# Meeting cost is projected for projected_turns exchanges of turn_tokens each.
+PROMPT_BUDGET_CONFIG = {
+    "meeting_prompt_max_tokens": int(os.getenv("PITCH_PERFECT_MEETING_PROMPT_MAX_TOKENS", 4000)),
+    "projected_turns": 10,
+    "turn_tokens": 250
+}
+
+# Number of Streamlit worker processes sharing the API key
+WORKER_COUNT = max(1, int(os.getenv("PITCH_PERFECT_WORKERS", 1)))
+
+# API key limits; a share can be set aside for offline batch jobs such as core.reevaluate
+ACCOUNT_RATE_LIMITS = {
+    "requests_per_minute": int(os.getenv("ANTHROPIC_REQUESTS_PER_MINUTE", 50)),
+    "tokens_per_minute": int(os.getenv("ANTHROPIC_TOKENS_PER_MINUTE", 40000))
+}
+BATCH_RATE_SHARE = min(0.9, max(0.0, float(os.getenv("PITCH_PERFECT_BATCH_RATE_SHARE", 0))))
+
+# Shared API rate limits (one key serves every session on the server), split across workers
+RATE_LIMIT_CONFIG = {
+    **{
+        limit: max(1, int(value * (1 - BATCH_RATE_SHARE)) // WORKER_COUNT)
+        for limit, value in ACCOUNT_RATE_LIMITS.items()
+    },
+    # Lower number is served first
+    "priorities": {
+        "chat": 0,
+        "prewarm": 1,
+        "response_evaluation": 1,
+        "meeting_evaluation": 2,
+        "strategy": 2,
+        # Token counts only take spare capacity (see core.prompt_cache.count_tokens)
+        "count_tokens": 3
+    }
+}
+
+# Durable writes: concurrent saves arriving within the window share one commit
+WRITE_CONFIG = {
+    "group_commit_window_ms": 2,
+    "fsync": os.getenv("PITCH_PERFECT_FSYNC", "1") != "0"
+}
+
+# Offline re-evaluation of saved meetings after an evaluation prompt edit
+# Without a batch share the job takes one worker's split, so count it in PITCH_PERFECT_WORKERS
+REEVALUATION_CONFIG = {
+    "workers": int(os.getenv("PITCH_PERFECT_REEVALUATION_WORKERS", 8)),
+    "rate_limits": {
+        limit: max(1, int(value * BATCH_RATE_SHARE)) if BATCH_RATE_SHARE else RATE_LIMIT_CONFIG[limit]
+        for limit, value in ACCOUNT_RATE_LIMITS.items()
+    }
+}
+
+# Panel meetings: the rep meets several customer profiles at once; every panelist is
+# asked concurrently on each vendor turn
+PANEL_CONFIG = {
+    "min_panelists": 2,
+    "max_panelists": 5
+}
+
+# Meet renders the conversation once per page run and only newer messages in the chat
+# fragment; past this many newer messages the fragment triggers one full page run
+FRAGMENT_CONFIG = {
+    "meet_tail_messages": 20
+}
+
+# File contents shared across sessions instead of being copied into each session's state
+CONTENT_CACHE_CONFIG = {
+    "max_bytes": int(os.getenv("PITCH_PERFECT_CONTENT_CACHE_MB", 64)) * 2 ** 20
+}
+
+# Directory listings: stats and file reads of a listing run on a shared pool of workers,
+# with at most max_in_flight files loaded ahead of the page consuming them
+SCAN_CONFIG = {
+    "workers": int(os.getenv("PITCH_PERFECT_SCAN_WORKERS", 16)),
+    "max_in_flight": 64
+}
+
+# Archive tier: meetings, evaluations and reports older than this are packed into monthly bundles
+ARCHIVE_CONFIG = {
+    "archive_after_days": int(os.getenv("PITCH_PERFECT_ARCHIVE_AFTER_DAYS", 180))
+}
+
+# Retention: meetings matching any enabled policy (None disables it) are deleted or archived
+# together with their evaluations and report; see python -m core.retention
+RETENTION_CONFIG = {
+    "max_age_days": os.getenv("PITCH_PERFECT_RETENTION_MAX_AGE_DAYS"),
+    "max_mb": os.getenv("PITCH_PERFECT_RETENTION_MAX_MB"),
+    "keep_latest": os.getenv("PITCH_PERFECT_RETENTION_KEEP_LATEST"),
+    "min_turns": os.getenv("PITCH_PERFECT_RETENTION_MIN_TURNS"),
+    "action": os.getenv("PITCH_PERFECT_RETENTION_ACTION", "archive"),
+    # Sessions of meetings left unfinished are dropped once idle this long
+    "session_max_age_days": os.getenv("PITCH_PERFECT_SESSION_MAX_AGE_DAYS", "14"),
+    # Meetings with a session saved or an item written this recently may still be running
+    "grace_hours": os.getenv("PITCH_PERFECT_RETENTION_GRACE_HOURS", "24")
+}
+for _policy in ("max_age_days", "max_mb", "keep_latest", "min_turns", "session_max_age_days", "grace_hours"):
+    RETENTION_CONFIG[_policy] = int(RETENTION_CONFIG[_policy]) if RETENTION_CONFIG[_policy] else None
+
+# Developer profiling overlay: ?profile=1 times named phases of each page run, ?profile=cprofile
+# or ?profile=pyinstrument also dumps a profiler report into dump_dir; sidebar shows a toggle
+PROFILING_CONFIG = {
+    "sidebar": os.getenv("PITCH_PERFECT_PROFILING_SIDEBAR", "0") == "1",
+    "profilers": ("cprofile", "pyinstrument"),
+    "dump_dir": METRICS_DIR / "profiles",
+    "report_lines": 30
+}
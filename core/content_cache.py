@@ -0,0 +1,94 @@
+# Imports
+import sys
+import threading
+from collections import OrderedDict, deque
+
+from core.config import CONTENT_CACHE_CONFIG, SCAN_CONFIG
+from core.fileio import file_version, stat_version
+from core.profiling import profiled
+from core.scan import scan_files, scan_pool
+from core.storage import read_entry
+
+# File contents shared by every session, keyed by path and file version so an
+# edited file is re-read. Least recently used contents are evicted past max_bytes.
+_contents = OrderedDict()
+_lock = threading.Lock()
+_stats = {"bytes": 0, "hits": 0, "misses": 0}
+
+
+def _cached(key, load):
+    """Cached value for a key, loading and storing it on a miss"""
+    with _lock:
+        if key in _contents:
+            _contents.move_to_end(key)
+            _stats["hits"] += 1
+            return _contents[key]
+        _stats["misses"] += 1
+    text = load()
+    size = sys.getsizeof(text)
+    if size > CONTENT_CACHE_CONFIG["max_bytes"]:
+        return text
+    with _lock:
+        if key not in _contents:
+            _contents[key] = text
+            _stats["bytes"] += size
+        while _stats["bytes"] > CONTENT_CACHE_CONFIG["max_bytes"]:
+            _, evicted = _contents.popitem(last=False)
+            _stats["bytes"] -= sys.getsizeof(evicted)
+    return text
+
+
+@profiled
+def read_text(path, version=None):
+    """Text of a file through the shared cache; pass the version when a stat is already at hand"""
+    version = version or file_version(path)
+    if version is None:
+        # Let the caller see the usual FileNotFoundError
+        return path.read_text()
+    return _cached(("file", str(path), version), path.read_text)
+
+
+@profiled
+def read_entry_text(entry):
+    """Text of a stored meeting item through the shared cache"""
+    archive = entry.get("archive")
+    if archive:
+        # Archived members never change in place
+        key = ("archive", str(archive["bundle"]), archive["offset"], archive["length"])
+        return _cached(key, lambda: read_entry(entry))
+    return read_text(entry["path"])
+
+
+def _load(path, stat, parse):
+    item = {"path": path, "stat": stat, "version": stat_version(stat)}
+    item["text"] = read_text(path, item["version"])
+    item["parsed"] = parse(item) if parse else None
+    return item
+
+
+def load_files(directory, suffix, parse=None):
+    """Yield the files of a directory ending in suffix with their stat, version and text, in name order.
+
+    Reads go through the shared cache and run on the scan pool, together with parse(item)
+    when given, whose result is the item's "parsed". At most max_in_flight files are
+    loaded ahead of the caller, so memory stays bounded however large the directory.
+    """
+    pending = deque()
+    for path, stat in scan_files(directory, suffix):
+        pending.append(scan_pool.submit(_load, path, stat, parse))
+        if len(pending) >= SCAN_CONFIG["max_in_flight"]:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def cache_stats():
+    """Entries, size and hit counts of the shared content cache"""
+    with _lock:
+        return {
+            "entries": len(_contents),
+            "bytes": _stats["bytes"],
+            "max_bytes": CONTENT_CACHE_CONFIG["max_bytes"],
+            "hits": _stats["hits"],
+            "misses": _stats["misses"]
+        }
@@ -0,0 +1,289 @@
+# Imports
+from core.config import EVALUATION_CONFIG, PROMPTS_DIR
+from core.llm import create_message
+from core.strings import (
+    CHAT_BATCH_TURN_HEADER,
+    CHAT_CUSTOMER_CONTEXT,
+    CHAT_CUSTOMER_PREVIOUS_MESSAGE,
+    CHAT_INITIAL_VENDOR_PITCH,
+    CHAT_ROLLING_CONTEXT,
+    CHAT_ROLLING_TURN_EVALUATION,
+    CHAT_VENDOR_RESPONSE,
+    FREEZE_COMMAND
+)
+
+# Tool schemas the evaluation models fill in when output is "structured"
+_SCORE = {"type": "integer", "minimum": 1, "maximum": 5}
+_SHORT_LIST = {"type": "array", "items": {"type": "string"}, "maxItems": 3}
+_RESPONSE_CRITERIA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "criterion": {"type": "string"},
+            "observation": {"type": "string"},
+            "evidence": {"type": "string"},
+            "score": _SCORE
+        },
+        "required": ["criterion", "observation", "evidence", "score"]
+    }
+}
+
+EVALUATION_TOOLS = {
+    "response_evaluation": {
+        "name": "record_response_evaluation",
+        "description": "Record the customer's evaluation of the vendor's latest response.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "criteria": _RESPONSE_CRITERIA
+            },
+            "required": ["criteria"]
+        }
+    },
+    "meeting_evaluation": {
+        "name": "record_meeting_evaluation",
+        "description": "Record the customer's evaluation of the whole meeting.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "criteria": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "criterion": {"type": "string"},
+                            "observations": _SHORT_LIST,
+                            "evidence": _SHORT_LIST,
+                            "strengths": _SHORT_LIST,
+                            "improvements": _SHORT_LIST,
+                            "score": _SCORE
+                        },
+                        "required": ["criterion", "observations", "evidence", "score"]
+                    }
+                },
+                "overall_score": _SCORE,
+                "recommendations": _SHORT_LIST
+            },
+            "required": ["criteria", "overall_score", "recommendations"]
+        }
+    }
+}
+
+
+# Several vendor turns graded in one call, one entry per numbered turn
+BATCHED_RESPONSE_EVALUATION_TOOL = {
+    "name": "record_turn_evaluations",
+    "description": "Record the customer's evaluation of each numbered vendor response separately.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "turns": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "turn": {"type": "integer"},
+                        "criteria": _RESPONSE_CRITERIA
+                    },
+                    "required": ["turn", "criteria"]
+                }
+            }
+        },
+        "required": ["turns"]
+    }
+}
+
+
+def structured_output_enabled():
+    """Whether evaluations are requested as tool calls instead of free text"""
+    return EVALUATION_CONFIG["output"] == "structured"
+
+
+def read_instruction(name):
+    """Read an instruction prompt appended to evaluation prompts"""
+    path = PROMPTS_DIR / f"{name}.txt"
+    return path.read_text().strip() if path.exists() else ""
+
+
+def structured_instruction():
+    """Instruction appended to an evaluation prompt to request tool output"""
+    return read_instruction("structured_evaluation_instruction")
+
+
+def response_turn_content(previous_customer_message, vendor_message):
+    """Text graded for one vendor message, in the context of the customer's previous message"""
+    context_message = (
+        CHAT_CUSTOMER_PREVIOUS_MESSAGE.format(previous_customer_message)
+        if previous_customer_message else CHAT_INITIAL_VENDOR_PITCH
+    )
+    return context_message + CHAT_VENDOR_RESPONSE.format(vendor_message)
+
+
+def conversation_turn_contents(conversation):
+    """Graded text of every vendor message in a conversation, in order"""
+    contents = []
+    previous_customer_message = None
+    previous_role = None
+    for message in conversation:
+        if message["role"] == "assistant":
+            reply = f"{message['persona']}: {message['content']}" if message.get("persona") else message["content"]
+            # Panel meetings answer one vendor message with several replies, read together
+            previous_customer_message = (
+                f"{previous_customer_message}\n\n{reply}" if previous_role == "assistant" else reply
+            )
+        elif message["role"] == "user":
+            contents.append(response_turn_content(previous_customer_message, message["content"]))
+        previous_role = message["role"]
+    return contents
+
+
+def vendor_turn_contents(conversation):
+    """Graded text of every vendor message, leaving out the freeze command"""
+    return conversation_turn_contents([
+        message for message in conversation
+        if not (message["role"] == "user" and message["content"].lower().strip() == FREEZE_COMMAND)
+    ])
+
+
+def meeting_evaluation_messages(customer_model, conversation):
+    """User messages sent to the meeting evaluation: customer context, then every vendor message"""
+    messages = [{"role": "user", "content": CHAT_CUSTOMER_CONTEXT.format(customer_model)}]
+    messages.extend({"role": "user", "content": msg["content"]} for msg in conversation if msg["role"] == "user")
+    return messages
+
+
+def rolling_evaluation_messages(customer_model, draft_text, covered, turn_contents, turn_evaluations):
+    """User message of a rolling meeting evaluation update: customer context, the evaluation of
+    the first covered vendor turns, then only the newer turns with their turn evaluations"""
+    turns = "\n\n".join(
+        CHAT_BATCH_TURN_HEADER.format(covered + i) + content + (
+            CHAT_ROLLING_TURN_EVALUATION.format(turn_evaluations[i - 1])
+            if i <= len(turn_evaluations) and turn_evaluations[i - 1] else ""
+        )
+        for i, content in enumerate(turn_contents, 1)
+    )
+    return [{"role": "user", "content": CHAT_ROLLING_CONTEXT.format(customer_model, covered, draft_text or "-") + "\n\n" + turns}]
+
+
+def _add_usage(usage, response):
+    """Accumulate a response's token usage into a caller's counter dict"""
+    if usage is None:
+        return
+    for field in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+        usage[field] = usage.get(field, 0) + (getattr(response.usage, field, None) or 0)
+
+
+def _recorded_input(response):
+    """Input of a response's forced tool call"""
+    recorded = next((block.input for block in response.content if block.type == "tool_use"), None)
+    if not isinstance(recorded, dict):
+        raise ValueError(f"evaluation returned no tool call (stop reason: {response.stop_reason})")
+    return recorded
+
+
+def _valid_score(score):
+    return isinstance(score, int) and not isinstance(score, bool) and 1 <= score <= 5
+
+
+def _complete_criteria(items, required):
+    """Criteria with every required field and a valid score; a reply cut off at max_tokens
+    can end in a partial criterion"""
+    return [
+        item for item in items or []
+        if isinstance(item, dict) and all(key in item for key in required)
+        and _valid_score(item["score"])
+    ]
+
+
+def request_structured_evaluation(mode, system, messages, persona=None, usage=None):
+    """Run an evaluation as a forced tool call and return the recorded fields"""
+    tool = EVALUATION_TOOLS[mode]
+    response = create_message(
+        mode,
+        messages,
+        system=f"{system}\n\n{structured_instruction()}",
+        persona=persona,
+        tools=[tool],
+        tool_choice={"type": "tool", "name": tool["name"]},
+        max_tokens=EVALUATION_CONFIG["structured_max_tokens"][mode]
+    )
+    _add_usage(usage, response)
+    recorded = _recorded_input(response)
+    criteria = tool["input_schema"]["properties"]["criteria"]
+    fields = dict(recorded, criteria=_complete_criteria(recorded.get("criteria"), criteria["items"]["required"]))
+    if "overall_score" in fields and not _valid_score(fields["overall_score"]):
+        fields.pop("overall_score")
+    if not isinstance(fields.get("recommendations", []), list):
+        fields.pop("recommendations")
+    if response.stop_reason == "max_tokens" and not fields["criteria"]:
+        raise ValueError(f"{mode} was cut off at max_tokens before any criterion was complete")
+    return fields
+
+
+def request_batched_response_evaluations(system, turns, persona=None, usage=None):
+    """Grade several vendor turns in one call; returns one evaluation per turn, in order"""
+    tool = BATCHED_RESPONSE_EVALUATION_TOOL
+    content = "\n\n".join(
+        CHAT_BATCH_TURN_HEADER.format(i) + turn for i, turn in enumerate(turns, 1)
+    )
+    response = create_message(
+        "response_evaluation",
+        [{"role": "user", "content": content}],
+        system="\n\n".join([system, structured_instruction(), read_instruction("batched_evaluation_instruction")]),
+        persona=persona,
+        tools=[tool],
+        tool_choice={"type": "tool", "name": tool["name"]},
+        max_tokens=min(
+            EVALUATION_CONFIG["structured_max_tokens"]["response_evaluation"] * len(turns),
+            EVALUATION_CONFIG["batch_max_tokens"]
+        )
+    )
+    _add_usage(usage, response)
+    recorded = _recorded_input(response)
+    by_turn = {item.get("turn"): item for item in recorded.get("turns") or [] if isinstance(item, dict)}
+    if response.stop_reason == "max_tokens" and not by_turn:
+        raise ValueError("response_evaluation batch was cut off at max_tokens before any turn was complete")
+    required = _RESPONSE_CRITERIA["items"]["required"]
+    return [
+        {"criteria": _complete_criteria(by_turn.get(i, {}).get("criteria"), required)}
+        for i in range(1, len(turns) + 1)
+    ]
+
+
+def _bullets(items, indent="   "):
+    """Render a list as indented dash bullets"""
+    return "\n".join(f"{indent}- {item}" for item in items or [])
+
+
+def render_response_evaluation(evaluation):
+    """Readable response evaluation in the prompt's CRITERION/OBSERVATION/EVIDENCE/SCORE format"""
+    return "\n\n".join(
+        f"CRITERION: {item.get('criterion', '-')}\n"
+        f"OBSERVATION: {item.get('observation', '-')}\n"
+        f"EVIDENCE: {item.get('evidence', '-')}\n"
+        f"SCORE: {item.get('score', '-')}/5"
+        for item in evaluation.get("criteria", [])
+    )
+
+
+def render_meeting_evaluation(evaluation):
+    """Readable meeting evaluation in the prompt's report format"""
+    sections = []
+    for item in evaluation.get("criteria", []):
+        lines = [f"CRITERION: {item.get('criterion', '-')}", "OBSERVATIONS: ", _bullets(item.get("observations"))]
+        lines += ["EVIDENCE: ", _bullets(item.get("evidence"))]
+        if item.get("strengths"):
+            lines += ["STRENGTHS:", _bullets(item["strengths"])]
+        if item.get("improvements"):
+            lines += ["AREAS FOR IMPROVEMENT:", _bullets(item["improvements"])]
+        lines.append(f"SCORE: {item.get('score', '-')}/5")
+        sections.append("\n".join(lines))
+    recommendations = "\n".join(
+        f"   {i}. {text}" for i, text in enumerate(evaluation.get("recommendations") or [], 1)
+    )
+    sections.append(
+        f"OVERALL MEETING EFFECTIVENESS: {evaluation.get('overall_score', '-')}/5\n"
+        f"KEY RECOMMENDATIONS:\n{recommendations}"
+    )
+    return "\n\n".join(sections)
@@ -0,0 +1,181 @@
+"""Stream meetings, response evaluations and reports to CSV, Parquet or JSONL.
+
+Usage: python -m core.export [--dataset turns|response_evaluations|reports|all]
+                             [--format csv|parquet|jsonl] [--customer NAME]
+                             [--since YYYY-MM-DD] [--until YYYY-MM-DD] [--output DIR]
+
+Items are read one at a time through generators and written as they are read,
+so memory stays bounded by the largest single meeting, not the export size.
+"""
+# Imports
+import argparse
+import csv
+import json
+from datetime import datetime, time
+from pathlib import Path
+
+from core.storage import (
+    archived_entries,
+    legacy_entries,
+    parse_stored_timestamp,
+    read_entry,
+    sharded_entries
+)
+
+FORMATS = {"csv": ".csv", "parquet": ".parquet", "jsonl": ".jsonl"}
+
+# Rows buffered per Parquet row group
+PARQUET_BATCH_ROWS = 10000
+
+TURN_COLUMNS = [
+    "customer", "meeting_id", "meeting_start", "turn", "role", "persona", "content", "sent_at",
+    "vendor_turn", "response_evaluation", "response_score", "meeting_score"
+]
+TEXT_COLUMNS = ["customer", "meeting_id", "meeting_start", "file", "text"]
+
+
+def iter_entries(kind, customer=None, since=None, until=None):
+    """Stored items of a kind whose meeting started within the date range (inclusive)"""
+    start = datetime.combine(since, time.min) if since else None
+    end = datetime.combine(until, time.max) if until else None
+    for entries in (sharded_entries, legacy_entries, archived_entries):
+        for entry in entries(kind, customer):
+            started = parse_stored_timestamp(entry["timestamp"])
+            if (start or end) and started is None:
+                continue
+            if (start and started < start) or (end and started > end):
+                continue
+            yield entry
+
+
+def _mean_score(scores):
+    """Average criterion score of a structured evaluation, or None"""
+    values = [item["score"] for item in (scores or {}).get("criteria", []) if "score" in item]
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def iter_turn_rows(customer=None, since=None, until=None):
+    """One row per conversation message, with the vendor turn's evaluation attached"""
+    for entry in iter_entries("meeting", customer, since, until):
+        meeting = json.loads(read_entry(entry))
+        evaluations = meeting.get("vendor_evaluations") or []
+        scores = meeting.get("vendor_evaluation_scores") or []
+        meeting_score = (meeting.get("meeting_evaluation_scores") or {}).get("overall_score")
+        vendor_turn = 0
+        for turn, message in enumerate(meeting.get("conversation", [])):
+            row = {
+                "customer": entry["customer"],
+                "meeting_id": meeting.get("meeting_id") or entry["meeting_id"],
+                "meeting_start": entry["timestamp"],
+                "turn": turn,
+                "role": message.get("role"),
+                "persona": message.get("persona"),
+                "content": message.get("content"),
+                "sent_at": message.get("timestamp"),
+                "vendor_turn": None,
+                "response_evaluation": None,
+                "response_score": None,
+                "meeting_score": meeting_score
+            }
+            # Vendor messages are the user role; evaluations are stored in vendor turn order
+            if message.get("role") == "user":
+                row["vendor_turn"] = vendor_turn
+                if vendor_turn < len(evaluations):
+                    row["response_evaluation"] = evaluations[vendor_turn]
+                if vendor_turn < len(scores):
+                    row["response_score"] = _mean_score(scores[vendor_turn])
+                vendor_turn += 1
+            yield row
+
+
+def _text_rows(kind):
+    """Row generator for a kind stored as one text file per meeting"""
+    def iter_rows(customer=None, since=None, until=None):
+        for entry in iter_entries(kind, customer, since, until):
+            yield {
+                "customer": entry["customer"],
+                "meeting_id": entry["meeting_id"],
+                "meeting_start": entry["timestamp"],
+                "file": entry["name"],
+                "text": read_entry(entry)
+            }
+    return iter_rows
+
+
+DATASETS = {
+    "turns": (iter_turn_rows, TURN_COLUMNS),
+    "response_evaluations": (_text_rows("response_evaluation"), TEXT_COLUMNS),
+    "reports": (_text_rows("report"), TEXT_COLUMNS)
+}
+
+
+def _write_csv(rows, columns, path):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _write_jsonl(rows, columns, path):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps({column: row.get(column) for column in columns}) + "\n")
+            count += 1
+    return count
+
+
+def _write_parquet(rows, columns, path):
+    # Optional dependency, only needed for Parquet output
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"turn": pa.int64(), "vendor_turn": pa.int64(), "response_score": pa.float64(), "meeting_score": pa.float64()}
+    schema = pa.schema([(column, types.get(column, pa.string())) for column in columns])
+    count = 0
+    batch = []
+    with pq.ParquetWriter(path, schema) as writer:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= PARQUET_BATCH_ROWS:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch or count == 0:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+
+WRITERS = {"csv": _write_csv, "parquet": _write_parquet, "jsonl": _write_jsonl}
+
+
+def export_dataset(dataset, fmt, path, customer=None, since=None, until=None):
+    """Stream one dataset to a file; returns the number of rows written"""
+    iter_rows, columns = DATASETS[dataset]
+    return WRITERS[fmt](iter_rows(customer, since, until), columns, path)
+
+
+def _parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export meetings, response evaluations and reports")
+    parser.add_argument("--dataset", choices=list(DATASETS) + ["all"], default="all")
+    parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    parser.add_argument("--customer", help="Only export this customer profile")
+    parser.add_argument("--since", type=_parse_date, help="First meeting date to include (YYYY-MM-DD)")
+    parser.add_argument("--until", type=_parse_date, help="Last meeting date to include (YYYY-MM-DD)")
+    parser.add_argument("--output", type=Path, default=Path("export"), help="Directory to write the files to")
+    args = parser.parse_args()
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    for dataset in DATASETS if args.dataset == "all" else [args.dataset]:
+        path = args.output / f"{dataset}{FORMATS[args.format]}"
+        count = export_dataset(dataset, args.format, path, args.customer, args.since, args.until)
+        print(f"{dataset}: {count} rows -> {path}")
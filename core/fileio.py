@@ -0,0 +1,190 @@
+# Imports
+import os
+import queue
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from core.config import WRITE_CONFIG
+
+
+class WriteConflictError(Exception):
+    """Raised when a file changed on disk after the caller read it"""
+
+
+def stat_version(result):
+    """Version token of a file from a stat result already at hand"""
+    return f"{result.st_mtime_ns}-{result.st_size}"
+
+
+def file_version(path):
+    """Version token of a file on disk, or None if it does not exist"""
+    try:
+        result = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat_version(result)
+
+
+class _PendingWrite:
+    """One write waiting for the committer"""
+
+    def __init__(self, path, temp_path, expected_version):
+        self.path = path
+        self.temp_path = temp_path
+        self.expected_version = expected_version
+        self.done = threading.Event()
+        self.version = None
+        self.error = None
+
+
+class GroupCommitter:
+    """Background thread that makes batches of writes durable together.
+
+    Writers stage content in a temp file next to the target and wait. The committer
+    collects everything staged within a short window, drops writes superseded by a
+    later write to the same path, fsyncs the survivors, renames them into place and
+    fsyncs each touched directory once per batch.
+    """
+
+    def __init__(self, window_seconds, fsync):
+        self._window = window_seconds
+        self._fsync = fsync
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, pending):
+        """Queue a staged write and block until it is committed"""
+        self._ensure_started()
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error:
+            raise pending.error
+        return pending.version
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._commit(batch)
+            except Exception:
+                # _commit releases every writer itself; the committer must outlive any batch
+                continue
+
+    def _commit(self, batch):
+        """Persist a batch and release every writer in it, whatever fails on the way"""
+        try:
+            self._persist(batch)
+        except Exception as e:
+            for pending in batch:
+                if pending.error is None and pending.version is None:
+                    pending.error = e
+        finally:
+            for pending in batch:
+                try:
+                    if os.path.exists(pending.temp_path):
+                        os.unlink(pending.temp_path)
+                except OSError:
+                    pass
+                pending.done.set()
+
+    def _persist(self, batch):
+        """Check versions in arrival order, then persist the last accepted write per path"""
+        winners = {}
+        current_versions = {}
+        for pending in batch:
+            current = current_versions.get(pending.path, file_version(pending.path))
+            if pending.expected_version is not None and pending.expected_version != current:
+                pending.error = WriteConflictError(str(pending.path))
+                continue
+            superseded = winners.get(pending.path)
+            if superseded:
+                superseded.append(pending)
+            else:
+                winners[pending.path] = [pending]
+            # Any later write in this batch must have seen this one to pass the check
+            current_versions[pending.path] = f"pending-{id(pending)}"
+
+        directories = set()
+        for path, writes in winners.items():
+            final = writes[-1]
+            try:
+                if self._fsync:
+                    with open(final.temp_path, "rb") as f:
+                        os.fsync(f.fileno())
+                os.replace(final.temp_path, path)
+                directories.add(path.parent)
+            except OSError as e:
+                for pending in writes:
+                    pending.error = e
+
+        if self._fsync:
+            for directory in directories:
+                try:
+                    fd = os.open(directory, os.O_RDONLY)
+                except OSError:
+                    continue
+                try:
+                    os.fsync(fd)
+                except OSError:
+                    pass
+                finally:
+                    os.close(fd)
+
+        for pending in batch:
+            if pending.error is None:
+                pending.version = file_version(pending.path)
+
+
+# Read once at import; os.umask can only be read by setting it, which is not thread-safe
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _target_mode(path):
+    """Permissions a rewritten file keeps: the existing file's, else the default for new files"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+_committer = GroupCommitter(WRITE_CONFIG["group_commit_window_ms"] / 1000, WRITE_CONFIG["fsync"])
+
+
+def atomic_write_text(path, content, expected_version=None):
+    """Write a text file so readers never see a partial file.
+
+    Pass the version returned by file_version when the content was read to
+    refuse overwriting someone else's newer edit. Returns the new version.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        # mkstemp creates the file 0600, and os.replace would give the target that mode
+        os.chmod(temp_path, _target_mode(path))
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return _committer.submit(_PendingWrite(path, temp_path, expected_version))
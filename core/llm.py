@@ -0,0 +1,357 @@
+# Imports
+import queue
+import threading
+import time
+from collections import deque
+
+from anthropic import Anthropic, APIStatusError, APITimeoutError, RateLimitError
+
+from core.config import HEDGING_CONFIG, MODEL_CONFIG, MODEL_ROUTING
+from core.profiling import profiled
+from core.rate_limiter import percentile, rate_limiter
+from core.telemetry import record_llm_call
+
+# Shared Anthropic client (one connection pool for every page and session)
+client = Anthropic(api_key=MODEL_CONFIG["api_key"])
+
+# Tiers that recently timed out, were overloaded or rate limited: (mode, model) -> monotonic time they return
+_cooldowns = {}
+_cooldown_lock = threading.Lock()
+
+# Recent time-to-first-token per mode, for the hedging deadline
+_ttft_samples = {}
+_ttft_lock = threading.Lock()
+
+
+class HedgeCancelled(Exception):
+    """Raised in a hedged request that lost the race to the other one"""
+
+
+class FirstTokenTimeout(Exception):
+    """Raised when a tier streams no first token within its latency target"""
+
+
+def estimate_tokens(text):
+    """Rough token estimate used to reserve rate limit capacity before a call"""
+    return len(text or "") // 4 + 1
+
+
+def _usage_tokens(usage, estimated_input):
+    """Tokens a call counts against the token budget: input, output and prompt cache reads
+    and writes. Without usage (a failed call) the prompt estimate is counted"""
+    input_tokens = getattr(usage, "input_tokens", None)
+    return (
+        (input_tokens if input_tokens is not None else estimated_input)
+        + (getattr(usage, "output_tokens", None) or 0)
+        + (getattr(usage, "cache_read_input_tokens", None) or 0)
+        + (getattr(usage, "cache_creation_input_tokens", None) or 0)
+    )
+
+
+def _falls_back(error):
+    """Whether a failed call should move on to the next model tier"""
+    if isinstance(error, (APITimeoutError, RateLimitError, FirstTokenTimeout)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code in MODEL_ROUTING["fallback_status_codes"]
+
+
+def _available_tiers(mode):
+    """Routing tiers of a mode that are not cooling down after a recent failure"""
+    tiers = list(enumerate(MODEL_ROUTING["tiers"].get(mode) or [{"model": MODEL_CONFIG[mode]["model"]}]))
+    now = time.monotonic()
+    with _cooldown_lock:
+        available = [(i, tier) for i, tier in tiers if _cooldowns.get((mode, tier["model"]), 0) <= now]
+    # When every tier is cooling down, the last one still takes the call
+    return available or tiers[-1:]
+
+
+def _cool_down(mode, model):
+    """Skip a tier for a while after it timed out, was overloaded or was rate limited"""
+    with _cooldown_lock:
+        _cooldowns[(mode, model)] = time.monotonic() + MODEL_ROUTING["cooldown_seconds"]
+
+
+def _stream(request, tier, last, attempt=None):
+    """Send one request to a tier; returns the response and the time of the first token.
+
+    Earlier tiers give up with FirstTokenTimeout when no first token arrives within
+    their latency target of wall-clock time, counted from sending the request; the
+    last tier keeps the client's default timeout and retries.
+
+    A hedged attempt dict gets the open stream, reports its first token on the attempt's
+    event queue and stops with HedgeCancelled once it is marked cancelled.
+    """
+    started = time.perf_counter()
+    target = None if last else tier.get("latency_target_s")
+    # The client timeout applies per connect and read, so it only bounds opening the
+    # stream; the target itself is enforced below by closing the stream
+    tier_client = client if last else client.with_options(timeout=target, max_retries=0)
+    state = {"first_token": None, "expired": False}
+    state_lock = threading.Lock()
+    # Stream so the time to first token can be measured
+    with tier_client.messages.stream(**request) as stream:
+        if attempt is not None:
+            attempt["stream"] = stream
+
+        def expire():
+            with state_lock:
+                if state["first_token"] is not None:
+                    return
+                state["expired"] = True
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+        timer = None
+        if target:
+            timer = threading.Timer(max(0.0, target - (time.perf_counter() - started)), expire)
+            timer.daemon = True
+            timer.start()
+        try:
+            for event in stream:
+                if attempt is not None and attempt["cancelled"]:
+                    break
+                if state["first_token"] is None and event.type == "content_block_delta":
+                    with state_lock:
+                        if state["expired"]:
+                            break
+                        state["first_token"] = time.perf_counter()
+                    if attempt is not None:
+                        attempt["events"].put(("first_token", attempt["index"], None))
+        except Exception:
+            if not state["expired"]:
+                raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+        if state["expired"]:
+            raise FirstTokenTimeout(f"no first token from {request['model']} within {target}s")
+        if attempt is not None and attempt["cancelled"]:
+            raise HedgeCancelled()
+        return stream.get_final_message(), state["first_token"]
+
+
+def record_ttft(mode, seconds):
+    """Keep a reply's time to first token for its mode's hedging deadline"""
+    with _ttft_lock:
+        _ttft_samples.setdefault(mode, deque(maxlen=HEDGING_CONFIG["sample_size"])).append(seconds)
+
+
+def hedge_deadline(mode):
+    """Seconds to wait for a first token before sending a duplicate request"""
+    with _ttft_lock:
+        samples = sorted(_ttft_samples.get(mode, ()))
+    if len(samples) < HEDGING_CONFIG["min_samples"]:
+        return HEDGING_CONFIG["default_deadline_s"]
+    return min(
+        max(percentile(samples, HEDGING_CONFIG["ttft_percentile"]), HEDGING_CONFIG["min_deadline_s"]),
+        HEDGING_CONFIG["max_deadline_s"]
+    )
+
+
+def _partial_usage(attempt):
+    """Token usage a cancelled stream reported before it was closed, if any"""
+    try:
+        return attempt["stream"].current_message_snapshot.usage
+    except Exception:
+        return None
+
+
+def _hedged_stream(mode, request, tier, last, persona, prompt_tokens, reserved):
+    """_stream with a duplicate request sent when no first token arrives within the mode's
+    hedging deadline. The first attempt to stream a token wins and the other is closed.
+
+    Returns the response, the time of its first token and the hedge outcome: "none" when
+    no duplicate was needed, otherwise the winning attempt ("primary" or "duplicate").
+    The primary runs on the caller's rate limit reservation and the duplicate on its own,
+    taken from spare capacity; each attempt releases its reservation when it ends. A losing
+    attempt also records its own telemetry as a "cancelled" call.
+    """
+    events = queue.Queue()
+    attempts = []
+
+    def run(attempt):
+        try:
+            result = _stream(request, tier, last, attempt)
+        except Exception as e:
+            if not attempt["cancelled"]:
+                rate_limiter.release(attempt["reserved"], _usage_tokens(None, prompt_tokens))
+                events.put(("error", attempt["index"], e))
+                return
+            usage = _partial_usage(attempt)
+        else:
+            usage = result[0].usage
+            if not attempt["cancelled"]:
+                rate_limiter.release(attempt["reserved"], _usage_tokens(usage, prompt_tokens))
+                events.put(("done", attempt["index"], result))
+                return
+            # Otherwise it finished before it noticed it had lost
+        rate_limiter.release(attempt["reserved"], _usage_tokens(usage, prompt_tokens))
+        input_tokens = getattr(usage, "input_tokens", None)
+        output_tokens = getattr(usage, "output_tokens", None)
+        record_llm_call(
+            mode=mode,
+            model=request["model"],
+            tier=tier.get("index"),
+            persona=persona,
+            queue_wait_s=0.0,
+            latency_s=round(time.perf_counter() - attempt["started"], 4),
+            ttft_s=None,
+            input_tokens=input_tokens if input_tokens is not None else prompt_tokens,
+            output_tokens=output_tokens or 0,
+            tokens_estimated=input_tokens is None,
+            hedge="cancelled",
+            error=None
+        )
+
+    def start(index, attempt_reserved):
+        attempt = {
+            "index": index,
+            "reserved": attempt_reserved,
+            "events": events,
+            "stream": None,
+            "cancelled": False,
+            "started": time.perf_counter()
+        }
+        attempts.append(attempt)
+        threading.Thread(target=run, args=(attempt,), name="hedged-request", daemon=True).start()
+
+    def cancel(attempt):
+        attempt["cancelled"] = True
+        if attempt["stream"] is not None:
+            try:
+                # Closing the connection stops the loser's generation
+                attempt["stream"].close()
+            except Exception:
+                pass
+
+    start(0, reserved)
+    hedge_at = time.perf_counter() + hedge_deadline(mode)
+    pending = {0}
+    streaming = None
+    while True:
+        timeout = max(0.0, hedge_at - time.perf_counter()) if hedge_at else None
+        try:
+            kind, index, payload = events.get(timeout=timeout)
+        except queue.Empty:
+            hedge_at = None
+            # Hedge only with spare capacity, so duplicates never delay queued calls
+            duplicate_reserved = rate_limiter.try_acquire(mode, reserved)
+            if duplicate_reserved is not None:
+                start(1, duplicate_reserved)
+                pending.add(1)
+            continue
+
+        if attempts[index]["cancelled"]:
+            continue
+        if kind == "first_token":
+            hedge_at = None
+            if streaming is None:
+                streaming = index
+                for attempt in attempts:
+                    if attempt["index"] != index:
+                        cancel(attempt)
+                        pending.discard(attempt["index"])
+            continue
+        pending.discard(index)
+        if kind == "done":
+            # Covers a winner that finished without streaming a text token
+            for attempt in attempts:
+                if attempt["index"] != index and not attempt["cancelled"]:
+                    cancel(attempt)
+            response, first_token = payload
+            outcome = "none" if len(attempts) == 1 else ("primary" if index == 0 else "duplicate")
+            return response, first_token, outcome
+        # An attempt failed: keep waiting for the other one, if it is still running
+        hedge_at = None
+        if not pending:
+            raise payload
+
+
+@profiled
+def create_message(mode, messages, system=None, persona=None, cache_system=False,
+                   tools=None, tool_choice=None, max_tokens=None, hedge=False):
+    """Send a model request for the given mode through the shared rate limiter.
+
+    The model is picked from the mode's routing tiers, falling back to the next
+    tier on timeout, overload or rate limit. With cache_system the system prompt
+    is marked for prompt caching, so repeated calls with the same prompt (every
+    turn of a meeting) skip re-processing it. With hedge, and hedging enabled in
+    HEDGING_CONFIG, a slow first token triggers a duplicate request.
+    """
+    hedge = hedge and HEDGING_CONFIG["enabled"]
+    config = dict(MODEL_CONFIG[mode])
+    if max_tokens:
+        config["max_tokens"] = max_tokens
+    prompt_tokens = estimate_tokens(system) + sum(estimate_tokens(msg["content"]) for msg in messages)
+
+    request = {
+        "max_tokens": config["max_tokens"],
+        "temperature": config["temperature"],
+        "messages": messages
+    }
+    if system and cache_system:
+        request["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+    elif system:
+        request["system"] = system
+    if tools:
+        request["tools"] = tools
+    if tool_choice:
+        request["tool_choice"] = tool_choice
+
+    tiers = _available_tiers(mode)
+    for position, (tier_index, tier) in enumerate(tiers):
+        last = position == len(tiers) - 1
+        # Every attempt, fallback tiers included, is a request against the rate limits
+        queued = time.perf_counter()
+        reserved = rate_limiter.acquire(mode, prompt_tokens + config["max_tokens"])
+        queue_wait = time.perf_counter() - queued
+        started = time.perf_counter()
+        first_token = None
+        response = None
+        error = None
+        outcome = None
+        try:
+            if hedge:
+                # The hedged attempts release their reservations themselves as each one ends
+                response, first_token, outcome = _hedged_stream(
+                    mode, {**request, "model": tier["model"]}, {**tier, "index": tier_index}, last,
+                    persona, prompt_tokens, reserved
+                )
+            else:
+                response, first_token = _stream({**request, "model": tier["model"]}, tier, last)
+            if first_token:
+                record_ttft(mode, first_token - started)
+            return response
+        except Exception as e:
+            error = type(e).__name__
+            if last or not _falls_back(e):
+                raise
+            _cool_down(mode, tier["model"])
+        finally:
+            finished = time.perf_counter()
+            usage = response.usage if response is not None else None
+            if not hedge:
+                rate_limiter.release(reserved, _usage_tokens(usage, prompt_tokens))
+            record_llm_call(
+                mode=mode,
+                model=tier["model"],
+                tier=tier_index,
+                persona=persona,
+                queue_wait_s=round(queue_wait, 4),
+                latency_s=round(finished - started, 4),
+                ttft_s=round(first_token - started, 4) if first_token else None,
+                input_tokens=getattr(usage, "input_tokens", None),
+                output_tokens=getattr(usage, "output_tokens", None),
+                cache_creation_input_tokens=getattr(usage, "cache_creation_input_tokens", None),
+                cache_read_input_tokens=getattr(usage, "cache_read_input_tokens", None),
+                stop_reason=getattr(response, "stop_reason", None),
+                hedge=outcome,
+                error=error
+            )
+
+
+def response_text(response):
+    """Text of the first content block of a model response"""
+    return response.content[0].text if response.content else ""
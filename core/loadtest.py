@@ -0,0 +1,301 @@
+"""Drive concurrent simulated reps through the Meet page against a fake model backend.
+
+Usage: python -m core.loadtest [--sessions 1,5,10,20] [--turns 5] [--latency 0.8] [--jitter 0.3]
+                               [--mode threads|processes]
+
+Runs offline: the Anthropic client is replaced by a fake with configurable latency,
+and all data is written to a temporary directory. For each concurrency level it
+reports turn latency percentiles, idle rerun time, and CPU and RSS per session.
+By default the simulated reps are sessions on threads of one process, as they would
+be in one Streamlit server; --mode processes gives each rep its own process instead.
+
+Threaded mode patches Streamlit testing internals (see share_server_state) and is tested
+with Streamlit 1.66; on other versions it warns, and stops if those internals are gone.
+"""
+# Imports
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Isolate the run before core.config is imported
+os.environ.setdefault("PITCH_PERFECT_DATA_DIR", tempfile.mkdtemp(prefix="pitch_perfect_loadtest_"))
+os.environ.setdefault("ANTHROPIC_API_KEY", "loadtest")
+os.environ.setdefault("ANTHROPIC_REQUESTS_PER_MINUTE", "1000000")
+os.environ.setdefault("ANTHROPIC_TOKENS_PER_MINUTE", "1000000000")
+os.environ.setdefault("PITCH_PERFECT_FSYNC", "0")
+
+import streamlit
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner
+
+import core.llm
+import core.prompt_cache
+from core.config import BASE_DIR
+from core.memory import process_rss_bytes
+from core.rate_limiter import percentile
+
+MEET_PAGE = BASE_DIR / "pages" / "4_💬_Meet.py"
+
+# Streamlit minor versions whose testing internals share_server_state was checked against
+TESTED_STREAMLIT_VERSIONS = ("1.66",)
+
+FAKE_REPLY = "That's interesting. How does this fit with what we already run, and what would it cost us?"
+
+# Minimal valid inputs for the evaluation tools
+FAKE_CRITERION = {"criterion": "Solution Quality", "observation": "Clear pitch.", "evidence": "fits", "score": 3}
+FAKE_TOOL_INPUTS = {
+    "record_response_evaluation": lambda turns: {"criteria": [FAKE_CRITERION]},
+    "record_turn_evaluations": lambda turns: {
+        "turns": [{"turn": i, "criteria": [FAKE_CRITERION]} for i in range(1, turns + 1)]
+    },
+    "record_meeting_evaluation": lambda turns: {
+        "criteria": [{"criterion": "Meeting Dynamics", "observations": ["Focused"], "evidence": ["fits"], "score": 3}],
+        "overall_score": 3,
+        "recommendations": ["Quantify the value"]
+    }
+}
+
+
+class FakeStream:
+    """Context manager mimicking client.messages.stream"""
+
+    def __init__(self, message, first_token_delay):
+        self._message = message
+        self._first_token_delay = first_token_delay
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __iter__(self):
+        yield SimpleNamespace(type="message_start")
+        time.sleep(self._first_token_delay)
+        yield SimpleNamespace(type="content_block_delta")
+
+    def get_final_message(self):
+        return self._message
+
+
+class FakeMessages:
+    """Stand-in for client.messages with configurable latency"""
+
+    def __init__(self, latency, jitter):
+        self.latency = latency
+        self.jitter = jitter
+
+    def _delay(self):
+        return max(0.0, random.gauss(self.latency, self.jitter))
+
+    def _message(self, request):
+        usage = SimpleNamespace(
+            input_tokens=sum(len(str(msg["content"])) for msg in request["messages"]) // 4 + 1,
+            output_tokens=min(request["max_tokens"], 60),
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=0
+        )
+        if request.get("tools"):
+            name = request["tools"][0]["name"]
+            turns = request["messages"][-1]["content"].count("--- Turn ")
+            content = [SimpleNamespace(type="tool_use", name=name, input=FAKE_TOOL_INPUTS[name](turns))]
+        else:
+            content = [SimpleNamespace(type="text", text=FAKE_REPLY)]
+        return SimpleNamespace(content=content, usage=usage, stop_reason="end_turn", model=request["model"])
+
+    def stream(self, **request):
+        delay = self._delay()
+        time.sleep(delay * 0.7)
+        return FakeStream(self._message(request), delay * 0.3)
+
+    def create(self, **request):
+        time.sleep(self._delay())
+        return self._message(request)
+
+    def count_tokens(self, **request):
+        return SimpleNamespace(input_tokens=len(str(request.get("system", ""))) // 4 + 1)
+
+
+def install_fake_backend(latency, jitter):
+    """Route all model calls in this process to the fake backend"""
+    fake_client = SimpleNamespace(messages=FakeMessages(latency, jitter))
+    fake_client.with_options = lambda **options: fake_client
+    core.llm.client = fake_client
+    core.prompt_cache.client = fake_client
+
+
+def simulate_rep(options, barrier):
+    """One rep: pick the first profile, send a number of turns, then freeze"""
+    result = {"turn": [], "rerun": [], "error": None}
+    try:
+        app = AppTest.from_file(str(MEET_PAGE), default_timeout=options["timeout"])
+        app.run()
+        barrier.wait()
+        cpu_before = time.process_time()
+        app.button(key="meet_0").click().run()
+        for turn in range(options["turns"]):
+            started = time.perf_counter()
+            app.chat_input[0].set_value(f"Turn {turn}: our platform cuts your launch review time in half.").run()
+            result["turn"].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            app.run()
+            result["rerun"].append(time.perf_counter() - started)
+        app.chat_input[0].set_value("freeze and report").run()
+        if app.exception:
+            result["error"] = app.exception[0].value
+        result["cpu_s"] = time.process_time() - cpu_before
+    except Exception as e:
+        result["error"] = str(e)
+        result["cpu_s"] = 0.0
+    return result
+
+
+def simulate_rep_process(options, barrier, results):
+    """One rep in its own process, with its own fake backend"""
+    install_fake_backend(options["latency"], options["jitter"])
+    result = simulate_rep(options, barrier)
+    result["rss_bytes"] = process_rss_bytes()
+    results.put(result)
+
+
+def run_processes(sessions, options):
+    """Reps of one level, each in a spawned process; CPU and RSS are each process's own"""
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(sessions)
+    results = context.Queue()
+    processes = [
+        context.Process(target=simulate_rep_process, args=(options, barrier, results))
+        for _ in range(sessions)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return collected
+
+
+class _ServerRuntimeType(type):
+    """Keeps the first runtime an AppTest run installs for every later run; AppTest clears
+    the process-wide runtime when a run ends, under the runs of other sessions"""
+
+    def __setattr__(cls, name, value):
+        if name == "_instance":
+            if value is not None and Runtime._instance is None:
+                Runtime._instance = value
+            return
+        super().__setattr__(name, value)
+
+
+def share_server_state():
+    """Give the threaded sessions one runtime and one compiled page, as a Streamlit server
+    does; AppTest also compiles the page on every run, and concurrent compiles can crash
+    the parser on Python 3.11"""
+    patched = (
+        (app_test, "Runtime"), (app_test, "ScriptCache"), (local_script_runner, "ScriptCache"), (Runtime, "_instance")
+    )
+    missing = [f"{owner.__name__}.{name}" for owner, name in patched if not hasattr(owner, name)]
+    if missing:
+        raise SystemExit(
+            f"Streamlit {streamlit.__version__} has no {', '.join(missing)}; "
+            "use --mode processes or a tested version: " + ", ".join(TESTED_STREAMLIT_VERSIONS)
+        )
+    if ".".join(streamlit.__version__.split(".")[:2]) not in TESTED_STREAMLIT_VERSIONS:
+        print(f"warning: threaded mode is untested with Streamlit {streamlit.__version__}; "
+              "use --mode processes if sessions fail")
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+    app_test.Runtime = _ServerRuntimeType("ServerRuntime", (Runtime,), {})
+
+
+def run_threads(sessions, options):
+    """Reps of one level as concurrent sessions in this process, sharing its caches and
+    pools; CPU and RSS growth of the process are split evenly over the sessions"""
+    install_fake_backend(options["latency"], options["jitter"])
+    share_server_state()
+    barrier = threading.Barrier(sessions)
+    collected = [None] * sessions
+
+    def rep(index):
+        collected[index] = simulate_rep(options, barrier)
+
+    threads = [threading.Thread(target=rep, args=(index,), name=f"loadtest-rep-{index}") for index in range(sessions)]
+    cpu_before = time.process_time()
+    rss_before = process_rss_bytes()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cpu_s = (time.process_time() - cpu_before) / sessions
+    rss_bytes = max(0, process_rss_bytes() - rss_before) / sessions
+    for result in collected:
+        result["cpu_s"] = cpu_s
+        result["rss_bytes"] = rss_bytes
+    return collected
+
+
+def run_level(sessions, options):
+    """Run one concurrency level and summarise it"""
+    started = time.perf_counter()
+    collected = (run_processes if options["mode"] == "processes" else run_threads)(sessions, options)
+
+    turns = sorted(value for result in collected for value in result["turn"])
+    reruns = sorted(value for result in collected for value in result["rerun"])
+    return {
+        "sessions": sessions,
+        "wall_s": time.perf_counter() - started,
+        "turn_p50": percentile(turns, 0.50),
+        "turn_p95": percentile(turns, 0.95),
+        "turn_p99": percentile(turns, 0.99),
+        "rerun_p50": percentile(reruns, 0.50),
+        "rerun_p95": percentile(reruns, 0.95),
+        "cpu_per_session_s": sum(result["cpu_s"] for result in collected) / sessions,
+        "rss_per_session_mb": sum(result["rss_bytes"] for result in collected) / sessions / 2 ** 20,
+        "errors": sum(1 for result in collected if result["error"])
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Meet page with simulated reps")
+    parser.add_argument("--sessions", default="1,5,10,20", help="Comma-separated concurrency levels")
+    parser.add_argument("--turns", type=int, default=5, help="Vendor turns per simulated rep")
+    parser.add_argument("--latency", type=float, default=0.8, help="Mean fake model latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.3, help="Standard deviation of fake model latency")
+    parser.add_argument("--timeout", type=float, default=120, help="Timeout for one page run in seconds")
+    parser.add_argument("--mode", choices=["threads", "processes"], default="threads",
+                        help="Run the reps as sessions in this process or each in its own process")
+    args = parser.parse_args()
+
+    options = {
+        "turns": args.turns,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "timeout": args.timeout,
+        "mode": args.mode
+    }
+    print(f"data dir: {Path(os.environ['PITCH_PERFECT_DATA_DIR'])}")
+    print(f"mode: {args.mode}")
+
+    columns = [
+        "sessions", "wall_s", "turn_p50", "turn_p95", "turn_p99",
+        "rerun_p50", "rerun_p95", "cpu_per_session_s", "rss_per_session_mb", "errors"
+    ]
+    print(" ".join(f"{column:>18}" for column in columns))
+    for sessions in (int(level) for level in args.sessions.split(",")):
+        row = run_level(sessions, options)
+        print(" ".join(
+            f"{row[column]:>18.3f}" if isinstance(row[column], float) else f"{row[column]:>18}"
+            for column in columns
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Move meetings and evaluations from the flat layout into customer/month shards.
+
+Usage: python -m core.migrate_storage [--dry-run]
+
+Safe to re-run: files already in the sharded layout are never touched, and
+readers list both layouts, so the app keeps working while this runs.
+"""
+# Imports
+import argparse
+import hashlib
+import json
+
+from core.storage import (
+    legacy_entries,
+    item_path,
+    meeting_id_timestamp,
+    parse_stored_timestamp,
+    TIMESTAMP_FORMAT
+)
+from core.fileio import atomic_write_text
+
+
+def normalized_timestamp(timestamp):
+    """Legacy timestamp in the current four-digit year format"""
+    parsed = parse_stored_timestamp(timestamp)
+    return parsed.strftime(TIMESTAMP_FORMAT) if parsed else timestamp
+
+
+def legacy_meeting_id(entry):
+    """Deterministic meeting id for a legacy file, so re-runs map to the same id"""
+    timestamp = normalized_timestamp(entry["timestamp"])
+    digest = hashlib.sha1(f"{entry['customer']}/{entry['timestamp']}".encode()).hexdigest()[:8]
+    return f"{timestamp}_{digest}"
+
+
+def plan_migration():
+    """Work out the target path of every legacy file"""
+    moves = []
+    meetings_by_customer = {}
+
+    # Meetings and response evaluations share the meeting start timestamp
+    for entry in legacy_entries("meeting"):
+        meeting_id = legacy_meeting_id(entry)
+        meetings_by_customer.setdefault(entry["customer"], []).append(meeting_id)
+        moves.append((entry, meeting_id))
+    for entry in legacy_entries("response_evaluation"):
+        moves.append((entry, legacy_meeting_id(entry)))
+
+    # Reports are stamped at freeze time: attach each to the latest meeting started before it
+    for entry in legacy_entries("report"):
+        candidates = sorted(
+            (mid for mid in meetings_by_customer.get(entry["customer"], [])
+             if meeting_id_timestamp(mid) <= normalized_timestamp(entry["timestamp"])),
+            reverse=True
+        )
+        moves.append((entry, candidates[0] if candidates else legacy_meeting_id(entry)))
+
+    return [
+        (entry["path"], item_path(entry["kind"], entry["customer"], meeting_id), meeting_id)
+        for entry, meeting_id in moves
+    ]
+
+
+def migrate(dry_run=False):
+    """Move every legacy file into the sharded layout"""
+    moved = 0
+    for source, target, meeting_id in plan_migration():
+        if target.exists():
+            print(f"skip (target exists): {source} -> {target}")
+            continue
+        print(f"{'would move' if dry_run else 'move'}: {source} -> {target}")
+        if dry_run:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # Record the id inside the meeting so it survives future moves
+            data = json.loads(source.read_text()) if source.suffix == ".json" else None
+        except json.JSONDecodeError:
+            print(f"warning: unreadable meeting moved as-is: {source}")
+            data = None
+        if isinstance(data, dict):
+            data.setdefault("meeting_id", meeting_id)
+            atomic_write_text(target, json.dumps(data, indent=2))
+            source.unlink()
+        else:
+            source.rename(target)
+        moved += 1
+    return moved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate meeting data to the sharded layout")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the planned moves")
+    args = parser.parse_args()
+    print(f"{migrate(dry_run=args.dry_run)} files moved")
@@ -0,0 +1,215 @@
+"""Developer overlay timing each phase of a page run.
+
+Opt in with the ?profile query flag (?profile=cprofile or ?profile=pyinstrument also
+dumps a profiler report for the run) or, when PITCH_PERFECT_PROFILING_SIDEBAR=1, with
+the sidebar toggle; the choice sticks for the session. Script pages call start_run at the
+top and render_overlay at the bottom, and functions wrap their run in profile_run;
+helpers are timed with span or @profiled, which do nothing unless the run is profiled.
+"""
+# Imports
+import cProfile
+import io
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+import pandas as pd
+import streamlit as st
+
+from core.config import PROFILING_CONFIG
+from core.strings import (
+    PROFILING_DUMP_SAVED,
+    PROFILING_OTHER_SPAN,
+    PROFILING_PROFILER_UNAVAILABLE,
+    PROFILING_SUMMARY,
+    PROFILING_TABLE_HEADERS,
+    PROFILING_TITLE,
+    PROFILING_TOGGLE_LABEL
+)
+
+# Each page run executes on its session's script thread, so the run being
+# profiled is per thread; background threads record nothing
+_local = threading.local()
+
+
+def _current():
+    return getattr(_local, "run", None)
+
+
+@contextmanager
+def span(name):
+    """Time a block as a named phase of the current run"""
+    run = _current()
+    if run is None:
+        yield
+        return
+    run["depth"] += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        run["depth"] -= 1
+        run["spans"].append({
+            "name": name,
+            "seconds": time.perf_counter() - started,
+            "depth": run["depth"]
+        })
+
+
+def profiled(func):
+    """Decorator timing every call of func as a span named after it"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _requested_mode():
+    """Profiling mode asked for by the query flag or the sidebar toggle, kept for the session"""
+    flag = st.query_params.get("profile")
+    if flag is not None:
+        st.session_state.profiling_mode = flag if flag in PROFILING_CONFIG["profilers"] else (
+            "spans" if flag not in ("0", "off") else None
+        )
+    if PROFILING_CONFIG["sidebar"]:
+        enabled = st.sidebar.toggle(PROFILING_TOGGLE_LABEL, value=bool(st.session_state.get("profiling_mode")))
+        if enabled and not st.session_state.get("profiling_mode"):
+            st.session_state.profiling_mode = "spans"
+        elif not enabled:
+            st.session_state.profiling_mode = None
+    return st.session_state.get("profiling_mode")
+
+
+def _start_profiler(mode):
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        return None
+    profiler = Profiler()
+    profiler.start()
+    return profiler
+
+
+def _discard(run):
+    """End a run without rendering it, stopping its profiler"""
+    if run and run["profiler"]:
+        if run["mode"] == "cprofile":
+            run["profiler"].disable()
+        else:
+            run["profiler"].stop()
+
+
+def start_run(page, fragment=False):
+    """Begin timing this page or fragment run when profiling is enabled for the session"""
+    # A page run that ended early (st.stop or st.rerun) never rendered its overlay
+    _discard(_current())
+    _local.run = None
+    # Widgets cannot be added to the sidebar from a fragment
+    mode = st.session_state.get("profiling_mode") if fragment else _requested_mode()
+    if not mode:
+        return
+    run = {
+        "page": page,
+        "mode": mode,
+        "fragment": fragment,
+        "spans": [],
+        "depth": 0,
+        "profiler": None,
+        "profiler_error": None
+    }
+    if mode != "spans":
+        try:
+            run["profiler"] = _start_profiler(mode)
+        except (RuntimeError, ValueError) as e:
+            # Only one profiler can be active at a time
+            run["profiler_error"] = str(e)
+        if run["profiler"] is None and run["profiler_error"] is None:
+            run["profiler_error"] = PROFILING_PROFILER_UNAVAILABLE.format(mode)
+    run["started"] = time.perf_counter()
+    _local.run = run
+
+
+def breakdown(spans, total):
+    """Per-name calls and seconds, with the time outside top-level spans as one more row"""
+    rows = {}
+    for item in spans:
+        row = rows.setdefault(item["name"], {"span": item["name"], "calls": 0, "seconds": 0.0})
+        row["calls"] += 1
+        row["seconds"] += item["seconds"]
+    covered = sum(item["seconds"] for item in spans if item["depth"] == 0)
+    rows = sorted(rows.values(), key=lambda row: row["seconds"], reverse=True)
+    rows.append({"span": PROFILING_OTHER_SPAN, "calls": 1, "seconds": max(0.0, total - covered)})
+    for row in rows:
+        row["seconds"] = round(row["seconds"], 4)
+        row["share"] = f"{row['seconds'] / total:.0%}" if total else "-"
+    return rows
+
+
+def _stop_profiler(run):
+    """Stop the run's profiler and dump its report; returns (text, path)"""
+    profiler = run["profiler"]
+    PROFILING_CONFIG["dump_dir"].mkdir(parents=True, exist_ok=True)
+    stem = PROFILING_CONFIG["dump_dir"] / f"{run['page']}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+    if run["mode"] == "cprofile":
+        profiler.disable()
+        path = stem.with_suffix(".prof")
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILING_CONFIG["report_lines"])
+        return out.getvalue(), path
+    profiler.stop()
+    path = stem.with_suffix(".html")
+    path.write_text(profiler.output_html())
+    return profiler.output_text(), path
+
+
+def render_overlay():
+    """Show the breakdown of this run and end it"""
+    run = _current()
+    _local.run = None
+    if run is None:
+        return
+    total = time.perf_counter() - run["started"]
+    report, path = _stop_profiler(run) if run["profiler"] else (None, None)
+
+    # Fragments cannot write to the sidebar, so their breakdown shows in place
+    container = st if run["fragment"] else st.sidebar
+    with container.expander(PROFILING_TITLE, expanded=True):
+        st.caption(PROFILING_SUMMARY.format(run["page"], total, len(run["spans"])))
+        st.dataframe(
+            pd.DataFrame(breakdown(run["spans"], total)).rename(columns=PROFILING_TABLE_HEADERS),
+            hide_index=True,
+            use_container_width=True
+        )
+        if run["profiler_error"]:
+            st.caption(run["profiler_error"])
+        if report:
+            st.caption(PROFILING_DUMP_SAVED.format(path))
+            st.code(report, language=None)
+
+
+@contextmanager
+def profile_run(page, fragment=False):
+    """Profile the enclosed page or fragment run; a fragment running inside a profiled
+    page run is timed as one of its spans instead"""
+    if fragment and _current() is not None:
+        with span(page):
+            yield
+        return
+    start_run(page, fragment)
+    try:
+        yield
+    except BaseException:
+        # st.rerun and st.stop end the run by raising; the next run shows its own overlay
+        _discard(_current())
+        _local.run = None
+        raise
+    render_overlay()
@@ -0,0 +1,75 @@
+# Imports
+import threading
+import time
+
+from core.config import EVALUATION_CONFIG, PROMPT_BUDGET_CONFIG, PROMPTS_DIR
+from core.fileio import file_version
+from core.prompt_cache import MEETING_PROMPT_PARTS, count_due, count_tokens, get_meeting_prompt
+
+# Prompt files assembled into the meeting system prompt, sent on every chat turn
+MEETING_PROMPT_FILES = {f"{part}.txt" for part in MEETING_PROMPT_PARTS if part}
+
+_counts = {}
+_lock = threading.Lock()
+
+
+def file_tokens(path, text=None, version=None):
+    """Token count of a prompt file and whether it is an estimate, cached per file version;
+    an estimate is recounted once it is ESTIMATE_RETRY_SECONDS old.
+
+    Callers that already read the file pass its text and version to skip the stat and read.
+    """
+    version = version or file_version(path)
+    with _lock:
+        cached = _counts.get(path)
+    if cached and cached[0] == version and not count_due(*cached[1:]):
+        return cached[1], cached[2]
+    tokens, estimated = count_tokens((path.read_text() if text is None else text).strip())
+    with _lock:
+        _counts[path] = (version, tokens, estimated, time.monotonic())
+    return tokens, estimated
+
+
+def _prompt_tokens(name):
+    path = PROMPTS_DIR / f"{name}.txt"
+    return file_tokens(path)[0] if path.exists() else 0
+
+
+def meeting_projection(profile):
+    """Input tokens a profile's meeting sends: per chat turn and over a projected meeting.
+
+    Chat turns re-send the assembled system prompt plus the conversation so far, which
+    grows by turn_tokens per exchange. Evaluation adds one response evaluation per turn
+    and either a rolling meeting evaluation update per turn or one final evaluation.
+    """
+    compiled = get_meeting_prompt(profile)
+    system = compiled["tokens"]
+    turns = PROMPT_BUDGET_CONFIG["projected_turns"]
+    turn_tokens = PROMPT_BUDGET_CONFIG["turn_tokens"]
+
+    chat_turns = [system + turn * turn_tokens for turn in range(1, turns + 1)]
+    structured = _prompt_tokens("structured_evaluation_instruction")
+    response_evaluation = _prompt_tokens("response_evaluation_model") + structured + turn_tokens
+    meeting_prompt = _prompt_tokens("meeting_evaluation_model") + structured
+    if EVALUATION_CONFIG["rolling"]:
+        # Each update carries the previous draft and one new exchange
+        meeting_evaluation = turns * (
+            meeting_prompt + _prompt_tokens("rolling_evaluation_instruction")
+            + EVALUATION_CONFIG["structured_max_tokens"]["meeting_evaluation"] + turn_tokens
+        )
+    else:
+        meeting_evaluation = meeting_prompt + turns * turn_tokens
+
+    chat = sum(chat_turns)
+    evaluation = turns * response_evaluation + meeting_evaluation
+    return {
+        "profile": profile,
+        "system_tokens": system,
+        "estimated": compiled["tokens_estimated"],
+        "first_turn": chat_turns[0],
+        "last_turn": chat_turns[-1],
+        "chat_per_meeting": chat,
+        "evaluation_per_meeting": evaluation,
+        "per_meeting": chat + evaluation,
+        "over_budget": system > PROMPT_BUDGET_CONFIG["meeting_prompt_max_tokens"]
+    }
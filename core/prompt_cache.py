@@ -0,0 +1,157 @@
+# Imports
+import hashlib
+import threading
+import time
+
+from core.config import CUSTOMERS_DIR, PROMPTS_DIR, PROMPT_SNAPSHOTS_DIR, PROFILE_EXTENSION, MODEL_CONFIG
+from core.content_cache import read_text
+from core.fileio import atomic_write_text, file_version
+from core.profiling import profiled
+from core.llm import client, create_message, estimate_tokens
+from core.rate_limiter import rate_limiter
+
+# Files assembled, in order, into the system prompt of a meeting
+MEETING_PROMPT_PARTS = ["core_instruction", None, "vendor_model", "meeting_context"]
+
+# Anthropic keeps an ephemeral prompt cache entry for five minutes
+PROMPT_CACHE_TTL_SECONDS = 300
+
+# An estimated token count is kept only this long before an exact count is tried again
+ESTIMATE_RETRY_SECONDS = 300
+
+_compiled = {}
+_warmed = {}
+_lock = threading.Lock()
+
+
+def meeting_prompt_files(profile):
+    """Paths of the files that make up a profile's meeting system prompt"""
+    return [
+        CUSTOMERS_DIR / f"{profile}{PROFILE_EXTENSION}" if part is None else PROMPTS_DIR / f"{part}.txt"
+        for part in MEETING_PROMPT_PARTS
+    ]
+
+
+def count_tokens(system_prompt):
+    """Exact token count of a system prompt and whether it is an estimate instead, when
+    offline or when the shared rate limiter has no spare request"""
+    # Counting is optional, so it takes only spare capacity and never delays model calls
+    reserved = rate_limiter.try_acquire("count_tokens", 0)
+    if reserved is None:
+        return estimate_tokens(system_prompt), True
+    try:
+        return client.messages.count_tokens(
+            model=MODEL_CONFIG["chat"]["model"],
+            system=system_prompt,
+            messages=[{"role": "user", "content": "."}]
+        ).input_tokens, False
+    except Exception:
+        return estimate_tokens(system_prompt), True
+    finally:
+        rate_limiter.release(reserved, 0)
+
+
+def count_due(tokens, estimated, counted_at):
+    """Whether a token count is missing, or is an estimate old enough to try an exact count again"""
+    if tokens is None:
+        return True
+    return bool(estimated) and time.monotonic() - counted_at >= ESTIMATE_RETRY_SECONDS
+
+
+@profiled
+def get_meeting_prompt(profile, with_token_count=True):
+    """Compiled meeting system prompt of a profile with its hash and token count.
+
+    Compiled prompts are cached per profile and rebuilt when any source file changes.
+    """
+    files = meeting_prompt_files(profile)
+    versions = tuple(file_version(path) for path in files)
+    with _lock:
+        compiled = _compiled.get(profile)
+    if compiled and compiled["versions"] == versions and not (with_token_count and count_due(
+            compiled["tokens"], compiled["tokens_estimated"], compiled["counted_at"])):
+        return compiled
+
+    if not compiled or compiled["versions"] != versions:
+        system_prompt = "\n\n".join(
+            path.read_text().strip() if path.exists() else "" for path in files
+        )
+        compiled = {
+            "profile": profile,
+            "versions": versions,
+            "system_prompt": system_prompt,
+            "hash": hashlib.sha256(system_prompt.encode("utf-8")).hexdigest(),
+            "tokens": None,
+            "tokens_estimated": None,
+            "counted_at": None
+        }
+    if with_token_count and count_due(compiled["tokens"], compiled["tokens_estimated"], compiled["counted_at"]):
+        compiled = dict(compiled)
+        compiled["tokens"], compiled["tokens_estimated"] = count_tokens(compiled["system_prompt"])
+        compiled["counted_at"] = time.monotonic()
+
+    with _lock:
+        _compiled[profile] = compiled
+    return compiled
+
+
+def compile_meeting_prompts(profiles):
+    """Compile and count tokens for profiles in the background (on save or first listing)"""
+    with _lock:
+        missing = [profile for profile in profiles if profile not in _compiled]
+    if missing:
+        threading.Thread(
+            target=lambda: [get_meeting_prompt(profile) for profile in missing],
+            name="compile-meeting-prompts",
+            daemon=True
+        ).start()
+
+
+def invalidate_meeting_prompt(profile):
+    """Drop a compiled prompt so the next listing recompiles it"""
+    with _lock:
+        _compiled.pop(profile, None)
+
+
+def snapshot_prompt(text):
+    """Keep a prompt's text under its hash, so meetings can pin it across edits and workers"""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    path = PROMPT_SNAPSHOTS_DIR / f"{digest}.txt"
+    if not path.exists():
+        atomic_write_text(path, text)
+    return digest
+
+
+def snapshot_text(digest):
+    """Text kept under a snapshot hash; snapshots never change, so the content cache serves them"""
+    return read_text(PROMPT_SNAPSHOTS_DIR / f"{digest}.txt")
+
+
+def prewarm_meeting(profile, suffix=""):
+    """Open the connection and write the profile's prompt to the prompt cache in the background.
+
+    suffix is appended to the system prompt, for meetings that extend it (panel meetings).
+    """
+    def warm():
+        compiled = get_meeting_prompt(profile)
+        system_prompt = f"{compiled['system_prompt']}\n\n{suffix}" if suffix else compiled["system_prompt"]
+        key = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest() if suffix else compiled["hash"]
+        with _lock:
+            warmed_at = _warmed.get(key, 0)
+            if time.monotonic() - warmed_at < PROMPT_CACHE_TTL_SECONDS:
+                return
+            _warmed[key] = time.monotonic()
+        try:
+            create_message(
+                "prewarm",
+                [{"role": "user", "content": "."}],
+                system=system_prompt,
+                persona=profile,
+                cache_system=True
+            )
+        except Exception:
+            # Warming is best effort; the first turn simply pays the cold cost
+            with _lock:
+                _warmed.pop(key, None)
+
+    threading.Thread(target=warm, name="prewarm-meeting", daemon=True).start()
@@ -0,0 +1,26 @@
+# Imports
+from datetime import datetime
+
+from core.config import PROMPT_HISTORY_DIR
+from core.fileio import atomic_write_text
+
+# Every saved prompt version: <PROMPT_HISTORY_DIR>/<prompt name>/<YYYYMMDD_HHMMSS_ffffff>.txt
+
+
+def record_prompt_version(path):
+    """Keep a copy of a prompt file's current content before it is overwritten"""
+    if not path.exists():
+        return None
+    directory = PROMPT_HISTORY_DIR / path.stem
+    directory.mkdir(parents=True, exist_ok=True)
+    version_path = directory / f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}{path.suffix}"
+    atomic_write_text(version_path, path.read_text())
+    return version_path
+
+
+def list_prompt_versions(name):
+    """Saved versions of a prompt, newest first"""
+    directory = PROMPT_HISTORY_DIR / name
+    if not directory.is_dir():
+        return []
+    return sorted((path for path in directory.iterdir() if path.is_file()), reverse=True)
@@ -0,0 +1,153 @@
+# Imports
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+from core.config import RATE_LIMIT_CONFIG
+
+# Number of recent wait times kept per mode for the stats view
+WAIT_HISTORY_SIZE = 200
+
+
+class RateLimiter:
+    """Process-wide token bucket for requests and tokens per minute, served by priority"""
+
+    def __init__(self, requests_per_minute, tokens_per_minute, priorities):
+        self._condition = threading.Condition()
+        self._request_capacity = float(requests_per_minute)
+        self._token_capacity = float(tokens_per_minute)
+        self._requests = self._request_capacity
+        self._tokens = self._token_capacity
+        self._updated = time.monotonic()
+        self._priorities = priorities
+        self._lowest_priority = max(priorities.values(), default=0) + 1
+        self._counter = itertools.count()
+        self._queue = []
+        self._waits = {}
+
+    def set_limits(self, requests_per_minute, tokens_per_minute):
+        """Change the budget, e.g. for a batch job that only gets a share of the key's limits"""
+        with self._condition:
+            self._refill()
+            self._request_capacity = float(requests_per_minute)
+            self._token_capacity = float(tokens_per_minute)
+            self._requests = min(self._requests, self._request_capacity)
+            self._tokens = min(self._tokens, self._token_capacity)
+            self._condition.notify_all()
+
+    def _refill(self):
+        """Top up both buckets for the time elapsed since the last refill"""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self._request_capacity, self._requests + elapsed * self._request_capacity / 60)
+        self._tokens = min(self._token_capacity, self._tokens + elapsed * self._token_capacity / 60)
+
+    def _seconds_until_available(self, tokens):
+        """Time until both buckets can cover one request of the given size"""
+        missing_requests = max(0.0, 1 - self._requests)
+        missing_tokens = max(0.0, tokens - self._tokens)
+        return max(
+            missing_requests * 60 / self._request_capacity,
+            missing_tokens * 60 / self._token_capacity,
+            0.01
+        )
+
+    def acquire(self, mode, tokens):
+        """Block until the request may be sent; returns the number of tokens reserved"""
+        tokens = min(float(tokens), self._token_capacity)
+        ticket = (self._priorities.get(mode, self._lowest_priority), next(self._counter), mode)
+        started = time.monotonic()
+
+        with self._condition:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    self._refill()
+                    if self._queue[0] is ticket:
+                        if self._requests >= 1 and self._tokens >= tokens:
+                            break
+                        self._condition.wait(self._seconds_until_available(tokens))
+                    else:
+                        self._condition.wait()
+                heapq.heappop(self._queue)
+                self._requests -= 1
+                self._tokens -= tokens
+                self._waits.setdefault(mode, deque(maxlen=WAIT_HISTORY_SIZE)).append(
+                    time.monotonic() - started
+                )
+            except BaseException:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                raise
+            finally:
+                self._condition.notify_all()
+
+        return tokens
+
+    def try_acquire(self, mode, tokens):
+        """Reserve a request only if capacity is free now and nothing is queued; returns the
+        number of tokens reserved, or None. For optional requests that must not delay others"""
+        tokens = min(float(tokens), self._token_capacity)
+        with self._condition:
+            self._refill()
+            if self._queue or self._requests < 1 or self._tokens < tokens:
+                return None
+            self._requests -= 1
+            self._tokens -= tokens
+        return tokens
+
+    def release(self, reserved, used):
+        """Return unused reserved tokens to the bucket once actual usage is known"""
+        with self._condition:
+            self._refill()
+            self._tokens = min(self._token_capacity, self._tokens + reserved - used)
+            self._condition.notify_all()
+
+    def snapshot(self):
+        """Current queue depth and recent wait times per mode"""
+        with self._condition:
+            self._refill()
+            depth = {}
+            for _, _, mode in self._queue:
+                depth[mode] = depth.get(mode, 0) + 1
+            waits = {mode: sorted(values) for mode, values in self._waits.items()}
+            available_requests = self._requests
+            available_tokens = self._tokens
+
+        modes = sorted(
+            set(self._priorities) | set(depth) | set(waits),
+            key=lambda mode: (self._priorities.get(mode, self._lowest_priority), mode)
+        )
+        rows = []
+        for mode in modes:
+            mode_waits = waits.get(mode, [])
+            rows.append({
+                "mode": mode,
+                "priority": self._priorities.get(mode, self._lowest_priority),
+                "queued": depth.get(mode, 0),
+                "served": len(mode_waits),
+                "p50_wait_s": percentile(mode_waits, 0.50),
+                "p95_wait_s": percentile(mode_waits, 0.95),
+                "max_wait_s": mode_waits[-1] if mode_waits else 0.0
+            })
+        return {
+            "available_requests": available_requests,
+            "available_tokens": available_tokens,
+            "modes": rows
+        }
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# Shared by every page and session in this process
+rate_limiter = RateLimiter(**RATE_LIMIT_CONFIG)
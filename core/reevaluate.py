@@ -0,0 +1,267 @@
+"""Re-run an edited evaluation prompt over saved meetings and compare scores with its previous version.
+
+Usage: python -m core.reevaluate {response,meeting} [--baseline PATH] [--customer NAME]
+                                 [--limit N] [--workers N] [--fresh]
+
+The baseline is the newest differing version kept in prompt history (Settings keeps
+the replaced version on every save) unless --baseline names a file. Each meeting is
+graded with both prompts on a bounded worker pool; results are appended to a
+checkpoint file as they finish, so an interrupted run resumes where it stopped.
+Throughput is bounded by REEVALUATION_CONFIG["rate_limits"]: the share of the API key's
+limits set aside with PITCH_PERFECT_BATCH_RATE_SHARE, else one server worker's split.
+"""
+# Imports
+import argparse
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from core.config import (
+    CUSTOMERS_DIR,
+    EVALUATION_CONFIG,
+    PROFILE_EXTENSION,
+    PROMPTS_DIR,
+    REEVALUATIONS_DIR,
+    REEVALUATION_CONFIG
+)
+from core.evaluation import (
+    meeting_evaluation_messages,
+    request_batched_response_evaluations,
+    request_structured_evaluation,
+    vendor_turn_contents
+)
+from core.export import iter_entries
+from core.fileio import atomic_write_text
+from core.prompt_history import list_prompt_versions
+from core.rate_limiter import rate_limiter
+from core.storage import read_entry
+
+# Prompt file stem -> re-evaluation kind
+REEVALUATION_PROMPTS = {
+    "response_evaluation_model": "response",
+    "meeting_evaluation_model": "meeting"
+}
+KIND_PROMPTS = {kind: name for name, kind in REEVALUATION_PROMPTS.items()}
+
+OVERALL_CRITERION = "Overall"
+
+
+def load_prompts(kind, baseline_path=None):
+    """Baseline and candidate (current) text of the kind's evaluation prompt"""
+    name = KIND_PROMPTS[kind]
+    candidate = (PROMPTS_DIR / f"{name}.txt").read_text().strip()
+    if baseline_path:
+        return Path(baseline_path).read_text().strip(), candidate
+    for path in list_prompt_versions(name):
+        baseline = path.read_text().strip()
+        if baseline != candidate:
+            return baseline, candidate
+    raise SystemExit(f"No earlier version of {name} in prompt history; pass --baseline")
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else None
+
+
+def response_scores(evaluations):
+    """Mean score per criterion across a meeting's graded vendor turns"""
+    by_criterion = {}
+    for evaluation in evaluations:
+        for item in evaluation.get("criteria", []):
+            if "score" in item:
+                by_criterion.setdefault(item["criterion"], []).append(item["score"])
+    return {criterion: _mean(scores) for criterion, scores in by_criterion.items()}
+
+
+def meeting_scores(evaluation):
+    """Score per criterion of a meeting evaluation, plus the overall score"""
+    scores = {item["criterion"]: item["score"] for item in evaluation.get("criteria", []) if "score" in item}
+    if evaluation.get("overall_score") is not None:
+        scores[OVERALL_CRITERION] = evaluation["overall_score"]
+    return scores
+
+
+def grade(kind, system, meeting, persona, usage):
+    """Per-criterion scores of one meeting under one prompt"""
+    conversation = meeting.get("conversation", [])
+    if kind == "response":
+        turns = vendor_turn_contents(conversation)
+        # Keep each batched call within the batch token budget
+        per_call = max(1, EVALUATION_CONFIG["batch_max_tokens"] // EVALUATION_CONFIG["structured_max_tokens"]["response_evaluation"])
+        evaluations = []
+        for start in range(0, len(turns), per_call):
+            evaluations += request_batched_response_evaluations(
+                system, turns[start:start + per_call], persona=persona, usage=usage
+            )
+        return response_scores(evaluations)
+
+    customer_model = meeting.get("customer_model")
+    if not customer_model:
+        profile = CUSTOMERS_DIR / f"{persona}{PROFILE_EXTENSION}"
+        customer_model = profile.read_text().strip() if profile.exists() else ""
+    evaluation = request_structured_evaluation(
+        "meeting_evaluation",
+        system,
+        meeting_evaluation_messages(customer_model, conversation),
+        persona=persona,
+        usage=usage
+    )
+    return meeting_scores(evaluation)
+
+
+def entry_key(entry):
+    """Stable key of a stored meeting for checkpointing"""
+    return f"{entry['customer']}/{entry['meeting_id'] or entry['name']}"
+
+
+def reevaluate_meeting(kind, prompts, entry):
+    """Grade one meeting with the baseline and candidate prompts; returns its checkpoint record"""
+    started = time.perf_counter()
+    usage = {}
+    record = {"key": entry_key(entry), "customer": entry["customer"], "meeting_id": entry["meeting_id"]}
+    try:
+        meeting = json.loads(read_entry(entry))
+        record["baseline"] = grade(kind, prompts[0], meeting, entry["customer"], usage)
+        record["candidate"] = grade(kind, prompts[1], meeting, entry["customer"], usage)
+        record["error"] = None
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["usage"] = usage
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def load_checkpoint(results_path):
+    """Records already written by earlier invocations of a run"""
+    records = {}
+    if not results_path.exists():
+        return records
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Line cut short by an interrupted run
+                continue
+            # Failed meetings are retried on the next invocation
+            if not record.get("error"):
+                records[record["key"]] = record
+    return records
+
+
+def summarize(records):
+    """Per-criterion score deltas and token totals of a run"""
+    pairs = {}
+    usage = {}
+    errors = 0
+    for record in records:
+        if record.get("error"):
+            errors += 1
+            continue
+        for field, value in record.get("usage", {}).items():
+            usage[field] = usage.get(field, 0) + value
+        for criterion, baseline in record["baseline"].items():
+            candidate = record["candidate"].get(criterion)
+            if baseline is not None and candidate is not None:
+                pairs.setdefault(criterion, []).append((baseline, candidate))
+
+    criteria = []
+    for criterion, values in sorted(pairs.items()):
+        deltas = [candidate - baseline for baseline, candidate in values]
+        criteria.append({
+            "criterion": criterion,
+            "meetings": len(values),
+            "baseline": round(_mean([baseline for baseline, _ in values]), 3),
+            "candidate": round(_mean([candidate for _, candidate in values]), 3),
+            "delta": round(_mean(deltas), 3),
+            "abs_delta": round(_mean([abs(delta) for delta in deltas]), 3),
+            "up": sum(delta > 0 for delta in deltas),
+            "down": sum(delta < 0 for delta in deltas)
+        })
+    return {"criteria": criteria, "usage": usage, "errors": errors}
+
+
+def run_reevaluation(kind, baseline_path=None, customer=None, limit=None,
+                     workers=REEVALUATION_CONFIG["workers"], fresh=False):
+    """Re-evaluate saved meetings with both prompt versions; returns the run report"""
+    prompts = load_prompts(kind, baseline_path)
+    rate_limiter.set_limits(**REEVALUATION_CONFIG["rate_limits"])
+    run_id = hashlib.sha256("\0".join((kind,) + prompts).encode("utf-8")).hexdigest()[:12]
+    run_dir = REEVALUATIONS_DIR / f"{kind}_{run_id}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    results_path = run_dir / "results.jsonl"
+    if fresh:
+        results_path.unlink(missing_ok=True)
+    done = load_checkpoint(results_path)
+    print(f"run {run_dir.name}: {len(done)} meetings already graded")
+
+    started = time.perf_counter()
+    entries = (entry for entry in iter_entries("meeting", customer) if entry_key(entry) not in done)
+    submitted = 0
+    graded = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool, open(results_path, "a", encoding="utf-8") as results:
+        in_flight = set()
+        while True:
+            # Keep at most two meetings per worker queued so large corpora are never loaded at once
+            while len(in_flight) < workers * 2 and (limit is None or submitted < limit):
+                entry = next(entries, None)
+                if entry is None:
+                    break
+                in_flight.add(pool.submit(reevaluate_meeting, kind, prompts, entry))
+                submitted += 1
+            if not in_flight:
+                break
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                record = future.result()
+                # Checkpoint every meeting as soon as it is graded
+                results.write(json.dumps(record) + "\n")
+                results.flush()
+                done[record["key"]] = record
+                graded += 1
+                if graded % 50 == 0:
+                    print(f"{graded} meetings graded in {time.perf_counter() - started:.0f}s")
+
+    report = summarize(done.values())
+    report.update({
+        "run": run_dir.name,
+        "kind": kind,
+        "meetings": len(done),
+        "graded_now": graded,
+        "wall_s": round(time.perf_counter() - started, 1)
+    })
+    atomic_write_text(run_dir / "report.json", json.dumps(report, indent=2))
+    return report
+
+
+def print_report(report):
+    print(f"\n{report['meetings']} meetings ({report['graded_now']} graded in {report['wall_s']}s, "
+          f"{report['errors']} errors)")
+    print(f"{'criterion':<40}{'meetings':>9}{'baseline':>10}{'candidate':>10}{'delta':>8}{'|delta|':>9}{'up':>6}{'down':>6}")
+    for row in report["criteria"]:
+        print(f"{row['criterion'][:39]:<40}{row['meetings']:>9}{row['baseline']:>10.2f}{row['candidate']:>10.2f}"
+              f"{row['delta']:>+8.2f}{row['abs_delta']:>9.2f}{row['up']:>6}{row['down']:>6}")
+    usage = report["usage"]
+    print(f"tokens: {usage.get('input_tokens', 0):,} input, {usage.get('output_tokens', 0):,} output, "
+          f"{usage.get('cache_read_input_tokens', 0):,} cache read")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare evaluation scores of saved meetings across prompt versions")
+    parser.add_argument("kind", choices=list(KIND_PROMPTS))
+    parser.add_argument("--baseline", type=Path, help="Prompt file to compare against (default: previous saved version)")
+    parser.add_argument("--customer", help="Only re-evaluate this customer's meetings")
+    parser.add_argument("--limit", type=int, help="Grade at most this many meetings in this invocation")
+    parser.add_argument("--workers", type=int, default=REEVALUATION_CONFIG["workers"], help="Concurrent meetings")
+    parser.add_argument("--fresh", action="store_true", help="Discard the checkpoint and start over")
+    args = parser.parse_args()
+    print_report(run_reevaluation(
+        args.kind,
+        baseline_path=args.baseline,
+        customer=args.customer,
+        limit=args.limit,
+        workers=args.workers,
+        fresh=args.fresh
+    ))
@@ -0,0 +1,293 @@
+"""Delete or archive stored meetings by age, total size, count per customer and length.
+
+Usage: python -m core.retention [--max-age-days N] [--max-mb N] [--keep-latest N]
+                                [--min-turns K] [--action delete|archive] [--apply]
+                                [--session-max-age-days N] [--grace-hours N]
+
+A meeting's transcript, response evaluations and report are kept or removed together.
+Without --apply only the report of what would be removed is printed. Deleting archived
+meetings compacts their monthly bundles; archiving packs plain files into bundles.
+Session store rows of removed meetings are dropped too, as are sessions idle for longer
+than --session-max-age-days (meetings that were never finished). Meetings whose session
+was saved, or any of whose items was written, within --grace-hours may still be running
+and are always kept.
+"""
+# Imports
+import argparse
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+
+from core.archive import pack_month, remove_empty_shards
+from core.config import RETENTION_CONFIG
+from core.fileio import atomic_write_text
+from core.session_store import delete_session, prune_sessions, recent_sessions
+from core.storage import (
+    STORES,
+    archived_entries,
+    entry_modified,
+    index_bundle_path,
+    legacy_entries,
+    load_archive_index,
+    parse_stored_timestamp,
+    sharded_entries,
+    sidecar_paths
+)
+from core.transcript import count_turns
+
+# Policies in the order a meeting's removal reason is reported
+POLICIES = ("min_turns", "max_age_days", "keep_latest", "max_mb")
+
+
+def entry_bytes(entry):
+    """Bytes an item takes on disk: its compressed length when archived, else file and sidecars"""
+    if entry.get("archive"):
+        return entry["archive"]["length"]
+    return sum(path.stat().st_size for path in [entry["path"]] + sidecar_paths(entry["path"]) if path.exists())
+
+
+def _add_to_group(groups, key, entry):
+    group = groups.setdefault(key, {
+        "customer": entry["customer"],
+        "meeting_id": entry["meeting_id"],
+        "started": parse_stored_timestamp(entry["timestamp"]) or entry_modified(entry),
+        "last_modified": entry_modified(entry),
+        "items": [],
+        "bytes": 0,
+        "meeting": None
+    })
+    group["items"].append(entry)
+    group["bytes"] += entry_bytes(entry)
+    group["last_modified"] = max(group["last_modified"], entry_modified(entry))
+    if entry["kind"] == "meeting":
+        group["meeting"] = entry
+
+
+def collect_meetings():
+    """Every stored item grouped per meeting, newest meeting first"""
+    groups = {}
+    legacy_reports = []
+    for kind in STORES:
+        for entries in (sharded_entries, legacy_entries, archived_entries):
+            for entry in entries(kind):
+                if entry["meeting_id"] is None and kind == "report":
+                    legacy_reports.append(entry)
+                    continue
+                _add_to_group(groups, (entry["customer"], entry["meeting_id"] or entry["timestamp"]), entry)
+
+    # Legacy reports are stamped at freeze time: attach each to the latest legacy meeting started before it
+    for entry in legacy_reports:
+        frozen = parse_stored_timestamp(entry["timestamp"])
+        candidates = [
+            (group["started"], key) for key, group in groups.items()
+            if group["meeting_id"] is None and group["customer"] == entry["customer"]
+            and frozen is not None and group["started"] <= frozen
+        ]
+        key = max(candidates)[1] if candidates else (entry["customer"], entry["timestamp"])
+        _add_to_group(groups, key, entry)
+    return sorted(groups.values(), key=lambda group: group["started"], reverse=True)
+
+
+def select_meetings(groups, max_age_days=None, max_mb=None, keep_latest=None, min_turns=None,
+                    grace_hours=None, active_meetings=()):
+    """Meetings to remove, each tagged with the first policy it matched, plus the meetings kept.
+
+    Meetings in active_meetings or with an item written within grace_hours are always kept.
+    Size is enforced last: the oldest remaining meetings go until the rest fits max_mb.
+    """
+    cutoff = datetime.now() - timedelta(days=max_age_days) if max_age_days is not None else None
+    live_cutoff = datetime.now() - timedelta(hours=grace_hours) if grace_hours is not None else None
+    kept_per_customer = {}
+    selected = []
+    kept = []
+    live = []
+    for group in groups:
+        if group["meeting_id"] in active_meetings or (live_cutoff and group["last_modified"] >= live_cutoff):
+            kept_per_customer[group["customer"]] = kept_per_customer.get(group["customer"], 0) + 1
+            live.append(dict(group, live=True))
+            continue
+        reason = None
+        # Reports or evaluations whose transcript is gone are not judged by length
+        if min_turns is not None and group["meeting"] is not None and count_turns(group["meeting"]) < min_turns:
+            reason = "min_turns"
+        elif cutoff is not None and group["started"] < cutoff:
+            reason = "max_age_days"
+        elif keep_latest is not None and kept_per_customer.get(group["customer"], 0) >= keep_latest:
+            reason = "keep_latest"
+        if reason:
+            selected.append(dict(group, reason=reason))
+        else:
+            kept_per_customer[group["customer"]] = kept_per_customer.get(group["customer"], 0) + 1
+            kept.append(group)
+
+    if max_mb is not None:
+        total = sum(group["bytes"] for group in kept + live)
+        # Newest first, so popping from the end drops the oldest
+        while kept and total > max_mb * 2 ** 20:
+            group = kept.pop()
+            total -= group["bytes"]
+            selected.append(dict(group, reason="max_mb"))
+    return selected, kept + live
+
+
+def compact_bundle(index_path, dropped):
+    """Rewrite an archive bundle without the dropped (customer, name) items, then publish its index"""
+    index = load_archive_index(index_path)
+    bundle_path = index_bundle_path(index_path, index)
+    kept = [item for item in index["items"] if (item["customer"], item["name"]) not in dropped]
+    if not kept:
+        index_path.unlink()
+        bundle_path.unlink(missing_ok=True)
+        return
+
+    # Readers use the old bundle until the new index names the new one
+    month = index_path.name.split(".")[0]
+    new_path = bundle_path.parent / f"{month}.{uuid.uuid4().hex[:8]}{bundle_path.suffix}"
+    items = []
+    with open(bundle_path, "rb") as source, open(new_path, "wb") as bundle:
+        for item in kept:
+            source.seek(item["offset"])
+            data = source.read(item["length"])
+            items.append(dict(item, offset=bundle.tell()))
+            bundle.write(data)
+        bundle.flush()
+        os.fsync(bundle.fileno())
+    atomic_write_text(index_path, json.dumps({**index, "bundle": new_path.name, "items": items}))
+    # Readers that listed entries from the old index look the item up again once it is gone
+    bundle_path.unlink(missing_ok=True)
+
+
+def delete_meetings(selected):
+    """Delete the items of the selected meetings; returns the number of items removed"""
+    removed = 0
+    archived = {}
+    for group in selected:
+        for entry in group["items"]:
+            if entry.get("archive"):
+                archived.setdefault(entry["archive"]["index"], set()).add((entry["customer"], entry["name"]))
+                continue
+            entry["path"].unlink(missing_ok=True)
+            for sidecar in sidecar_paths(entry["path"]):
+                sidecar.unlink(missing_ok=True)
+            remove_empty_shards(entry["kind"], entry["path"].parent)
+            removed += 1
+    for index_path, dropped in archived.items():
+        compact_bundle(index_path, dropped)
+        removed += len(dropped)
+    return removed
+
+
+def archive_meetings(selected):
+    """Pack the plain-file items of the selected meetings into monthly bundles"""
+    by_bundle = {}
+    for group in selected:
+        for entry in group["items"]:
+            if entry.get("archive"):
+                continue
+            entry["modified"] = entry["path"].stat().st_mtime
+            by_bundle.setdefault((entry["kind"], group["started"].strftime("%Y-%m")), []).append(entry)
+    return sum(pack_month(kind, month, entries) for (kind, month), entries in sorted(by_bundle.items()))
+
+
+def run_retention(max_age_days=None, max_mb=None, keep_latest=None, min_turns=None,
+                  action="archive", apply=False, session_max_age_days=None, grace_hours=None):
+    """Select meetings by the given policies and, with apply, delete or archive them; returns the report"""
+    stale_sessions = (
+        prune_sessions(session_max_age_days * 86400, apply=apply) if session_max_age_days is not None else 0
+    )
+    active = recent_sessions(grace_hours * 3600) if grace_hours is not None else set()
+    selected, kept = select_meetings(
+        collect_meetings(), max_age_days, max_mb, keep_latest, min_turns, grace_hours, active
+    )
+    if action == "archive":
+        # Meetings already fully archived have nothing left to pack
+        kept += [group for group in selected if all(entry.get("archive") for entry in group["items"])]
+        selected = [group for group in selected if any(not entry.get("archive") for entry in group["items"])]
+
+    by_reason = {policy: {"meetings": 0, "items": 0, "bytes": 0} for policy in POLICIES}
+    by_customer = {}
+    for group in selected:
+        row = by_reason[group["reason"]]
+        row["meetings"] += 1
+        row["items"] += len(group["items"])
+        row["bytes"] += group["bytes"]
+        by_customer[group["customer"]] = by_customer.get(group["customer"], 0) + 1
+
+    report = {
+        "action": action,
+        "applied": apply,
+        "by_reason": by_reason,
+        "by_customer": by_customer,
+        "selected_meetings": len(selected),
+        "selected_bytes": sum(group["bytes"] for group in selected),
+        "kept_meetings": len(kept),
+        "kept_bytes": sum(group["bytes"] for group in kept),
+        "live_meetings": sum(1 for group in kept if group.get("live")),
+        "items_processed": 0,
+        "stale_sessions": stale_sessions
+    }
+    if not apply or not selected:
+        return report
+
+    if action == "delete":
+        report["items_processed"] = delete_meetings(selected)
+    else:
+        report["items_processed"] = archive_meetings(selected)
+    for group in selected:
+        if group["meeting_id"]:
+            delete_session(group["meeting_id"])
+    return report
+
+
+def _size(value):
+    return f"{value / 2 ** 20:.1f} MB" if value >= 2 ** 20 else f"{value / 1024:.1f} KB"
+
+
+def print_report(report):
+    verb = report["action"] if report["applied"] else f"would {report['action']}"
+    print(f"{'policy':<14}{'meetings':>10}{'items':>8}{'size':>12}")
+    for policy, row in report["by_reason"].items():
+        if row["meetings"]:
+            print(f"{policy:<14}{row['meetings']:>10}{row['items']:>8}{_size(row['bytes']):>12}")
+    for customer, count in sorted(report["by_customer"].items()):
+        print(f"  {customer}: {count} meetings")
+    print(f"{verb}: {report['selected_meetings']} meetings ({_size(report['selected_bytes'])}); "
+          f"keeping {report['kept_meetings']} ({_size(report['kept_bytes'])})")
+    if report["live_meetings"]:
+        print(f"skipped {report['live_meetings']} meetings active within the grace period")
+    if report["stale_sessions"]:
+        print(f"{'pruned' if report['applied'] else 'would prune'} {report['stale_sessions']} idle sessions")
+    if report["applied"]:
+        print(f"{report['items_processed']} items processed")
+    elif report["selected_meetings"]:
+        print("Dry run; rerun with --apply to make these changes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete or archive stored meetings by retention policy")
+    parser.add_argument("--max-age-days", type=int, default=RETENTION_CONFIG["max_age_days"],
+                        help="Remove meetings that started more than this many days ago")
+    parser.add_argument("--max-mb", type=int, default=RETENTION_CONFIG["max_mb"],
+                        help="Remove the oldest meetings until the rest fits in this many MB")
+    parser.add_argument("--keep-latest", type=int, default=RETENTION_CONFIG["keep_latest"],
+                        help="Keep only this many of each customer's newest meetings")
+    parser.add_argument("--min-turns", type=int, default=RETENTION_CONFIG["min_turns"],
+                        help="Remove meetings with fewer conversation messages than this")
+    parser.add_argument("--action", choices=["delete", "archive"], default=RETENTION_CONFIG["action"])
+    parser.add_argument("--session-max-age-days", type=int, default=RETENTION_CONFIG["session_max_age_days"],
+                        help="Drop session store rows of meetings idle for more than this many days")
+    parser.add_argument("--grace-hours", type=int, default=RETENTION_CONFIG["grace_hours"],
+                        help="Always keep meetings with a session or item updated within this many hours")
+    parser.add_argument("--apply", action="store_true", help="Make the changes instead of only reporting them")
+    args = parser.parse_args()
+    print_report(run_retention(
+        max_age_days=args.max_age_days,
+        max_mb=args.max_mb,
+        keep_latest=args.keep_latest,
+        min_turns=args.min_turns,
+        action=args.action,
+        apply=args.apply,
+        session_max_age_days=args.session_max_age_days,
+        grace_hours=args.grace_hours
+    ))
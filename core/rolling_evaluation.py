@@ -0,0 +1,175 @@
+"""Meeting evaluation kept up to date in the background while the meeting runs.
+
+After each turn the draft is updated with only the vendor turns it does not cover yet,
+together with their turn evaluations, so an update's input does not grow with the
+meeting. Freezing the meeting then only has to fold in the turns the latest update
+missed, which for structured output happens locally from the turn evaluations.
+
+A draft is a dict {"turns": vendor turns covered, "scores": structured fields or None,
+"text": readable evaluation}; the page keeps a copy in session state so a resumed
+meeting continues from it on any worker.
+"""
+# Imports
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from core.config import EVALUATION_CONFIG
+from core.evaluation import (
+    read_instruction,
+    render_meeting_evaluation,
+    request_structured_evaluation,
+    rolling_evaluation_messages
+)
+from core.llm import create_message, response_text
+
+# Meeting evaluation criterion (prompts/meeting_evaluation_model.txt) that each response
+# evaluation criterion (prompts/response_evaluation_model.txt) is folded into
+MEETING_CRITERIA = {
+    "understanding of my needs": "Understanding of Customer's Context",
+    "solution quality": "Solution Architecture",
+    "communication effectiveness": "Communication Effectiveness",
+    "value proposition": "Value Articulation"
+}
+
+_drafts = {}
+_updates = {}
+_lock = threading.Lock()
+_pool = ThreadPoolExecutor(
+    max_workers=EVALUATION_CONFIG["rolling_workers"],
+    thread_name_prefix="rolling-evaluation"
+)
+
+
+def empty_draft():
+    return {"turns": 0, "scores": None, "text": ""}
+
+
+def update_draft(draft, system, customer_model, turn_contents, turn_evaluations, structured, persona=None):
+    """Draft extended to cover every vendor turn given, from only the turns it does not cover"""
+    covered = draft["turns"]
+    if covered >= len(turn_contents):
+        return draft
+    messages = rolling_evaluation_messages(
+        customer_model, draft["text"], covered, turn_contents[covered:], turn_evaluations[covered:]
+    )
+    system = f"{system}\n\n{read_instruction('rolling_evaluation_instruction')}"
+    if structured:
+        scores = request_structured_evaluation("meeting_evaluation", system, messages, persona=persona)
+        return {"turns": len(turn_contents), "scores": scores, "text": render_meeting_evaluation(scores)}
+    text = response_text(create_message("meeting_evaluation", messages, system=system, persona=persona))
+    return {"turns": len(turn_contents), "scores": None, "text": text}
+
+
+def _newer(first, second):
+    return second if second and (not first or second["turns"] > first["turns"]) else first
+
+
+def latest_draft(meeting_id, draft):
+    """The newer of a meeting's stored draft and the caller's copy"""
+    with _lock:
+        return _newer(draft, _drafts.get(meeting_id))
+
+
+def _run_update(meeting_id, draft, *args):
+    try:
+        updated = update_draft(draft, *args)
+    except Exception:
+        # Best effort; the next turn's update or the final fold covers these turns
+        return
+    with _lock:
+        # The meeting was discarded while this update ran
+        if meeting_id not in _updates:
+            return
+        _drafts[meeting_id] = _newer(_drafts.get(meeting_id), updated)
+
+
+def schedule_update(meeting_id, draft, system, customer_model, turn_contents, turn_evaluations,
+                    structured, persona=None):
+    """Update a meeting's draft in the background; skipped while its previous update is still
+    running, since the next one covers the turns this one would have"""
+    with _lock:
+        running = _updates.get(meeting_id)
+        if running and not running.done():
+            return False
+        draft = _newer(draft, _drafts.get(meeting_id))
+        if draft["turns"] >= len(turn_contents):
+            return False
+        _updates[meeting_id] = _pool.submit(
+            _run_update, meeting_id, draft, system, customer_model,
+            list(turn_contents), list(turn_evaluations), structured, persona
+        )
+    return True
+
+
+def fold_turn_scores(scores, covered, turn_scores):
+    """Structured meeting evaluation with later turn evaluations folded in locally.
+
+    Response criteria are mapped onto the meeting rubric (MEETING_CRITERIA); a mapped
+    criterion's score becomes the turn-weighted mean, and one the draft lacks is added
+    under its meeting name. Response criteria with no meeting counterpart are left out,
+    and the overall score stays the draft's, since it is not a mean of turn scores.
+    """
+    criteria = {
+        (item.get("criterion") or "").lower(): dict(item)
+        for item in scores.get("criteria", []) if item.get("criterion")
+    }
+    weights = {key: max(covered, 1) for key in criteria}
+
+    for evaluation in turn_scores:
+        # Turns whose grading failed are kept in place as None
+        if not evaluation:
+            continue
+        for item in evaluation.get("criteria", []):
+            name = MEETING_CRITERIA.get((item.get("criterion") or "").lower())
+            if name is None or not isinstance(item.get("score"), (int, float)):
+                continue
+            key = name.lower()
+            if key not in criteria:
+                criteria[key] = {
+                    "criterion": name,
+                    "observations": [item["observation"]] if item.get("observation") else [],
+                    "evidence": [item["evidence"]] if item.get("evidence") else [],
+                    "score": item["score"]
+                }
+                weights[key] = 1
+                continue
+            criterion = criteria[key]
+            previous = criterion.get("score", item["score"])
+            criterion["score"] = (previous * weights[key] + item["score"]) / (weights[key] + 1)
+            weights[key] += 1
+
+    folded = dict(scores)
+    folded["criteria"] = [
+        dict(item, score=round(item["score"])) if isinstance(item.get("score"), (int, float)) else item
+        for item in criteria.values()
+    ]
+    return folded
+
+
+def finalize_draft(meeting_id, draft, system, customer_model, turn_contents, turn_evaluations,
+                   turn_scores, structured, persona=None):
+    """Final meeting evaluation from the rolling draft; None when no draft exists yet.
+
+    Waits briefly for an update still running, then folds in whatever turns the draft
+    does not cover: locally for structured output, with one small update otherwise.
+    """
+    with _lock:
+        running = _updates.get(meeting_id)
+    if running:
+        wait([running], timeout=EVALUATION_CONFIG["rolling_finalize_wait_s"])
+    draft = latest_draft(meeting_id, draft)
+    if not draft or not draft["turns"]:
+        return None
+    if draft["turns"] >= len(turn_contents):
+        return draft
+    if structured and draft["scores"]:
+        scores = fold_turn_scores(draft["scores"], draft["turns"], turn_scores[draft["turns"]:])
+        return {"turns": len(turn_contents), "scores": scores, "text": render_meeting_evaluation(scores)}
+    return update_draft(draft, system, customer_model, turn_contents, turn_evaluations, structured, persona)
+
+
+def discard(meeting_id):
+    """Forget a meeting's draft once its report is written or the meeting is abandoned"""
+    with _lock:
+        _drafts.pop(meeting_id, None)
+        _updates.pop(meeting_id, None)
@@ -0,0 +1,42 @@
+# Imports
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from core.config import SCAN_CONFIG
+
+# Shared by every listing; on network or cold storage each stat, listing and read is a
+# round trip, so they are issued concurrently instead of one after another
+scan_pool = ThreadPoolExecutor(max_workers=SCAN_CONFIG["workers"], thread_name_prefix="scan")
+
+
+def subdirs(directory):
+    """Subdirectories of a directory, sorted by name; the listing's file types avoid a stat each"""
+    try:
+        with os.scandir(directory) as entries:
+            return sorted((Path(entry.path) for entry in entries if entry.is_dir()), key=lambda path: path.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _file_stat(entry):
+    return Path(entry.path), entry.stat()
+
+
+def scan_files(directory, suffix, with_stat=True):
+    """Regular files directly in a directory ending in suffix, as (path, stat) pairs sorted by name.
+
+    The stat comes from the directory entry (free on Windows, one call on POSIX), taken on
+    the scan pool; with_stat=False skips it and pairs each path with None.
+    """
+    try:
+        with os.scandir(directory) as listing:
+            entries = sorted(
+                (entry for entry in listing if entry.name.endswith(suffix) and entry.is_file()),
+                key=lambda entry: entry.name
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    if not with_stat:
+        return [(Path(entry.path), None) for entry in entries]
+    return list(scan_pool.map(_file_stat, entries))
@@ -0,0 +1,218 @@
+"""Benchmark cold directory listings: the serial glob, stat and read scan against core.scan.
+
+Usage: python -m core.scan_benchmark [--files 2000] [--customers 50] [--latency-ms 2] [--repeat 3]
+
+Builds a synthetic tree in a temporary directory: flat directories of projects, customer
+profiles and prompts, and sharded meetings and reports. Every listing is timed in a fresh
+process, so the shared content cache starts empty, after the files' pages are dropped from
+the OS cache where posix_fadvise is available. --latency-ms adds a delay to every stat,
+directory listing and file open, standing in for network-mounted or cold storage.
+"""
+# Imports
+import argparse
+import io
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+# Isolate the run before core.config is imported
+os.environ.setdefault("PITCH_PERFECT_DATA_DIR", tempfile.mkdtemp(prefix="pitch_perfect_scan_benchmark_"))
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+from core.config import DATA_DIR, SCAN_CONFIG
+from core.content_cache import load_files, read_text
+from core.fileio import file_version
+from core.storage import LEGACY_PATTERNS, STORES, legacy_entries, meeting_id_timestamp, sharded_entries
+
+# Flat directories of the benchmark tree and their suffixes
+FLAT_LISTINGS = {
+    "projects": (DATA_DIR / "projects", ".txt"),
+    "profiles": (DATA_DIR / "benchmark_customers", ".txt"),
+    "prompts": (DATA_DIR / "benchmark_prompts", ".txt")
+}
+ENTRY_LISTINGS = {
+    "meetings": "meeting",
+    "reports": "report"
+}
+
+
+def build_tree(files, customers):
+    """Write files items to each flat directory and to the meeting and report stores"""
+    body = "Name: Customer {0}\nRole: Buyer\n" + "Background and objectives of the customer.\n" * 40
+    for directory, suffix in FLAT_LISTINGS.values():
+        directory.mkdir(parents=True, exist_ok=True)
+        for i in range(files):
+            (directory / f"item_{i:05d}{suffix}").write_text(body.format(i))
+    for kind in ENTRY_LISTINGS.values():
+        base, extension = STORES[kind]
+        for i in range(files):
+            month = i % 12 + 1
+            meeting_id = f"2025{month:02d}{i % 28 + 1:02d}_120000_{i:08x}"
+            shard = base / f"customer_{i % customers:03d}" / "2025" / f"{month:02d}"
+            shard.mkdir(parents=True, exist_ok=True)
+            (shard / f"{meeting_id}{extension}").write_text(body.format(i))
+
+
+def drop_page_cache(root):
+    """Ask the OS to evict the tree's file contents from its page cache"""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for directory, _, names in os.walk(root):
+        for name in names:
+            fd = os.open(os.path.join(directory, name), os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+
+class _SlowEntry:
+    """Directory entry whose stat pays the emulated latency; file types come with the listing"""
+
+    def __init__(self, entry, delay):
+        self._entry = entry
+        self._delay = delay
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_file(self, **kwargs):
+        return self._entry.is_file(**kwargs)
+
+    def is_dir(self, **kwargs):
+        return self._entry.is_dir(**kwargs)
+
+    def stat(self, **kwargs):
+        time.sleep(self._delay)
+        return self._entry.stat(**kwargs)
+
+
+class _SlowListing:
+    def __init__(self, listing, delay):
+        self._listing = listing
+        self._delay = delay
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._listing.close()
+        return False
+
+    def __iter__(self):
+        return (_SlowEntry(entry, self._delay) for entry in self._listing)
+
+
+def install_latency(latency_ms):
+    """Delay every stat, directory listing and file open in this process"""
+    if not latency_ms:
+        return
+    delay = latency_ms / 1000
+    stat, scandir, listdir, open_file = os.stat, os.scandir, os.listdir, io.open
+
+    def slow_stat(*args, **kwargs):
+        time.sleep(delay)
+        return stat(*args, **kwargs)
+
+    def slow_scandir(*args, **kwargs):
+        time.sleep(delay)
+        return _SlowListing(scandir(*args, **kwargs), delay)
+
+    def slow_listdir(*args, **kwargs):
+        time.sleep(delay)
+        return listdir(*args, **kwargs)
+
+    def slow_open(*args, **kwargs):
+        time.sleep(delay)
+        return open_file(*args, **kwargs)
+
+    os.stat, os.scandir, os.listdir, io.open = slow_stat, slow_scandir, slow_listdir, slow_open
+
+
+def serial_flat(directory, suffix):
+    """The listing pages used before core.scan: glob, then is_file, read, version and stat per file"""
+    rows = []
+    for file in directory.glob(f"*{suffix}"):
+        if file.is_file():
+            rows.append((read_text(file), file_version(file), file.stat().st_mtime))
+    return rows
+
+
+def serial_entries(kind):
+    """Sharded and legacy entries as listed before core.scan, with report dates stat'ed one by one"""
+    base, extension = STORES[kind]
+    paths = []
+    for root in [d for d in base.iterdir() if d.is_dir()]:
+        paths += [path for path in root.glob(f"*/*/*{extension}") if path.is_file()]
+    paths += [
+        path for path in base.glob(f"*{extension}")
+        if LEGACY_PATTERNS[kind].match(path.stem) and path.is_file()
+    ]
+    rows = [(path, meeting_id_timestamp(path.stem)) for path in paths]
+    if kind == "report":
+        rows = [(path, timestamp, path.stat().st_mtime) for path, timestamp in rows]
+    return rows
+
+
+def scan_flat(directory, suffix):
+    return list(load_files(directory, suffix))
+
+
+def scan_entries(kind):
+    with_modified = kind == "report"
+    return (
+        list(sharded_entries(kind, with_modified=with_modified)) +
+        list(legacy_entries(kind, with_modified=with_modified))
+    )
+
+
+def measure(listing, method, latency_ms, results):
+    """Time one listing in this fresh process"""
+    install_latency(latency_ms)
+    started = time.perf_counter()
+    if listing in FLAT_LISTINGS:
+        rows = (serial_flat if method == "serial" else scan_flat)(*FLAT_LISTINGS[listing])
+    else:
+        rows = (serial_entries if method == "serial" else scan_entries)(ENTRY_LISTINGS[listing])
+    results.put((time.perf_counter() - started, len(rows)))
+
+
+def run_cold(listing, method, latency_ms):
+    """Seconds and rows of one cold listing in its own process"""
+    drop_page_cache(DATA_DIR)
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=measure, args=(listing, method, latency_ms, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold directory listings before and after core.scan")
+    parser.add_argument("--files", type=int, default=2000, help="Files per listing")
+    parser.add_argument("--customers", type=int, default=50, help="Customers the meetings and reports are spread over")
+    parser.add_argument("--latency-ms", type=float, default=2.0,
+                        help="Emulated delay per stat, listing and open (0 for local disk as is)")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold runs per listing and method; the median is shown")
+    args = parser.parse_args()
+
+    print(f"data dir: {DATA_DIR}")
+    build_tree(args.files, args.customers)
+    print(f"{args.files} files per listing, {args.latency_ms:g} ms emulated latency, "
+          f"{SCAN_CONFIG['workers']} scan workers")
+    print(f"{'listing':<10}{'rows':>7}{'serial (s)':>12}{'scan (s)':>10}{'speedup':>9}")
+    for listing in list(FLAT_LISTINGS) + list(ENTRY_LISTINGS):
+        timings = {}
+        for method in ("serial", "scan"):
+            runs = [run_cold(listing, method, args.latency_ms) for _ in range(args.repeat)]
+            timings[method] = statistics.median(seconds for seconds, _ in runs)
+            rows = runs[0][1]
+        speedup = timings["serial"] / timings["scan"] if timings["scan"] else float("inf")
+        print(f"{listing:<10}{rows:>7}{timings['serial']:>12.3f}{timings['scan']:>10.3f}{speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Imports
+import json
+import sqlite3
+import threading
+import time
+
+from core.config import SESSION_STORE_PATH
+
+# Single host only: WAL mode coordinates processes through shared memory (the -shm file),
+# which network file systems do not provide. One connection per thread; SQLite serialises
+# writers across the processes of the host
+_local = threading.local()
+
+
+def _connection():
+    """Thread-local connection to the session store shared by this host's workers"""
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        SESSION_STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(SESSION_STORE_PATH, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "meeting_id TEXT PRIMARY KEY, "
+            "state TEXT NOT NULL, "
+            "updated REAL NOT NULL)"
+        )
+        _local.connection = connection
+    return connection
+
+
+def save_session(meeting_id, state):
+    """Store a meeting's session state so any worker on this host can resume it"""
+    connection = _connection()
+    with connection:
+        connection.execute(
+            "INSERT INTO sessions (meeting_id, state, updated) VALUES (?, ?, ?) "
+            "ON CONFLICT(meeting_id) DO UPDATE SET state = excluded.state, updated = excluded.updated",
+            (meeting_id, json.dumps(state), time.time())
+        )
+
+
+def load_session(meeting_id):
+    """Stored session state of a meeting, or None"""
+    row = _connection().execute(
+        "SELECT state FROM sessions WHERE meeting_id = ?", (meeting_id,)
+    ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def delete_session(meeting_id):
+    """Forget a meeting's session state"""
+    connection = _connection()
+    with connection:
+        connection.execute("DELETE FROM sessions WHERE meeting_id = ?", (meeting_id,))
+
+
+def recent_sessions(max_age_seconds):
+    """Ids of meetings whose session was saved within the given age"""
+    cutoff = time.time() - max_age_seconds
+    rows = _connection().execute("SELECT meeting_id FROM sessions WHERE updated >= ?", (cutoff,)).fetchall()
+    return {row[0] for row in rows}
+
+
+def prune_sessions(max_age_seconds, apply=True):
+    """Delete sessions not updated within the given age; returns the number removed, or
+    without apply the number that would be"""
+    connection = _connection()
+    cutoff = time.time() - max_age_seconds
+    if not apply:
+        return connection.execute("SELECT COUNT(*) FROM sessions WHERE updated < ?", (cutoff,)).fetchone()[0]
+    with connection:
+        return connection.execute("DELETE FROM sessions WHERE updated < ?", (cutoff,)).rowcount
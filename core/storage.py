@@ -0,0 +1,276 @@
+# Imports
+import json
+import os
+import re
+import threading
+import uuid
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from core.config import (
+    MEETINGS_DIR,
+    MEETING_EVALUATIONS_DIR,
+    RESPONSE_EVALUATIONS_DIR,
+    ARCHIVE_DIR,
+    MEETING_EXTENSION,
+    REPORT_EXTENSION,
+    ARCHIVE_BUNDLE_EXTENSION,
+    ARCHIVE_INDEX_EXTENSION,
+    TRANSCRIPT_INDEX_EXTENSION
+)
+from core.fileio import file_version
+from core.profiling import profiled
+from core.scan import scan_files, scan_pool, subdirs
+
+# Layout: <kind dir>/<customer>/<YYYY>/<MM>/<meeting id><extension>
+# Meeting ids start with the meeting start timestamp, so the shard can be derived from the id.
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+LEGACY_TIMESTAMP_FORMAT = "%y%m%d_%H%M%S"
+UNKNOWN_SHARD = ("unknown", "unknown")
+
+MEETING_ID_PATTERN = re.compile(r"^(\d{6,8}_\d{6})_[0-9a-f]{8}$")
+
+# Flat files written before sharding, e.g. meeting_with_<customer>_<YYYYMMDD_HHMMSS>.json
+LEGACY_PATTERNS = {
+    "meeting": re.compile(r"^meeting_with_(?P<customer>.+)_(?P<timestamp>\d{6,8}_\d{6})$"),
+    "response_evaluation": re.compile(r"^response_evaluation_(?P<customer>.+)_(?P<timestamp>\d{6,8}_\d{6})$"),
+    "report": re.compile(r"^meeting_evaluation_(?P<customer>.+)_(?P<timestamp>\d{6,8}_\d{6})$")
+}
+
+STORES = {
+    "meeting": (MEETINGS_DIR, MEETING_EXTENSION),
+    "response_evaluation": (RESPONSE_EVALUATIONS_DIR, REPORT_EXTENSION),
+    "report": (MEETING_EVALUATIONS_DIR, REPORT_EXTENSION)
+}
+
+
+def parse_stored_timestamp(timestamp):
+    """Parse a stored timestamp, accepting the legacy two-digit year format"""
+    for fmt in (TIMESTAMP_FORMAT, LEGACY_TIMESTAMP_FORMAT):
+        try:
+            return datetime.strptime(timestamp, fmt)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def new_meeting_id(timestamp):
+    """Create a stable meeting id from the meeting start timestamp"""
+    return f"{timestamp}_{uuid.uuid4().hex[:8]}"
+
+
+def meeting_id_timestamp(meeting_id):
+    """Start timestamp embedded in a meeting id, or None for unrecognised ids"""
+    match = MEETING_ID_PATTERN.match(meeting_id or "")
+    return match.group(1) if match else None
+
+
+def shard_dir(kind, customer, meeting_id):
+    """Directory holding one customer's items of a kind for the meeting's month"""
+    base, _ = STORES[kind]
+    started = parse_stored_timestamp(meeting_id_timestamp(meeting_id))
+    year, month = (started.strftime("%Y"), started.strftime("%m")) if started else UNKNOWN_SHARD
+    return base / customer / year / month
+
+
+def item_path(kind, customer, meeting_id):
+    """Path of the item of a kind belonging to one meeting"""
+    _, extension = STORES[kind]
+    return shard_dir(kind, customer, meeting_id) / f"{meeting_id}{extension}"
+
+
+def sidecar_paths(path):
+    """Index files stored next to an item that must move or go with it"""
+    return [path.with_suffix(TRANSCRIPT_INDEX_EXTENSION)]
+
+
+def _customer_shard_entries(kind, root, with_modified):
+    """Entries under one customer's <YYYY>/<MM> shards, from directory listings alone"""
+    _, extension = STORES[kind]
+    entries = []
+    for month in [month for year in subdirs(root) for month in subdirs(year)]:
+        try:
+            listing = list(os.scandir(month))
+        except FileNotFoundError:
+            # Emptied and removed by retention since its year was listed
+            continue
+        for item in listing:
+            if not item.name.endswith(extension) or not item.is_file():
+                continue
+            path = Path(item.path)
+            entry = {
+                "kind": kind,
+                "customer": root.name,
+                "meeting_id": path.stem,
+                "timestamp": meeting_id_timestamp(path.stem) or "",
+                "name": path.name,
+                "path": path
+            }
+            if with_modified:
+                entry["modified"] = item.stat().st_mtime
+            entries.append(entry)
+    return entries
+
+
+def sharded_entries(kind, customer=None, with_modified=False):
+    """Entries in the sharded layout, touching only the customer's shard when given.
+
+    Customers are listed concurrently on the scan pool; with_modified also records each
+    item's modification time from its directory entry.
+    """
+    base, _ = STORES[kind]
+    roots = [base / customer] if customer else subdirs(base)
+    walks = scan_pool.map(lambda root: _customer_shard_entries(kind, root, with_modified), roots)
+    for entries in walks:
+        yield from entries
+
+
+def legacy_entries(kind, customer=None, with_modified=False):
+    """Entries still in the flat pre-sharding layout"""
+    base, extension = STORES[kind]
+    for path, stat in scan_files(base, extension, with_stat=with_modified):
+        match = LEGACY_PATTERNS[kind].match(path.stem)
+        if not match:
+            continue
+        if customer and match.group("customer") != customer:
+            continue
+        entry = {
+            "kind": kind,
+            "customer": match.group("customer"),
+            "meeting_id": None,
+            "timestamp": match.group("timestamp"),
+            "name": path.name,
+            "path": path
+        }
+        if with_modified:
+            entry["modified"] = stat.st_mtime
+        yield entry
+
+
+# Archive tier: <ARCHIVE_DIR>/<kind>/<YYYY-MM>.bundle holds independently zlib-compressed
+# items back to back; <YYYY-MM>.index.json maps each item to its offset and length.
+# An index rewritten by retention names a compacted bundle in its "bundle" field instead.
+_index_cache = {}
+_index_cache_lock = threading.Lock()
+
+
+def archive_paths(kind, month):
+    """Bundle and index path for one kind and month (YYYY-MM)"""
+    directory = ARCHIVE_DIR / kind
+    return (
+        directory / f"{month}{ARCHIVE_BUNDLE_EXTENSION}",
+        directory / f"{month}{ARCHIVE_INDEX_EXTENSION}"
+    )
+
+
+def load_archive_index(index_path):
+    """Parsed archive index, cached until the index file changes"""
+    version = file_version(index_path)
+    if version is None:
+        return {"items": []}
+    with _index_cache_lock:
+        cached = _index_cache.get(index_path)
+        if cached and cached[0] == version:
+            return cached[1]
+    index = json.loads(index_path.read_text())
+    with _index_cache_lock:
+        _index_cache[index_path] = (version, index)
+    return index
+
+
+def index_bundle_path(index_path, index):
+    """Bundle file an archive index points into"""
+    if index.get("bundle"):
+        return index_path.parent / index["bundle"]
+    month = index_path.name[:-len(ARCHIVE_INDEX_EXTENSION)]
+    return index_path.parent / f"{month}{ARCHIVE_BUNDLE_EXTENSION}"
+
+
+def archived_entries(kind, customer=None):
+    """Entries packed into monthly archive bundles"""
+    directory = ARCHIVE_DIR / kind
+    if not directory.is_dir():
+        return
+    for index_path in sorted(directory.glob(f"*{ARCHIVE_INDEX_EXTENSION}")):
+        index = load_archive_index(index_path)
+        bundle_path = index_bundle_path(index_path, index)
+        for item in index["items"]:
+            if customer and item["customer"] != customer:
+                continue
+            yield {
+                "kind": kind,
+                "customer": item["customer"],
+                "meeting_id": item["meeting_id"],
+                "timestamp": item["timestamp"],
+                "name": item["name"],
+                "path": None,
+                "modified": item["modified"],
+                "archive": {
+                    "index": index_path,
+                    "bundle": bundle_path,
+                    "offset": item["offset"],
+                    "length": item["length"]
+                }
+            }
+
+
+@profiled
+def list_entries(kind, customer=None, with_modified=False):
+    """List stored items of a kind across all layouts and the archive, newest first"""
+    base, _ = STORES[kind]
+    if not base.exists():
+        return []
+    entries = (
+        list(sharded_entries(kind, customer, with_modified)) +
+        list(legacy_entries(kind, customer, with_modified)) +
+        list(archived_entries(kind, customer))
+    )
+    return sorted(entries, key=lambda entry: entry["timestamp"], reverse=True)
+
+
+@profiled
+def read_entry(entry):
+    """Text of a stored item, whether it is a plain file or packed in an archive bundle"""
+    archive = entry.get("archive")
+    if not archive:
+        return entry["path"].read_text()
+    try:
+        return _read_bundle_item(archive["bundle"], archive["offset"], archive["length"])
+    except FileNotFoundError:
+        # Retention compacted the bundle after this entry was listed: look the item up again
+        index = load_archive_index(archive["index"])
+        for item in index["items"]:
+            if (item["customer"], item["name"]) == (entry["customer"], entry["name"]):
+                bundle_path = index_bundle_path(archive["index"], index)
+                return _read_bundle_item(bundle_path, item["offset"], item["length"])
+        raise
+
+
+def _read_bundle_item(bundle_path, offset, length):
+    """Decompressed text of one item in an archive bundle"""
+    with open(bundle_path, "rb") as f:
+        f.seek(offset)
+        return zlib.decompress(f.read(length)).decode("utf-8")
+
+
+def entry_modified(entry):
+    """Last modification time of a stored item as a datetime"""
+    if entry.get("modified") is not None:
+        return datetime.fromtimestamp(entry["modified"])
+    return datetime.fromtimestamp(entry["path"].stat().st_mtime)
+
+
+def list_customers(kind):
+    """Customers with stored items of the given kind in any layout or the archive"""
+    base, extension = STORES[kind]
+    if not base.exists():
+        return []
+    customers = {d.name for d in subdirs(base)}
+    # Legacy names carry the customer, so the flat files need no stat or read
+    for path, _ in scan_files(base, extension, with_stat=False):
+        match = LEGACY_PATTERNS[kind].match(path.stem)
+        if match:
+            customers.add(match.group("customer"))
+    customers.update(entry["customer"] for entry in archived_entries(kind))
+    return sorted(customers)
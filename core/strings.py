@@ -15,6 +15,7 @@ Choose an option from the sidebar to begin:
 * **📅 History**: Review past conversations and track your progress
 * **📊 Reports**: Analyze detailed meeting evaluations and performance metrics
 * **⚙️ Settings**: View and edit system prompts that control AI behavior
+* **📈 Telemetry**: Track model call latency and token spend
 """
 
 # Project page
@@ -45,6 +46,7 @@ EDIT_PROJECT_LABEL = "Edit project"
 PROJECT_SAVE_SUCCESS_MESSAGE = "Project saved successfully!"
 PROJECT_EDIT_ERROR = "Error saving project: {}"
 VIEW_PROJECT_BUTTON_TEXT = "View"
+PROJECT_IMPORT_TITLE = "Import projects"
 
 # Create Profile Page
 CREATE_PROFILE_TITLE = "Create customer profile"
@@ -75,6 +77,7 @@ PROFILE_EXPANDER_TITLE = "Profile: {}"
 EDIT_PROFILE_LABEL = "Edit profile"
 PROFILE_SAVE_SUCCESS_MESSAGE = "Profile saved successfully!"
 PROFILE_EDIT_ERROR = "Error saving profile: {}"
+PROFILE_IMPORT_TITLE = "Import profiles"
 
 # Strategy Page
 STRATEGY_PAGE_TITLE = "Meeting strategy"
@@ -82,6 +85,7 @@ NO_STRATEGIES_FOUND = "No customer profiles found"
 STRATEGY_TABLE_HEADERS = {
     "name": "Name",
     "role": "Role",
+    "status": "Status",
     "action": "Action"
 }
 STRATEGY_VIEW_BUTTON = "View"
@@ -92,6 +96,20 @@ STRATEGY_CREATION_SUCCESS = "Strategy created for {}"
 STRATEGY_SAVE_ERROR = "Error saving strategy: {}"
 STRATEGY_GENERATION_ERROR = "Error generating strategy: {}"
 STRATEGY_PROMPT_ERROR = "Strategy generation prompt not found: {}"
+STRATEGY_REFRESH_BUTTON = "Refresh"
+STRATEGY_REFRESH_SUCCESS = "Strategy refreshed for {}"
+STRATEGY_STATUS_MISSING = "Not created"
+STRATEGY_STATUS_CURRENT = "Up to date"
+STRATEGY_STATUS_NEW_MEETINGS = "{} new meetings"
+STRATEGY_STATUS_NEW_REPORTS = "{} new reports"
+STRATEGY_STATUS_PROFILE_CHANGED = "profile changed"
+STRATEGY_STATUS_UNTRACKED = "Sources not recorded"
+STRATEGY_SOURCES_CAPTION = "Built from {} meetings and {} reports, updated {}"
+STRATEGY_NO_MEETINGS = "No previous meetings"
+STRATEGY_NO_REPORTS = "No previous evaluations"
+STRATEGY_NO_NEW_MEETINGS = "No new meetings"
+STRATEGY_NO_NEW_REPORTS = "No new evaluations"
+STRATEGY_PROFILE_UNCHANGED = "Unchanged since the previous strategy"
 
 # Meet Page
 TITLE_WITH_CUSTOMER = "Meeting with {}"
@@ -101,11 +119,27 @@ FREEZE_COMMAND = "freeze and report"
 CHAT_INITIAL_VENDOR_PITCH = "Initial vendor pitch:\n\n"
 CHAT_CUSTOMER_PREVIOUS_MESSAGE = "Customer's previous message: {}\n\n"
 CHAT_VENDOR_RESPONSE = "Vendor's response: {}"
+CHAT_BATCH_TURN_HEADER = "--- Turn {} ---\n"
 CHAT_CUSTOMER_CONTEXT = "Customer Context:\n{}\n\nVendor Messages to Evaluate:"
+CHAT_ROLLING_CONTEXT = "Customer Context:\n{}\n\nYour Evaluation of Turns 1-{}:\n{}\n\nNew Vendor Turns to Fold In:"
+CHAT_ROLLING_TURN_EVALUATION = "\n\nYour evaluation of this response:\n{}"
 CHAT_REPORT_SAVED = "\nReport saved to: {}"
 CHAT_MEETING_SAVED = "Meeting saved to: {}"
 CHAT_EVALUATIONS_SAVED = "Evaluations saved to: {}"
+PANEL_SELECT_LABEL = "Or meet a panel of {}-{} customers at once"
+PANEL_START_BUTTON = "Meet panel"
+PANEL_CUSTOMER_NAME = "Panel - {}"
+PANEL_OTHERS_SAID = "Said by other panelists since your last reply:\n{}\n\nVendor: {}"
+PANEL_REPLY_ERROR = "{} did not answer: {}"
 NEW_MEETING_BUTTON = "Meet customers"
+EVALUATION_CADENCE_LABEL = "Response evaluation"
+EVALUATION_CADENCE_OPTIONS = {
+    "every_turn": "Every turn",
+    "every_n_turns": "Every few turns",
+    "deferred": "At the end of the meeting"
+}
+EVALUATION_CADENCE_TURNS_LABEL = "Turns per evaluation"
+EVALUATION_CADENCE_LOCKED_HELP = "Fixed for the current meeting; start a new meeting to change it"
 
 # History Page
 VIEW_HISTORY_TITLE = "Meeting history"
@@ -116,6 +150,23 @@ MEETING_TABLE_HEADERS = {
     "action": "Action"
 }
 MEETING_EXPANDER_TITLE = "Meeting with {}"
+LOAD_EARLIER_BUTTON = "Load earlier messages"
+TRANSCRIPT_WINDOW_CAPTION = "Showing messages {}-{} of {}"
+EXPORT_EXPANDER_TITLE = "Export data"
+EXPORT_DATASET_LABEL = "Data"
+EXPORT_DATASET_OPTIONS = {
+    "turns": "Meeting turns",
+    "response_evaluations": "Response evaluations",
+    "reports": "Meeting reports"
+}
+EXPORT_FORMAT_LABEL = "Format"
+EXPORT_CUSTOMER_LABEL = "Customer"
+EXPORT_ALL_CUSTOMERS = "All customers"
+EXPORT_DATE_RANGE_LABEL = "Meeting dates"
+EXPORT_PREPARE_BUTTON = "Prepare export"
+EXPORT_DOWNLOAD_BUTTON = "Download"
+EXPORT_READY = "{} rows ready"
+EXPORT_ERROR = "Error exporting data: {}"
 
 # Reports Page
 VIEW_REPORTS_TITLE = "Meeting reports"
@@ -134,6 +185,7 @@ NO_PROMPTS_FOUND = "No prompts found in the prompts directory"
 PROMPTS_DIR_ERROR = "Prompts directory not found: {}"
 PROMPTS_TABLE_HEADERS = {
     "name": "Name",
+    "tokens": "Tokens",
     "last_modified": "Last modified",
     "action": "Action"
 }
@@ -142,6 +194,107 @@ PROMPT_EXPANDER_TITLE = "Prompt: {}"
 EDIT_PROMPT_LABEL = "Edit prompt"
 PROMPT_SAVE_SUCCESS = "Prompt saved successfully!"
 PROMPT_SAVE_ERROR = "Error saving prompt: {}"
+PROMPT_TOKENS_CAPTION = "{:,} tokens{}"
+PROMPT_TOKENS_PER_TURN = ", sent with every chat turn as part of the meeting system prompt"
+PROMPT_TOKENS_ESTIMATED = " (estimated)"
+PROMPT_BUDGET_TITLE = "Prompt token budget"
+PROMPT_BUDGET_CAPTION = ("Meeting system prompt per profile and projected input tokens for a {}-turn meeting "
+                         "at {} tokens per exchange, before prompt caching. Budget: {:,} tokens.")
+PROMPT_BUDGET_WARNING = "Meeting system prompt over the {:,}-token budget for: {}. Every chat turn re-sends it, so each reply gets slower."
+PROMPT_BUDGET_HEADERS = {
+    "profile": "Profile",
+    "system_tokens": "System prompt",
+    "first_turn": "First turn",
+    "last_turn": "Last turn",
+    "chat_per_meeting": "Chat per meeting",
+    "evaluation_per_meeting": "Evaluation per meeting",
+    "per_meeting": "Total per meeting"
+}
+PROFILE_TOKENS_CAPTION = ("Profile: {:,} tokens. Meeting system prompt: {:,} tokens{}, re-sent every turn. "
+                          "Projected input per turn: {:,} to {:,} tokens; per {}-turn meeting: {:,} tokens.")
+REEVALUATE_HINT = "To see how scores shift against the previous version of this prompt, run `python -m core.reevaluate {}`"
+API_QUEUE_TITLE = "API queue"
+API_QUEUE_CAPACITY = "Available now: {:.0f} requests, {:.0f} tokens"
+API_QUEUE_TABLE_HEADERS = {
+    "mode": "Mode",
+    "priority": "Priority",
+    "queued": "Queued",
+    "served": "Served",
+    "p50_wait_s": "p50 wait (s)",
+    "p95_wait_s": "p95 wait (s)",
+    "max_wait_s": "Max wait (s)"
+}
+SESSION_MEMORY_TITLE = "Session memory"
+SESSION_MEMORY_SUMMARY = "This session holds {:,.1f} KB in {} keys. Server process RSS: {:,.1f} MB"
+CONTENT_CACHE_SUMMARY = "Shared content cache: {} files, {:,.1f} of {:,.1f} KB, {} hits, {} misses"
+SESSION_MEMORY_TABLE_HEADERS = {
+    "key": "Key",
+    "type": "Type",
+    "bytes": "Bytes"
+}
+
+# Telemetry Page
+TELEMETRY_PAGE_TITLE = "Model call telemetry"
+NO_TELEMETRY_FOUND = "No model calls recorded yet"
+TELEMETRY_SUMMARY = "{} calls, {} errors, {:,} input tokens, {:,} output tokens, {:,} cache read tokens"
+TELEMETRY_BY_MODE_TITLE = "By mode"
+TELEMETRY_BY_PERSONA_TITLE = "By persona"
+TELEMETRY_BY_TIER_TITLE = "By model tier"
+TELEMETRY_BY_DAY_TITLE = "By day"
+TELEMETRY_NO_PERSONA = "(none)"
+TELEMETRY_RERUNS_TITLE = "Page reruns by meeting length"
+TELEMETRY_RERUN_HEADERS = {
+    "runs": "Runs",
+    "seconds_p50": "p50 run (s)",
+    "seconds_p95": "p95 run (s)",
+    "render_p50": "p50 render (s)",
+    "render_p95": "p95 render (s)"
+}
+TELEMETRY_HEDGING_TITLE = "Hedged requests"
+TELEMETRY_HEDGING_HEADERS = {
+    "calls": "Calls",
+    "hedged": "Hedged",
+    "hedge_rate": "Hedge rate",
+    "duplicate_wins": "Duplicate won",
+    "ttft_p50": "p50 first token (s)",
+    "ttft_p99": "p99 first token (s)",
+    "hedge_tokens": "Cancelled tokens",
+    "hedge_token_share": "Extra token share"
+}
+TELEMETRY_TABLE_HEADERS = {
+    "calls": "Calls",
+    "errors": "Errors",
+    "latency_p50": "p50 latency (s)",
+    "latency_p95": "p95 latency (s)",
+    "latency_p99": "p99 latency (s)",
+    "ttft_p50": "p50 first token (s)",
+    "ttft_p95": "p95 first token (s)",
+    "input_tokens": "Input tokens",
+    "output_tokens": "Output tokens",
+    "cache_read_input_tokens": "Cache read tokens",
+    "cache_creation_input_tokens": "Cache write tokens"
+}
+
+# Profiling Overlay
+PROFILING_TITLE = "Profile of this run"
+PROFILING_TOGGLE_LABEL = "Profile page runs"
+PROFILING_SUMMARY = "{}: {:.3f}s in {} spans"
+PROFILING_OTHER_SPAN = "(script and widgets)"
+PROFILING_TABLE_HEADERS = {
+    "span": "Span",
+    "calls": "Calls",
+    "seconds": "Seconds",
+    "share": "Share"
+}
+PROFILING_DUMP_SAVED = "Profiler report saved to {}"
+PROFILING_PROFILER_UNAVAILABLE = "{} is not available; install it to dump profiler output"
+
+# Bulk import (Projects and Profiles pages)
+IMPORT_UPLOAD_LABEL = "Text files, a .zip or .tar.gz archive of them, or a CSV with name and content columns"
+IMPORT_OVERWRITE_LABEL = "Replace existing files with the same name"
+IMPORT_BUTTON = "Import"
+IMPORT_RESULT = "{} of {} imported"
+IMPORT_ERROR = "Error importing files: {}"
 
 # Common Button Labels
 CLOSE_BUTTON = "Close"
@@ -152,6 +305,7 @@ CANCEL_BUTTON = "Cancel"
 # File Templates
 EVALUATION_HEADER = "--- Meeting Evaluation {} ---\n\n"
 EVALUATION_SECTION = "\n--- Evaluation #{} ---\n"
+EVALUATION_UNAVAILABLE = "Evaluation unavailable: grading this turn failed."
 MEETING_FILENAME = "meeting_with_{}_{}{}"
 EVALUATION_FILENAME = "response_evaluation_{}_{}.txt"
 REPORT_FILENAME = "meeting_evaluation_{}_{}{}"
@@ -164,5 +318,8 @@ MEETINGS_LIST_ERROR = "Error listing meetings: {}"
 MEETING_LOAD_ERROR = "Meeting file not found: {}"
 MEETING_SAVE_ERROR = "Error saving meeting: {}"
 EVALUATION_SAVE_ERROR = "Error saving evaluation: {}"
+SESSION_SAVE_ERROR = "Error saving meeting session: {}"
+SESSION_LOAD_ERROR = "Error resuming meeting session: {}"
 API_CALL_ERROR = "Error in API call: {}"
+FILE_CHANGED_ERROR = "This file was changed by someone else since you opened it. Close it and open it again to get the latest version before saving."
 MEETINGS_DIR_ERROR = "Meetings directory not found: {}"
\ No newline at end of file
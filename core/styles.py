@@ -46,9 +46,9 @@ COMMON_TABLE_CSS = """
 TABLE_LAYOUTS = {
     'profiles': [3, 5, 2, 2],  # Name, Role, Last Modified, Action
     'projects': [3, 5, 2, 2],  # Name, Objective, Last Modified, Action
-    'strategy': [3, 5, 2],     # Name, Role, Action
+    'strategy': [3, 4, 3, 2],  # Name, Role, Status, Action
     'meet': [3, 5, 2, 2],      # Name, Role, Last Modified, Action
     'history': [4, 4, 2],      # Customer, Date, Action
     'reports': [4, 4, 2],      # Customer, Last Modified, Action
-    'settings': [4, 4, 2]      # Name, Last Modified, Action
+    'settings': [4, 2, 2, 2]   # Name, Tokens, Last Modified, Action
 }
\ No newline at end of file
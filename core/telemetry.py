@@ -0,0 +1,63 @@
+# Imports
+import json
+import threading
+from datetime import datetime
+
+from core.config import METRICS_DIR, METRICS_EXTENSION
+
+# Append-only stores of one JSON record per model call and per page rerun
+LLM_CALLS_FILE = METRICS_DIR / f"llm_calls{METRICS_EXTENSION}"
+RERUNS_FILE = METRICS_DIR / f"reruns{METRICS_EXTENSION}"
+
+_write_lock = threading.Lock()
+
+
+def _append(path, fields):
+    """Append one timestamped record to a metrics store"""
+    now = datetime.now()
+    record = {
+        "timestamp": now.isoformat(timespec="seconds"),
+        "day": now.strftime("%Y-%m-%d"),
+        **fields
+    }
+    line = json.dumps(record) + "\n"
+    try:
+        with _write_lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+    except OSError:
+        # Metrics must never break the call they describe
+        return None
+    return record
+
+
+def _iter_records(path):
+    """Yield stored records, skipping lines cut short by a crash"""
+    if not path.exists():
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def record_llm_call(**fields):
+    """Append one model call record to the metrics store"""
+    return _append(LLM_CALLS_FILE, fields)
+
+
+def record_rerun(**fields):
+    """Append one page or fragment rerun record to the metrics store"""
+    return _append(RERUNS_FILE, fields)
+
+
+def iter_llm_calls():
+    """Yield stored model call records"""
+    return _iter_records(LLM_CALLS_FILE)
+
+
+def iter_reruns():
+    """Yield stored rerun records"""
+    return _iter_records(RERUNS_FILE)
@@ -0,0 +1,86 @@
+# Imports
+import json
+
+from core.content_cache import read_entry_text
+from core.fileio import atomic_write_text
+from core.profiling import profiled
+from core.storage import sidecar_paths
+
+# Meetings are written with the conversation first and one message per line. The
+# sidecar index records each message's byte offset and length so a window of turns
+# can be read with a single seek instead of parsing the whole file.
+
+
+def serialize_meeting(meeting_data):
+    """Meeting JSON text plus the byte offset and length of every conversation message"""
+    buffer = ['{\n  "conversation": [']
+    size = len(buffer[0])
+    offsets = []
+    for i, message in enumerate(meeting_data.get("conversation", [])):
+        separator = "\n    " if i == 0 else ",\n    "
+        # ensure_ascii keeps character and byte offsets identical
+        line = json.dumps(message, ensure_ascii=True)
+        offsets.append([size + len(separator), len(line)])
+        buffer += [separator, line]
+        size += len(separator) + len(line)
+    buffer.append("\n  ]")
+    for key, value in meeting_data.items():
+        if key != "conversation":
+            buffer.append(f",\n  {json.dumps(key)}: {json.dumps(value, indent=2).replace(chr(10), chr(10) + '  ')}")
+    buffer.append("\n}")
+    return "".join(buffer), offsets
+
+
+def write_meeting(filepath, meeting_data):
+    """Write a meeting file and its transcript index"""
+    content, offsets = serialize_meeting(meeting_data)
+    version = atomic_write_text(filepath, content)
+    index = {"size": len(content), "offsets": offsets}
+    for sidecar in sidecar_paths(filepath):
+        atomic_write_text(sidecar, json.dumps(index))
+    return version
+
+
+def _load_index(entry):
+    """Transcript index of a plain meeting file, or None when missing or stale"""
+    path = entry.get("path")
+    if path is None:
+        return None
+    try:
+        index = json.loads(sidecar_paths(path)[0].read_text())
+        if index["size"] != path.stat().st_size:
+            return None
+        return index
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+@profiled
+def count_turns(entry):
+    """Number of conversation messages in a stored meeting"""
+    index = _load_index(entry)
+    if index is not None:
+        return len(index["offsets"])
+    return len(json.loads(read_entry_text(entry)).get("conversation", []))
+
+
+@profiled
+def read_turns(entry, start, stop):
+    """Conversation messages start..stop-1 of a stored meeting, reading only that range when indexed"""
+    index = _load_index(entry)
+    if index is None:
+        # Legacy, migrated or archived meeting: parse it whole and slice
+        return json.loads(read_entry_text(entry)).get("conversation", [])[start:stop]
+
+    window = index["offsets"][start:stop]
+    if not window:
+        return []
+    first_offset = window[0][0]
+    last_offset, last_length = window[-1]
+    with open(entry["path"], "rb") as f:
+        f.seek(first_offset)
+        chunk = f.read(last_offset + last_length - first_offset)
+    return [
+        json.loads(chunk[offset - first_offset:offset - first_offset + length])
+        for offset, length in window
+    ]
@@ -2,7 +2,6 @@
 import sys
 from pathlib import Path
 import streamlit as st
-from anthropic import Anthropic
 from datetime import datetime
 import pandas as pd
 import json
@@ -13,13 +12,16 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 # Import from core
-from core.config import MODEL_CONFIG, PROJECTS_DIR, PROMPTS_DIR
+from core.config import PROJECTS_DIR, PROMPTS_DIR
 from core.strings import *
 from core.styles import *
+from core.llm import create_message, response_text
+from core.fileio import atomic_write_text, WriteConflictError
+from core.content_cache import load_files, read_text
+from core.catalog import bulk_import, read_upload, save_project
+from core.profiling import profiled, render_overlay, start_run
 
-# Initialize Anthropic client
-client = Anthropic(api_key=MODEL_CONFIG["api_key"])
-
+@profiled
 def read_project_prompt():
     """Read the project creation model prompt"""
     try:
@@ -29,39 +31,23 @@ def read_project_prompt():
         st.error(PROJECT_CREATION_PROMPT_ERROR.format(path))
         return ""
 
-def save_project(project_name, content):
-    """Save the project to a file"""
-    try:
-        safe_name = "".join(c for c in project_name if c.isalnum() or c in (' ', '-', '_'))
-        filename = f"{safe_name}.txt"
-        filepath = PROJECTS_DIR / filename
-        filepath.write_text(content)
-        return True
-    except Exception as e:
-        st.error(PROJECT_SAVE_ERROR.format(str(e)))
-        return False
-
+@profiled
 def get_ai_response(messages):
     """Get response from Claude API"""
     try:
-        config = MODEL_CONFIG["chat"].copy()
-        response = client.messages.create(
-            model=config["model"],
-            max_tokens=config["max_tokens"],
-            temperature=config["temperature"],
-            messages=[
-                {
-                    "role": "assistant" if msg["role"] == "assistant" else "user",
-                    "content": msg["content"]
-                }
-                for msg in messages
-            ]
-        )
-        return response.content[0].text if response.content else ""
+        response = create_message("chat", [
+            {
+                "role": "assistant" if msg["role"] == "assistant" else "user",
+                "content": msg["content"]
+            }
+            for msg in messages
+        ])
+        return response_text(response)
     except Exception as e:
         st.error(API_CALL_ERROR.format(str(e)))
         return None
 
+@profiled
 def list_projects():
     """Get list of available projects with their details"""
     projects = []
@@ -69,47 +55,55 @@ def list_projects():
         st.error(PROJECTS_DIR_ERROR.format(PROJECTS_DIR))
         return projects
         
-    for file in PROJECTS_DIR.glob("*.txt"):
-        if file.is_file():
-            content = file.read_text()
-            name = next((line.replace("PROJECT SPECIFICATION:", "").strip() 
+    # Files are listed once and read concurrently; the listing's stat gives version and date
+    for item in load_files(PROJECTS_DIR, ".txt"):
+        content = item["text"]
+        name = next((line.replace("PROJECT SPECIFICATION:", "").strip() 
+                    for line in content.split('\n') 
+                    if line.startswith("PROJECT SPECIFICATION:")), "Unknown")
+        objective = next((line.replace("- Primary goal: ", "").strip() 
                         for line in content.split('\n') 
-                        if line.startswith("PROJECT SPECIFICATION:")), "Unknown")
-            objective = next((line.replace("- Primary goal: ", "").strip() 
-                            for line in content.split('\n') 
-                            if "Primary goal" in line), "")
-            projects.append({
-                "Name": name,
-                "Objective": objective,
-                "File": file.name,
-                "Content": content,
-                "Last Modified": datetime.fromtimestamp(file.stat().st_mtime)
-            })
+                        if "Primary goal" in line), "")
+        projects.append({
+            "Name": name,
+            "Objective": objective,
+            "File": item["path"].name,
+            "Content": content,
+            "Version": item["version"],
+            "Last Modified": datetime.fromtimestamp(item["stat"].st_mtime)
+        })
     return projects
 
-# Initialize session states
-if "creation_mode" not in st.session_state:
-    st.session_state.creation_mode = False
-if "project_messages" not in st.session_state:
-    st.session_state.project_messages = []
-if "selected_project" not in st.session_state:
-    st.session_state.selected_project = None
-if "creation_completed" not in st.session_state:
-    st.session_state.creation_completed = False
-
-# Custom CSS
-st.markdown(COMMON_TABLE_CSS, unsafe_allow_html=True)
+def render_import():
+    """Bulk import projects from uploaded files"""
+    with st.expander(PROJECT_IMPORT_TITLE):
+        uploads = st.file_uploader(
+            IMPORT_UPLOAD_LABEL,
+            type=["txt", "csv", "zip", "tar", "gz", "tgz"],
+            accept_multiple_files=True,
+            key="import_project_files"
+        )
+        overwrite = st.checkbox(IMPORT_OVERWRITE_LABEL, key="import_project_overwrite")
+        if uploads and st.button(IMPORT_BUTTON, key="import_projects"):
+            try:
+                items = [item for upload in uploads for item in read_upload(upload.name, upload.getvalue())]
+                results = bulk_import("project", items, overwrite=overwrite)
+            except Exception as e:
+                st.error(IMPORT_ERROR.format(str(e)))
+                return
+            imported = sum(row["status"] == "imported" for row in results)
+            st.success(IMPORT_RESULT.format(imported, len(results)))
+            st.dataframe(pd.DataFrame(results), use_container_width=True, hide_index=True)
 
-# Main UI
-if not st.session_state.creation_mode:
-    st.title(VIEW_PROJECTS_TITLE)
-    
+@st.fragment
+def project_table():
+    """Project list and editor; reruns on its own when a project is opened or edited"""
     # Display projects table
     projects = list_projects()
     if projects:
         df = pd.DataFrame(projects)
         df['Last Modified'] = df['Last Modified'].dt.strftime('%Y-%m-%d')
-        
+
         cols = st.columns(TABLE_LAYOUTS['projects'])
         for col, header in zip(cols, [
             PROJECT_TABLE_HEADERS["name"],
@@ -118,62 +112,91 @@ if not st.session_state.creation_mode:
             PROJECT_TABLE_HEADERS["action"]
         ]):
             col.markdown(f"<div class='table-header col-{header.lower()}'>{header}</div>", unsafe_allow_html=True)
-        
+
         for idx, row in df.iterrows():
             cols = st.columns(TABLE_LAYOUTS['projects'])
             cols[0].markdown(f"<div class='table-cell'>{row['Name']}</div>", unsafe_allow_html=True)
             cols[1].markdown(f"<div class='table-cell'>{row['Objective']}</div>", unsafe_allow_html=True)
             cols[2].markdown(f"<div class='table-cell'>{row['Last Modified']}</div>", unsafe_allow_html=True)
             if cols[3].button(VIEW_PROJECT_BUTTON_TEXT, key=f"view_{idx}"):
-                st.session_state.selected_project = row
-        
+                # Keep a small handle; the content is read through the shared cache
+                st.session_state.selected_project = {'Name': row['Name'], 'File': row['File'], 'Version': row['Version']}
+
         # Project viewer/editor
         if st.session_state.selected_project is not None:
             st.markdown("---")
             with st.expander(PROJECT_EXPANDER_TITLE.format(st.session_state.selected_project['Name']), expanded=True):
                 if 'edit_mode' not in st.session_state:
                     st.session_state.edit_mode = False
-                    
+
                 if st.session_state.edit_mode:
                     edited_content = st.text_area(EDIT_PROJECT_LABEL, 
-                                               value=st.session_state.selected_project['Content'],
+                                               value=read_text(PROJECTS_DIR / st.session_state.selected_project['File']),
                                                height=400)
-                    
+
                     col1, col2, col3 = st.columns([1, 1, 4])
                     if col1.button(CANCEL_BUTTON, key="cancel_edit"):
                         st.session_state.edit_mode = False
                         st.rerun()
-                    
+
                     if col2.button(SAVE_BUTTON, key="save_project"):
                         file_path = PROJECTS_DIR / st.session_state.selected_project['File']
                         try:
-                            file_path.write_text(edited_content)
+                            st.session_state.selected_project['Version'] = atomic_write_text(
+                                file_path,
+                                edited_content,
+                                expected_version=st.session_state.selected_project['Version']
+                            )
                             st.success(PROJECT_SAVE_SUCCESS_MESSAGE)
-                            st.session_state.selected_project['Content'] = edited_content
                             st.session_state.edit_mode = False
                             st.rerun()
+                        except WriteConflictError:
+                            st.error(FILE_CHANGED_ERROR)
                         except Exception as e:
                             st.error(PROJECT_EDIT_ERROR.format(str(e)))
                 else:
-                    st.text(st.session_state.selected_project['Content'])
+                    st.text(read_text(PROJECTS_DIR / st.session_state.selected_project['File']))
                     col1, col2, col3 = st.columns([1, 1, 4])
-                    
+
                     if col1.button(CLOSE_BUTTON, key="close_project"):
                         st.session_state.selected_project = None
                         st.rerun()
-                    
+
                     if col2.button(EDIT_BUTTON, key="edit_project"):
                         st.session_state.edit_mode = True
                         st.rerun()
     else:
         st.write(NO_PROJECTS_FOUND)
 
+start_run("projects")
+
+# Initialize session states
+if "creation_mode" not in st.session_state:
+    st.session_state.creation_mode = False
+if "project_messages" not in st.session_state:
+    st.session_state.project_messages = []
+if "selected_project" not in st.session_state:
+    st.session_state.selected_project = None
+if "creation_completed" not in st.session_state:
+    st.session_state.creation_completed = False
+
+# Custom CSS
+st.markdown(COMMON_TABLE_CSS, unsafe_allow_html=True)
+
+# Main UI
+if not st.session_state.creation_mode:
+    st.title(VIEW_PROJECTS_TITLE)
+    
+    project_table()
+
     # Create new project button
     if st.button(CREATE_NEW_PROJECT_BUTTON, use_container_width=True):
         st.session_state.creation_mode = True
         st.session_state.project_messages = []
         st.rerun()
 
+    render_import()
+
 else:
     # Project Creation Mode
     st.title(CREATE_PROJECT_TITLE)
@@ -223,16 +246,23 @@ else:
                 
                 if not project_content:
                     st.sidebar.error(NO_COMPLETE_PROJECT)
-                elif save_project(project_name, project_content):
-                    st.sidebar.success(PROJECT_SAVE_SUCCESS.format(project_name))
-                    st.session_state.creation_completed = True
-                    st.session_state.creation_mode = False
-                    time.sleep(1)
-                    st.rerun()
+                else:
+                    try:
+                        save_project(project_name, project_content)
+                    except Exception as e:
+                        st.error(PROJECT_SAVE_ERROR.format(str(e)))
+                    else:
+                        st.sidebar.success(PROJECT_SAVE_SUCCESS.format(project_name))
+                        st.session_state.creation_completed = True
+                        st.session_state.creation_mode = False
+                        time.sleep(1)
+                        st.rerun()
 
     # Cancel button to return to projects view
     if st.sidebar.button(CANCEL_CREATION_BUTTON, use_container_width=True):
         st.session_state.creation_mode = False
         st.session_state.project_messages = []
         st.session_state.creation_completed = False
-        st.rerun()
\ No newline at end of file
+        st.rerun()
+
+render_overlay()
\ No newline at end of file
@@ -2,7 +2,6 @@
 import sys
 from pathlib import Path
 import streamlit as st
-from anthropic import Anthropic
 from datetime import datetime
 import pandas as pd
 import json
@@ -13,13 +12,18 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 # Import from core
-from core.config import MODEL_CONFIG, CUSTOMERS_DIR, PROMPTS_DIR, PROFILE_EXTENSION
+from core.config import CUSTOMERS_DIR, PROMPTS_DIR, PROFILE_EXTENSION, PROMPT_BUDGET_CONFIG
 from core.strings import *
 from core.styles import *
+from core.llm import create_message, response_text
+from core.fileio import atomic_write_text, WriteConflictError
+from core.content_cache import load_files, read_text
+from core.prompt_cache import compile_meeting_prompts, invalidate_meeting_prompt
+from core.catalog import bulk_import, read_upload, save_customer_profile
+from core.prompt_budget import file_tokens, meeting_projection
+from core.profiling import profiled, render_overlay, start_run
 
-# Initialize Anthropic client
-client = Anthropic(api_key=MODEL_CONFIG["api_key"])
-
+@profiled
 def read_creation_prompt():
     """Read the customer creation model prompt"""
     try:
@@ -29,39 +33,23 @@ def read_creation_prompt():
         st.error(PROFILE_CREATION_PROMPT_ERROR.format(path))
         return ""
 
-def save_customer_profile(profile_name, content):
-    """Save the customer profile to a file"""
-    try:
-        safe_name = "".join(c for c in profile_name if c.isalnum() or c in (' ', '-', '_'))
-        filename = f"{safe_name}{PROFILE_EXTENSION}"
-        filepath = CUSTOMERS_DIR / filename
-        filepath.write_text(content)
-        return True
-    except Exception as e:
-        st.error(PROFILE_SAVE_ERROR.format(str(e)))
-        return False
-
+@profiled
 def get_ai_response(messages):
     """Get response from Claude API"""
     try:
-        config = MODEL_CONFIG["chat"].copy()
-        response = client.messages.create(
-            model=config["model"],
-            max_tokens=config["max_tokens"],
-            temperature=config["temperature"],
-            messages=[
-                {
-                    "role": "assistant" if msg["role"] == "assistant" else "user",
-                    "content": msg["content"]
-                }
-                for msg in messages
-            ]
-        )
-        return response.content[0].text if response.content else ""
+        response = create_message("chat", [
+            {
+                "role": "assistant" if msg["role"] == "assistant" else "user",
+                "content": msg["content"]
+            }
+            for msg in messages
+        ])
+        return response_text(response)
     except Exception as e:
         st.error(API_CALL_ERROR.format(str(e)))
         return None
 
+@profiled
 def list_customer_profiles():
     """Get list of available customer profiles with their details"""
     profiles = []
@@ -69,47 +57,75 @@ def list_customer_profiles():
         st.error(CUSTOMERS_DIR_ERROR.format(CUSTOMERS_DIR))
         return profiles
         
-    for file in CUSTOMERS_DIR.glob(f"*{PROFILE_EXTENSION}"):
-        if file.is_file():
-            content = file.read_text()
-            name = next((line.replace("Name:", "").strip() 
-                        for line in content.split('\n') 
-                        if line.startswith("Name:")), "Unknown")
-            role = next((line.replace("Role:", "").strip() 
-                        for line in content.split('\n') 
-                        if line.startswith("Role:")), "")
-            profiles.append({
-                "Name": name,
-                "Role": role,
-                "File": file.name,
-                "Content": content,
-                "Last Modified": datetime.fromtimestamp(file.stat().st_mtime)
-            })
+    # Files are listed once and read concurrently; the listing's stat gives version and date
+    for item in load_files(CUSTOMERS_DIR, PROFILE_EXTENSION):
+        content = item["text"]
+        name = next((line.replace("Name:", "").strip() 
+                    for line in content.split('\n') 
+                    if line.startswith("Name:")), "Unknown")
+        role = next((line.replace("Role:", "").strip() 
+                    for line in content.split('\n') 
+                    if line.startswith("Role:")), "")
+        profiles.append({
+            "Name": name,
+            "Role": role,
+            "File": item["path"].name,
+            "Content": content,
+            "Version": item["version"],
+            "Last Modified": datetime.fromtimestamp(item["stat"].st_mtime)
+        })
+    # Assemble each profile's meeting prompt ahead of its first meeting
+    compile_meeting_prompts([Path(profile["File"]).stem for profile in profiles])
     return profiles
 
-# Initialize session states
-if "creation_mode" not in st.session_state:
-    st.session_state.creation_mode = False
-if "profile_messages" not in st.session_state:
-    st.session_state.profile_messages = []
-if "selected_profile" not in st.session_state:
-    st.session_state.selected_profile = None
-if "creation_completed" not in st.session_state:
-    st.session_state.creation_completed = False
+def render_profile_tokens(file_name):
+    """Token counts of a profile and its meeting prompt, warning when the prompt is over budget"""
+    projection = meeting_projection(Path(file_name).stem)
+    if projection['over_budget']:
+        st.warning(PROMPT_BUDGET_WARNING.format(
+            PROMPT_BUDGET_CONFIG['meeting_prompt_max_tokens'],
+            projection['profile']
+        ))
+    st.caption(PROFILE_TOKENS_CAPTION.format(
+        file_tokens(CUSTOMERS_DIR / file_name)[0],
+        projection['system_tokens'],
+        PROMPT_TOKENS_ESTIMATED if projection['estimated'] else "",
+        projection['first_turn'],
+        projection['last_turn'],
+        PROMPT_BUDGET_CONFIG['projected_turns'],
+        projection['per_meeting']
+    ))
 
-# Custom CSS
-st.markdown(COMMON_TABLE_CSS, unsafe_allow_html=True)
+def render_import():
+    """Bulk import profiles from uploaded files"""
+    with st.expander(PROFILE_IMPORT_TITLE):
+        uploads = st.file_uploader(
+            IMPORT_UPLOAD_LABEL,
+            type=["txt", "csv", "zip", "tar", "gz", "tgz"],
+            accept_multiple_files=True,
+            key="import_profile_files"
+        )
+        overwrite = st.checkbox(IMPORT_OVERWRITE_LABEL, key="import_profile_overwrite")
+        if uploads and st.button(IMPORT_BUTTON, key="import_profiles"):
+            try:
+                items = [item for upload in uploads for item in read_upload(upload.name, upload.getvalue())]
+                results = bulk_import("profile", items, overwrite=overwrite)
+            except Exception as e:
+                st.error(IMPORT_ERROR.format(str(e)))
+                return
+            imported = sum(row["status"] == "imported" for row in results)
+            st.success(IMPORT_RESULT.format(imported, len(results)))
+            st.dataframe(pd.DataFrame(results), use_container_width=True, hide_index=True)
 
-# Main UI
-if not st.session_state.creation_mode:
-    st.title(VIEW_PROFILES_TITLE)
-    
+@st.fragment
+def profile_table():
+    """Profile list and editor; reruns on its own when a profile is opened or edited"""
     # Display profiles table
     profiles = list_customer_profiles()
     if profiles:
         df = pd.DataFrame(profiles)
         df['Last Modified'] = df['Last Modified'].dt.strftime('%Y-%m-%d')
-        
+
         cols = st.columns(TABLE_LAYOUTS['profiles'])
         for col, header in zip(cols, [
             PROFILE_TABLE_HEADERS["name"],
@@ -118,62 +134,94 @@ if not st.session_state.creation_mode:
             PROFILE_TABLE_HEADERS["action"]
         ]):
             col.markdown(f"<div class='table-header col-{header.lower()}'>{header}</div>", unsafe_allow_html=True)
-        
+
         for idx, row in df.iterrows():
             cols = st.columns(TABLE_LAYOUTS['profiles'])
             cols[0].markdown(f"<div class='table-cell'>{row['Name']}</div>", unsafe_allow_html=True)
             cols[1].markdown(f"<div class='table-cell'>{row['Role']}</div>", unsafe_allow_html=True)
             cols[2].markdown(f"<div class='table-cell'>{row['Last Modified']}</div>", unsafe_allow_html=True)
             if cols[3].button(VIEW_PROFILE_BUTTON_TEXT, key=f"view_{idx}"):
-                st.session_state.selected_profile = row
-        
+                # Keep a small handle; the content is read through the shared cache
+                st.session_state.selected_profile = {'Name': row['Name'], 'File': row['File'], 'Version': row['Version']}
+
         # Profile viewer/editor
         if st.session_state.selected_profile is not None:
             st.markdown("---")
             with st.expander(PROFILE_EXPANDER_TITLE.format(st.session_state.selected_profile['Name']), expanded=True):
                 if 'edit_mode' not in st.session_state:
                     st.session_state.edit_mode = False
-                    
+
                 if st.session_state.edit_mode:
                     edited_content = st.text_area(EDIT_PROFILE_LABEL, 
-                                               value=st.session_state.selected_profile['Content'],
+                                               value=read_text(CUSTOMERS_DIR / st.session_state.selected_profile['File']),
                                                height=400)
-                    
+
                     col1, col2, col3 = st.columns([1, 1, 4])
                     if col1.button(CANCEL_BUTTON, key="cancel_edit"):
                         st.session_state.edit_mode = False
                         st.rerun()
-                    
+
                     if col2.button(SAVE_BUTTON, key="save_profile"):
                         file_path = CUSTOMERS_DIR / st.session_state.selected_profile['File']
                         try:
-                            file_path.write_text(edited_content)
+                            st.session_state.selected_profile['Version'] = atomic_write_text(
+                                file_path,
+                                edited_content,
+                                expected_version=st.session_state.selected_profile['Version']
+                            )
+                            invalidate_meeting_prompt(file_path.stem)
+                            compile_meeting_prompts([file_path.stem])
                             st.success(PROFILE_SAVE_SUCCESS_MESSAGE)
-                            st.session_state.selected_profile['Content'] = edited_content
                             st.session_state.edit_mode = False
                             st.rerun()
+                        except WriteConflictError:
+                            st.error(FILE_CHANGED_ERROR)
                         except Exception as e:
                             st.error(PROFILE_EDIT_ERROR.format(str(e)))
                 else:
-                    st.text(st.session_state.selected_profile['Content'])
+                    st.text(read_text(CUSTOMERS_DIR / st.session_state.selected_profile['File']))
+                    render_profile_tokens(st.session_state.selected_profile['File'])
                     col1, col2, col3 = st.columns([1, 1, 4])
-                    
+
                     if col1.button(CLOSE_BUTTON, key="close_profile"):
                         st.session_state.selected_profile = None
                         st.rerun()
-                    
+
                     if col2.button(EDIT_BUTTON, key="edit_profile"):
                         st.session_state.edit_mode = True
                         st.rerun()
     else:
         st.write(NO_PROFILES_FOUND)
 
+start_run("profiles")
+
+# Initialize session states
+if "creation_mode" not in st.session_state:
+    st.session_state.creation_mode = False
+if "profile_messages" not in st.session_state:
+    st.session_state.profile_messages = []
+if "selected_profile" not in st.session_state:
+    st.session_state.selected_profile = None
+if "creation_completed" not in st.session_state:
+    st.session_state.creation_completed = False
+
+# Custom CSS
+st.markdown(COMMON_TABLE_CSS, unsafe_allow_html=True)
+
+# Main UI
+if not st.session_state.creation_mode:
+    st.title(VIEW_PROFILES_TITLE)
+    
+    profile_table()
+
     # Create new profile button
     if st.button(CREATE_NEW_PROFILE_BUTTON, use_container_width=True):
         st.session_state.creation_mode = True
         st.session_state.profile_messages = []
         st.rerun()
 
+    render_import()
+
 else:
     # Profile Creation Mode
     st.title(CREATE_PROFILE_TITLE)
@@ -223,16 +271,23 @@ else:
                 
                 if not profile_content:
                     st.sidebar.error(NO_COMPLETE_PROFILE)
-                elif save_customer_profile(profile_name, profile_content):
-                    st.sidebar.success(PROFILE_SAVE_SUCCESS.format(profile_name))
-                    st.session_state.creation_completed = True
-                    st.session_state.creation_mode = False
-                    time.sleep(1)
-                    st.rerun()
+                else:
+                    try:
+                        save_customer_profile(profile_name, profile_content)
+                    except Exception as e:
+                        st.error(PROFILE_SAVE_ERROR.format(str(e)))
+                    else:
+                        st.sidebar.success(PROFILE_SAVE_SUCCESS.format(profile_name))
+                        st.session_state.creation_completed = True
+                        st.session_state.creation_mode = False
+                        time.sleep(1)
+                        st.rerun()
 
     # Cancel button to return to profiles view
     if st.sidebar.button(CANCEL_CREATION_BUTTON, use_container_width=True):
         st.session_state.creation_mode = False
         st.session_state.profile_messages = []
         st.session_state.creation_completed = False
-        st.rerun()
\ No newline at end of file
+        st.rerun()
+
+render_overlay()
\ No newline at end of file
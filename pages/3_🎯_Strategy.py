@@ -2,81 +2,126 @@ import streamlit as st
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+import hashlib
 import json
-from anthropic import Anthropic
 
 from core.strings import *
 from core.styles import *
 from core.config import (
     CUSTOMERS_DIR,
     STRATEGIES_DIR, 
-    MEETINGS_DIR,
     MEETING_EVALUATIONS_DIR,
     PROMPTS_DIR,
-    PROFILE_EXTENSION,
-    MEETING_EXTENSION,
-    REPORT_EXTENSION,
-    MODEL_CONFIG
+    PROFILE_EXTENSION
 )
-
-# Initialize Anthropic client
-client = Anthropic(api_key=MODEL_CONFIG["api_key"])
+from core.llm import create_message, response_text
+from core.storage import list_entries, read_entry
+from core.fileio import atomic_write_text
+from core.content_cache import load_files, read_text
+from core.profiling import profiled, render_overlay, start_run
 
 def get_strategy_filepath(customer_name):
     """Get strategy file path for a customer"""
     return STRATEGIES_DIR / f"{customer_name}_strategy.txt"
 
+def get_sources_filepath(customer_name):
+    """Get the path recording which meetings and reports a customer's strategy was built from"""
+    return STRATEGIES_DIR / f"{customer_name}_strategy.json"
+
 def strategy_exists(customer_name):
     """Check if strategy exists for customer"""
     return get_strategy_filepath(customer_name).exists()
 
+def read_strategy_sources(customer_name):
+    """Sources recorded for a customer's strategy; None for strategies written before they were recorded"""
+    path = get_sources_filepath(customer_name)
+    if not path.exists():
+        return None
+    try:
+        return json.loads(read_text(path))
+    except (OSError, ValueError):
+        return None
+
+@profiled
+def current_sources(profile_key, profile_content):
+    """Names of the meetings and reports stored for a customer, with a hash of their profile"""
+    try:
+        return {
+            'meetings': [entry['name'] for entry in list_entries("meeting", profile_key)],
+            'reports': [entry['name'] for entry in list_entries("report", profile_key)],
+            'profile': hashlib.sha256(profile_content.encode()).hexdigest()
+        }
+    except Exception as e:
+        st.error(MEETINGS_LIST_ERROR.format(str(e)))
+        return None
+
+def strategy_delta(recorded, current):
+    """What a strategy built from the recorded sources has not seen yet"""
+    if recorded is None:
+        return {'meetings': current['meetings'], 'reports': current['reports'], 'profile_changed': True}
+    seen_meetings = set(recorded.get('meetings', []))
+    seen_reports = set(recorded.get('reports', []))
+    return {
+        'meetings': [name for name in current['meetings'] if name not in seen_meetings],
+        'reports': [name for name in current['reports'] if name not in seen_reports],
+        'profile_changed': recorded.get('profile') != current['profile']
+    }
+
+def is_stale(delta):
+    return bool(delta['meetings'] or delta['reports'] or delta['profile_changed'])
+
+def strategy_status(recorded, delta):
+    """Short description of how far a strategy is behind its customer's history"""
+    if recorded is None:
+        return STRATEGY_STATUS_UNTRACKED
+    if not is_stale(delta):
+        return STRATEGY_STATUS_CURRENT
+    parts = []
+    if delta['meetings']:
+        parts.append(STRATEGY_STATUS_NEW_MEETINGS.format(len(delta['meetings'])))
+    if delta['reports']:
+        parts.append(STRATEGY_STATUS_NEW_REPORTS.format(len(delta['reports'])))
+    if delta['profile_changed']:
+        parts.append(STRATEGY_STATUS_PROFILE_CHANGED)
+    return ", ".join(parts)
+
+@profiled
 def list_saved_meetings(customer_name=None):
     """List saved meetings, optionally filtered by customer"""
     try:
-        meetings = []
-        for file in MEETINGS_DIR.glob(f"*{MEETING_EXTENSION}"):
-            if file.is_file():
-                try:
-                    data = json.loads(file.read_text())
-                    if customer_name and data.get('customer_profile') != customer_name:
-                        continue
-                    meetings.append({
-                        'filename': file.name,
-                        'customer_profile': data.get('customer_profile', 'Unknown Customer'),
-                        'timestamp': data.get('meeting_start', '')
-                    })
-                except json.JSONDecodeError:
-                    st.error(MEETING_FILE_ERROR.format(file))
-                    continue
-        return sorted(meetings, key=lambda x: x['timestamp'], reverse=True)
+        return [
+            {
+                'filename': entry['name'],
+                'customer_profile': entry['customer'],
+                'timestamp': entry['timestamp']
+            }
+            for entry in list_entries("meeting", customer_name)
+        ]
     except Exception as e:
         st.error(MEETINGS_LIST_ERROR.format(str(e)))
         return []
 
-def list_meeting_reports(customer_name=None):
-    """Get list of meeting reports, optionally filtered by customer"""
+@profiled
+def list_meeting_reports(customer_name=None, names=None):
+    """Get list of meeting reports, optionally filtered by customer and report file names"""
     reports = []
     
     if not MEETING_EVALUATIONS_DIR.exists():
         st.error(MEETINGS_DIR_ERROR.format(MEETING_EVALUATIONS_DIR))
         return reports
         
-    for file in MEETING_EVALUATIONS_DIR.glob("meeting_evaluation_*" + REPORT_EXTENSION):
-        if file.is_file():
-            parts = file.stem.split('_')
-            if len(parts) >= 3:
-                file_customer_name = ' '.join(parts[2:-2])
-                if customer_name and file_customer_name != customer_name:
-                    continue
-                content = file.read_text()
-                reports.append({
-                    "Customer": file_customer_name,
-                    "Content": content
-                })
+    for entry in list_entries("report", customer_name):
+        if names is not None and entry['name'] not in names:
+            continue
+        reports.append({
+            "Customer": entry['customer'],
+            "Content": read_entry(entry)
+        })
     
     return reports
 
-def create_strategy(customer_profile, meetings, reports):
+@profiled
+def create_strategy(customer_profile, meetings, reports, customer_name=None):
     """Generate meeting strategy using AI"""
     try:
         # Load strategy generation prompt
@@ -90,127 +135,197 @@ def create_strategy(customer_profile, meetings, reports):
         # Prepare context from customer profile, meetings and reports
         context = prompt_template.format(
             customer_profile,
-            meetings if meetings else 'No previous meetings',
-            reports if reports else 'No previous evaluations'
+            meetings if meetings else STRATEGY_NO_MEETINGS,
+            reports if reports else STRATEGY_NO_REPORTS
         )
         
-        response = client.messages.create(
-            model=MODEL_CONFIG["strategy"]["model"],
-            max_tokens=MODEL_CONFIG["strategy"]["max_tokens"],
-            temperature=MODEL_CONFIG["strategy"]["temperature"],
-            messages=[{
-                "role": "user",
-                "content": context
-            }]
-        )
+        response = create_message("strategy", [{
+            "role": "user",
+            "content": context
+        }], persona=customer_name)
         
-        return response.content[0].text if response.content else ""
+        return response_text(response)
         
     except Exception as e:
         st.error(STRATEGY_GENERATION_ERROR.format(str(e)))
         return None
 
-def save_strategy(customer_name, strategy_content):
-    """Save strategy to file"""
+@profiled
+def refresh_strategy(customer_profile, previous_strategy, meetings, reports, customer_name=None):
+    """Update a strategy from only what happened since it was written"""
+    try:
+        prompt_path = PROMPTS_DIR / "strategy_refresh_model.txt"
+        if not prompt_path.exists():
+            st.error(STRATEGY_PROMPT_ERROR.format(prompt_path))
+            return None
+
+        context = prompt_path.read_text().format(
+            customer_profile,
+            previous_strategy,
+            meetings if meetings else STRATEGY_NO_NEW_MEETINGS,
+            reports if reports else STRATEGY_NO_NEW_REPORTS
+        )
+
+        response = create_message("strategy", [{
+            "role": "user",
+            "content": context
+        }], persona=customer_name)
+
+        return response_text(response)
+
+    except Exception as e:
+        st.error(STRATEGY_GENERATION_ERROR.format(str(e)))
+        return None
+
+def save_strategy(customer_name, strategy_content, sources):
+    """Save strategy to file, with the meetings and reports it was built from"""
     try:
         filepath = get_strategy_filepath(customer_name)
-        filepath.write_text(strategy_content)
+        atomic_write_text(filepath, strategy_content)
+        atomic_write_text(get_sources_filepath(customer_name), json.dumps({
+            **sources,
+            'updated': datetime.now().strftime("%Y-%m-%d %H:%M")
+        }))
         return True
     except Exception as e:
         st.error(STRATEGY_SAVE_ERROR.format(str(e)))
         return False
 
-# Custom CSS for vertical alignment
-st.markdown(COMMON_TABLE_CSS, unsafe_allow_html=True)
-
-st.title(STRATEGY_PAGE_TITLE)
-
-# Initialize session state
-if "selected_strategy" not in st.session_state:
-    st.session_state.selected_strategy = None
-
-# Get customer profiles
-profiles = []
-for file in CUSTOMERS_DIR.glob(f"*{PROFILE_EXTENSION}"):
-    if file.is_file():
-        content = file.read_text()
+@st.fragment
+def strategy_table():
+    """Profile list and strategy viewer; reruns on its own when a strategy is opened"""
+    # Get customer profiles
+    profiles = []
+    for item in load_files(CUSTOMERS_DIR, PROFILE_EXTENSION):
+        file = item["path"]
+        content = item["text"]
         name = next((line.replace("Name:", "").strip() 
                     for line in content.split('\n') 
                     if line.startswith("Name:")), "Unknown")
         role = next((line.replace("Role:", "").strip() 
                     for line in content.split('\n') 
                     if line.startswith("Role:")), "")
-        
+
+        has_strategy = strategy_exists(name)
+        recorded = read_strategy_sources(name) if has_strategy else None
+        sources = current_sources(file.stem, content) if has_strategy else None
+        delta = strategy_delta(recorded, sources) if sources else None
         profiles.append({
             "Name": name,
             "Role": role,
             "File": file.name,
             "Content": content,
-            "Has_Strategy": strategy_exists(name)
+            "Has_Strategy": has_strategy,
+            "Status": strategy_status(recorded, delta) if delta else STRATEGY_STATUS_MISSING
         })
 
-if profiles:
-    # Create DataFrame
-    df = pd.DataFrame(profiles)
-    
-    # Create columns with predefined layout
-    cols = st.columns(TABLE_LAYOUTS['strategy'])
-
-    # Table headers with consistent styling
-    for col, header in zip(cols, [
-        STRATEGY_TABLE_HEADERS['name'],
-        STRATEGY_TABLE_HEADERS['role'],
-        STRATEGY_TABLE_HEADERS['action']
-    ]):
-        col.markdown(f"<div class='table-header col-{header.lower()}'>{header}</div>", unsafe_allow_html=True)
-    
-    # Display each profile as a row
-    for idx, row in df.iterrows():
+    if profiles:
+        # Create DataFrame
+        df = pd.DataFrame(profiles)
+
+        # Create columns with predefined layout
         cols = st.columns(TABLE_LAYOUTS['strategy'])
-        cols[0].markdown(f"<div class='strategy-cell'>{row['Name']}</div>", unsafe_allow_html=True)
-        cols[1].markdown(f"<div class='strategy-cell'>{row['Role']}</div>", unsafe_allow_html=True)
-        
-        if row['Has_Strategy']:
-            if cols[2].button(STRATEGY_VIEW_BUTTON, key=f"strategy_view_{idx}"):
-                strategy_content = get_strategy_filepath(row['Name']).read_text()
-                st.session_state.selected_strategy = {
-                    'name': row['Name'],
-                    'content': strategy_content
-                }
-        else:
-            if cols[2].button(STRATEGY_CREATE_BUTTON, key=f"strategy_create_{idx}"):
-                # Get meetings and reports for this customer
-                customer_meetings = list_saved_meetings(row['Name'])
-                customer_reports = list_meeting_reports(row['Name'])
-                
-                # Generate strategy
-                strategy_content = create_strategy(
-                    row['Content'],
-                    customer_meetings,
-                    customer_reports
-                )
-                
-                if strategy_content and save_strategy(row['Name'], strategy_content):
-                    st.success(STRATEGY_CREATION_SUCCESS.format(row['Name']))
-                    st.session_state.selected_strategy = {
-                        'name': row['Name'],
-                        'content': strategy_content
-                    }
+
+        # Table headers with consistent styling
+        for col, header in zip(cols, [
+            STRATEGY_TABLE_HEADERS['name'],
+            STRATEGY_TABLE_HEADERS['role'],
+            STRATEGY_TABLE_HEADERS['status'],
+            STRATEGY_TABLE_HEADERS['action']
+        ]):
+            col.markdown(f"<div class='table-header col-{header.lower()}'>{header}</div>", unsafe_allow_html=True)
+
+        # Display each profile as a row
+        for idx, row in df.iterrows():
+            cols = st.columns(TABLE_LAYOUTS['strategy'])
+            cols[0].markdown(f"<div class='strategy-cell'>{row['Name']}</div>", unsafe_allow_html=True)
+            cols[1].markdown(f"<div class='strategy-cell'>{row['Role']}</div>", unsafe_allow_html=True)
+            cols[2].markdown(f"<div class='strategy-cell'>{row['Status']}</div>", unsafe_allow_html=True)
+
+            if row['Has_Strategy']:
+                if cols[3].button(STRATEGY_VIEW_BUTTON, key=f"strategy_view_{idx}"):
+                    # Keep a small handle; the content is read through the shared cache
+                    st.session_state.selected_strategy = {'name': row['Name'], 'file': row['File']}
+            else:
+                if cols[3].button(STRATEGY_CREATE_BUTTON, key=f"strategy_create_{idx}"):
+                    # Get meetings and reports for this customer (stored under the profile file name)
+                    profile_key = Path(row['File']).stem
+                    # Taken before generating, so meetings saved meanwhile count as new
+                    sources = current_sources(profile_key, row['Content'])
+                    customer_meetings = list_saved_meetings(profile_key)
+                    customer_reports = list_meeting_reports(profile_key)
+
+                    # Generate strategy
+                    strategy_content = create_strategy(
+                        row['Content'],
+                        customer_meetings,
+                        customer_reports,
+                        customer_name=row['Name']
+                    )
+
+                    if strategy_content and sources and save_strategy(row['Name'], strategy_content, sources):
+                        st.success(STRATEGY_CREATION_SUCCESS.format(row['Name']))
+                        st.session_state.selected_strategy = {'name': row['Name'], 'file': row['File']}
+                        st.rerun()
+
+        # Display selected strategy
+        if st.session_state.selected_strategy:
+            selected = st.session_state.selected_strategy
+            row = df[df['File'] == selected.get('file')]
+            st.markdown("---")
+            with st.expander(STRATEGY_EXPANDER_TITLE.format(selected['name']), expanded=True):
+                previous_strategy = read_text(get_strategy_filepath(selected['name']))
+                st.text(previous_strategy)
+                recorded = read_strategy_sources(selected['name'])
+                if recorded:
+                    st.caption(STRATEGY_SOURCES_CAPTION.format(
+                        len(recorded.get('meetings', [])),
+                        len(recorded.get('reports', [])),
+                        recorded.get('updated', "")
+                    ))
+
+                col1, col2, col3 = st.columns([1, 1, 4])
+                if col1.button(CLOSE_BUTTON, key="strategy_close_view"):
+                    st.session_state.selected_strategy = None
                     st.rerun()
 
-    # Display selected strategy
-    if st.session_state.selected_strategy:
-        st.markdown("---")
-        with st.expander(STRATEGY_EXPANDER_TITLE.format(st.session_state.selected_strategy['name']), expanded=True):
-            st.text(st.session_state.selected_strategy['content'])
-            
-            col1, col2, col3 = st.columns([1, 1, 4])
-            if col1.button(CLOSE_BUTTON, key="strategy_close_view"):
-                st.session_state.selected_strategy = None
-                st.rerun()
+                if col2.button(STRATEGY_MEET_BUTTON, key="strategy_start_meeting"):
+                    st.switch_page("pages/4_💬_Meet.py")
+
+                if not row.empty and row.iloc[0]['Status'] != STRATEGY_STATUS_CURRENT:
+                    if col3.button(STRATEGY_REFRESH_BUTTON, key="strategy_refresh"):
+                        profile = row.iloc[0]
+                        profile_key = Path(profile['File']).stem
+                        sources = current_sources(profile_key, profile['Content'])
+                        delta = strategy_delta(recorded, sources) if sources else None
+                        if delta:
+                            # Only the delta is sent; the previous strategy already reflects the rest
+                            new_meetings = set(delta['meetings'])
+                            strategy_content = refresh_strategy(
+                                profile['Content'] if delta['profile_changed'] else STRATEGY_PROFILE_UNCHANGED,
+                                previous_strategy,
+                                [m for m in list_saved_meetings(profile_key) if m['filename'] in new_meetings],
+                                list_meeting_reports(profile_key, names=set(delta['reports'])),
+                                customer_name=selected['name']
+                            )
+                            if strategy_content and save_strategy(selected['name'], strategy_content, sources):
+                                st.success(STRATEGY_REFRESH_SUCCESS.format(selected['name']))
+                                st.rerun()
+
+    else:
+        st.write(NO_STRATEGIES_FOUND)
+
+start_run("strategy")
+
+# Custom CSS for vertical alignment
+st.markdown(COMMON_TABLE_CSS, unsafe_allow_html=True)
+
+st.title(STRATEGY_PAGE_TITLE)
+
+# Initialize session state
+if "selected_strategy" not in st.session_state:
+    st.session_state.selected_strategy = None
 
-            if col2.button(STRATEGY_MEET_BUTTON, key="strategy_start_meeting"):
-                st.switch_page("pages/4_💬_Meet.py")
+strategy_table()
 
-else:
-    st.write(NO_STRATEGIES_FOUND)
\ No newline at end of file
+render_overlay()
\ No newline at end of file
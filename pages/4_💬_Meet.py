@@ -1,9 +1,10 @@
 import sys
 from pathlib import Path
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import streamlit as st
-from anthropic import Anthropic
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
@@ -12,12 +13,53 @@ sys.path.append(str(project_root))
 from core.strings import *
 from core.styles import *
 from core.config import (
-    MODEL_CONFIG, MEETINGS_DIR, MEETING_EVALUATIONS_DIR, RESPONSE_EVALUATIONS_DIR,
-    PROMPTS_DIR, CUSTOMERS_DIR, PROFILE_EXTENSION, MEETING_EXTENSION, REPORT_EXTENSION
+    PROMPTS_DIR, CUSTOMERS_DIR, PROFILE_EXTENSION, EVALUATION_CONFIG, FRAGMENT_CONFIG, PANEL_CONFIG
 )
+from core.llm import create_message, response_text
+from core.storage import item_path, new_meeting_id
+from core.fileio import atomic_write_text
+from core.transcript import write_meeting
+from core.evaluation import (
+    conversation_turn_contents,
+    meeting_evaluation_messages,
+    render_meeting_evaluation,
+    render_response_evaluation,
+    request_batched_response_evaluations,
+    request_structured_evaluation,
+    structured_output_enabled,
+    vendor_turn_contents
+)
+from core.prompt_cache import (
+    compile_meeting_prompts, get_meeting_prompt, prewarm_meeting, snapshot_prompt, snapshot_text
+)
+from core.session_store import delete_session, load_session, save_session
+from core.content_cache import load_files, read_text
+from core.telemetry import record_rerun
+from core import rolling_evaluation
+from core.profiling import profile_run, profiled
 
-# Initialize Anthropic client
-client = Anthropic(api_key=MODEL_CONFIG["api_key"])
+# Meeting state kept in the shared session store, so any worker can resume the meeting
+PERSISTED_STATE_KEYS = [
+    "initialized",
+    "conversation_ended",
+    "messages",
+    "evaluations",
+    "evaluation_scores",
+    "meeting_evaluation_scores",
+    "rolling_evaluation",
+    "pending_evaluation_turns",
+    "evaluation_cadence",
+    "evaluation_cadence_turns",
+    "customer_profile",
+    "panel_profiles",
+    "panel_histories",
+    "current_meeting_timestamp",
+    "current_meeting_id",
+    "prompt_snapshot"
+]
+
+# Prompts a meeting keeps the versions of from its start, besides its profiles and system prompts
+MEETING_SNAPSHOT_PROMPTS = ["response_evaluation_model", "meeting_evaluation_model", "panel_context"]
 
 def format_timestamp(format="%Y%m%d_%H%M%S"):
     """Centralized timestamp formatting"""
@@ -44,29 +86,87 @@ def safe_file_operation(operation, *args, error_message=None, **kwargs):
         st.error(error_message.format(str(e)) if error_message else str(e))
         return None
 
+@profiled
 def read_prompt(filename, is_customer=False):
     """Read prompt from file"""
     path = CUSTOMERS_DIR if is_customer else PROMPTS_DIR
     filepath = path / f"{filename}{PROFILE_EXTENSION}"
     return safe_file_operation(
-        lambda: filepath.read_text().strip(),
+        lambda: read_text(filepath).strip(),
         error_message=PROMPT_FILE_ERROR.format(filepath)
     ) or ""
 
+def snapshot_meeting_prompts(profiles):
+    """Snapshot hashes of the system prompts, profiles and evaluation prompts a meeting starts with"""
+    return {
+        "system_prompts": {
+            profile: snapshot_prompt(get_meeting_prompt(profile, with_token_count=False)["system_prompt"])
+            for profile in profiles
+        },
+        "profiles": {profile: snapshot_prompt(read_prompt(profile, is_customer=True)) for profile in profiles},
+        "prompts": {name: snapshot_prompt(read_prompt(name)) for name in MEETING_SNAPSHOT_PROMPTS}
+    }
+
+def pinned_text(kind, name, current):
+    """Text of a prompt as the meeting started with it; current() reads the file for meetings
+    started before snapshots were kept"""
+    digest = (st.session_state.get('prompt_snapshot') or {}).get(kind, {}).get(name)
+    if digest:
+        text = safe_file_operation(snapshot_text, digest, error_message=PROMPT_FILE_ERROR.format(digest))
+        if text is not None:
+            return text
+    return current()
+
+def meeting_prompt(filename):
+    """A prompt file as of the start of the current meeting"""
+    return pinned_text("prompts", filename, lambda: read_prompt(filename))
+
+def meeting_profile(profile):
+    """A customer profile as of the start of the current meeting"""
+    return pinned_text("profiles", profile, lambda: read_prompt(profile, is_customer=True))
+
+def meeting_system_prompt(profile):
+    """A profile's compiled meeting system prompt as of the start of the current meeting"""
+    return pinned_text(
+        "system_prompts",
+        profile,
+        lambda: get_meeting_prompt(profile, with_token_count=False)["system_prompt"]
+    )
+
+def customer_model():
+    """Profile of the current meeting's customer, or every panelist's profile in a panel meeting"""
+    if st.session_state.get('panel_profiles'):
+        return "\n\n".join(meeting_profile(profile) for profile in st.session_state.panel_profiles)
+    return meeting_profile(st.session_state.customer_profile)
+
+def panel_system_prompt(profile):
+    """A panelist's meeting system prompt: its own compiled prompt plus the panel instruction"""
+    return f"{meeting_system_prompt(profile)}\n\n{meeting_prompt('panel_context')}"
+
+def meeting_messages():
+    """Conversation with the meeting system prompt, which is kept as a snapshot in the
+    shared content cache instead of session state"""
+    system_prompt = meeting_system_prompt(st.session_state.customer_profile)
+    return [{"role": "system", "content": system_prompt}] + st.session_state.messages
+
+@profiled
 def display_customer_profiles_table():
     """Display customer profiles in a table format"""
     if not CUSTOMERS_DIR.exists():
         st.error(CUSTOMERS_DIR_ERROR.format(CUSTOMERS_DIR))
         return None
 
-    profiles = sorted(
-        [f.stem for f in CUSTOMERS_DIR.glob(f"*{PROFILE_EXTENSION}") if f.is_file()]
-    )
+    # Profiles are read concurrently while the directory is listed
+    contents = {item["path"].stem: item["text"] for item in load_files(CUSTOMERS_DIR, PROFILE_EXTENSION)}
+    profiles = sorted(contents)
     
     if not profiles:
         st.write(NO_PROFILES_FOUND)
         return None
 
+    # Assemble each profile's meeting prompt ahead of time
+    compile_meeting_prompts(profiles)
+
     # Create columns with predefined layout
     cols = st.columns(TABLE_LAYOUTS['meet'])
 
@@ -81,7 +181,7 @@ def display_customer_profiles_table():
 
     # Display profiles
     for idx, profile in enumerate(profiles):
-        content = read_prompt(profile, is_customer=True)
+        content = contents[profile]
         name = next((line.replace("Name:", "").strip() 
                     for line in content.split('\n') 
                     if line.startswith("Name:")), "Unknown")
@@ -97,37 +197,69 @@ def display_customer_profiles_table():
         cols[2].markdown(f"<div class='profile-cell'>{last_modified}</div>", unsafe_allow_html=True)
         
         if cols[3].button("Meet", key=f"meet_{idx}"):
+            # Warm the connection and prompt cache while the rep types the first message
+            prewarm_meeting(profile)
             return profile
+
+    # Panel selection
+    panel = st.multiselect(
+        PANEL_SELECT_LABEL.format(PANEL_CONFIG["min_panelists"], PANEL_CONFIG["max_panelists"]),
+        profiles,
+        max_selections=PANEL_CONFIG["max_panelists"]
+    )
+    if st.button(PANEL_START_BUTTON, disabled=len(panel) < PANEL_CONFIG["min_panelists"]):
+        panel_context = read_prompt('panel_context')
+        for profile in panel:
+            prewarm_meeting(profile, suffix=panel_context)
+        return panel
     
     return None
 
+def get_meeting_item_path(kind, profile_name):
+    """Path of the current meeting's item of the given kind, creating its shard"""
+    if not st.session_state.get('current_meeting_id'):
+        st.session_state.current_meeting_id = new_meeting_id(
+            st.session_state.get('current_meeting_timestamp') or format_timestamp()
+        )
+    filepath = item_path(kind, profile_name or "Unknown Customer", st.session_state.current_meeting_id)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    return filepath
+
+@profiled
 def save_meeting(profile_name):
     """Save current meeting to file"""
     timestamp = getattr(st.session_state, 'current_meeting_timestamp', format_timestamp())
     
+    filepath = get_meeting_item_path("meeting", profile_name)
+    
     meeting_data = {
+        'meeting_id': st.session_state.current_meeting_id,
         'customer_profile': profile_name or "Unknown Customer",
         'conversation': [
             {
                 'role': msg['role'],
                 'content': msg['content'],
-                'timestamp': format_timestamp("%Y-%m-%d %H:%M:%S")
+                'timestamp': format_timestamp("%Y-%m-%d %H:%M:%S"),
+                **({'persona': msg['persona']} if msg.get('persona') else {})
             }
             for msg in st.session_state.messages if msg['role'] != 'system'
         ],
+        'panel_profiles': st.session_state.panel_profiles,
         'vendor_evaluations': st.session_state.evaluations,
+        'vendor_evaluation_scores': st.session_state.evaluation_scores,
+        'meeting_evaluation_scores': st.session_state.meeting_evaluation_scores,
         'meeting_start': timestamp,
-        'customer_model': st.session_state.customer_model,
-        'response_evaluation_model': st.session_state.response_evaluation_model,
-        'meeting_evaluation_model': st.session_state.meeting_evaluation_model
+        'customer_model': customer_model(),
+        'response_evaluation_model': meeting_prompt('response_evaluation_model'),
+        'meeting_evaluation_model': meeting_prompt('meeting_evaluation_model')
     }
     
-    filename = MEETING_FILENAME.format(profile_name, timestamp, MEETING_EXTENSION)
-    filepath = MEETINGS_DIR / filename
+    filename = filepath.name
     
     if safe_file_operation(
-        filepath.write_text,
-        json.dumps(meeting_data, indent=2),
+        write_meeting,
+        filepath,
+        meeting_data,
         error_message=MEETING_SAVE_ERROR
     ):
         st.session_state.current_meeting_filename = filename
@@ -135,22 +267,23 @@ def save_meeting(profile_name):
         return filename
     return None
 
+@profiled
 def save_evaluation(evaluation, profile_name):
     """Save evaluation to file"""
-    timestamp = getattr(st.session_state, 'current_meeting_timestamp', format_timestamp())
-    filename = EVALUATION_FILENAME.format(profile_name, timestamp)
-    filepath = RESPONSE_EVALUATIONS_DIR / filename
+    filepath = get_meeting_item_path("response_evaluation", profile_name)
+    filename = filepath.name
     
     content = (
         EVALUATION_HEADER.format(format_timestamp("%Y-%m-%d %H:%M:%S")) +
         "".join(
-            EVALUATION_SECTION.format(i) + eval_text + "\n"
+            EVALUATION_SECTION.format(i) + (eval_text or EVALUATION_UNAVAILABLE) + "\n"
             for i, eval_text in enumerate(st.session_state.evaluations, 1)
         )
     )
     
     if safe_file_operation(
-        filepath.write_text,
+        atomic_write_text,
+        filepath,
         content,
         error_message=EVALUATION_SAVE_ERROR
     ):
@@ -158,28 +291,108 @@ def save_evaluation(evaluation, profile_name):
         return filename
     return None
 
+@profiled
 def get_chat_response(messages, mode="chat"):
     """Get response from API"""
-    config = MODEL_CONFIG[mode].copy()
-    
     return safe_file_operation(
-        lambda: client.messages.create(
-            model=config["model"],
-            max_tokens=config["max_tokens"],
-            temperature=config["temperature"],
-            system=next((msg["content"] for msg in messages if msg["role"] == "system"), ""),
-            messages=[
+        lambda: response_text(create_message(
+            mode,
+            [
                 {
                     "role": "assistant" if msg["role"] == "assistant" else "user",
                     "content": msg["content"]
                 }
                 for msg in messages 
                 if msg["role"] != "system" and msg.get("content") and isinstance(msg["content"], str)
+            ],
+            system=next((msg["content"] for msg in messages if msg["role"] == "system"), ""),
+            persona=st.session_state.get("customer_profile"),
+            cache_system=(mode == "chat"),
+            hedge=(mode == "chat")
+        )),
+        error_message=API_CALL_ERROR
+    )
+
+def panel_turn_content(profile, vendor_message):
+    """What a panelist is sent for a vendor message: the other panelists' replies it has not
+    seen yet, then the vendor message"""
+    messages = st.session_state.messages[:-1]
+    own = [i for i, msg in enumerate(messages) if msg.get('persona') == profile]
+    # Replies to the vendor message this panelist last answered were written at the same
+    # time as its own, so it has not seen them either
+    start = max((i for i in range(own[-1]) if messages[i]['role'] == 'user'), default=0) if own else 0
+    others = [
+        f"{msg['persona']}: {msg['content']}"
+        for msg in messages[start:]
+        if msg['role'] == 'assistant' and msg.get('persona') and msg['persona'] != profile
+    ]
+    if not others:
+        return vendor_message
+    return PANEL_OTHERS_SAID.format("\n\n".join(others), vendor_message)
+
+@profiled
+def ask_panel(vendor_message):
+    """Ask every panelist concurrently and show each reply as it arrives.
+
+    Each panelist keeps its own history and cached system prompt, so the turn takes about
+    as long as the slowest panelist. Returns whether any panelist answered.
+    """
+    profiles = st.session_state.panel_profiles
+    histories = st.session_state.panel_histories
+    # Assembled on this thread; the pool threads only wait on the API
+    turns = {
+        profile: (panel_system_prompt(profile), panel_turn_content(profile, vendor_message))
+        for profile in profiles
+    }
+
+    def ask(profile):
+        system, content = turns[profile]
+        return response_text(create_message(
+            "chat",
+            histories.get(profile, []) + [{"role": "user", "content": content}],
+            system=system,
+            persona=profile,
+            cache_system=True,
+            hedge=True
+        ))
+
+    answered = False
+    with ThreadPoolExecutor(max_workers=len(profiles)) as pool:
+        futures = {pool.submit(ask, profile): profile for profile in profiles}
+        for future in as_completed(futures):
+            profile = futures[future]
+            try:
+                reply = future.result()
+            except Exception as e:
+                st.error(PANEL_REPLY_ERROR.format(profile, str(e)))
+                continue
+            histories[profile] = histories.get(profile, []) + [
+                {"role": "user", "content": turns[profile][1]},
+                {"role": "assistant", "content": reply}
             ]
-        ).content[0].text,
+            message = {"role": "assistant", "content": reply, "persona": profile}
+            st.session_state.messages.append(message)
+            render_messages([message])
+            answered = True
+    return answered
+
+def get_structured_evaluation(messages, mode):
+    """Get machine-readable evaluation fields from API"""
+    return safe_file_operation(
+        lambda: request_structured_evaluation(
+            mode,
+            next((msg["content"] for msg in messages if msg["role"] == "system"), ""),
+            [
+                {"role": "user", "content": msg["content"]}
+                for msg in messages
+                if msg["role"] != "system" and msg.get("content")
+            ],
+            persona=st.session_state.get("customer_profile")
+        ),
         error_message=API_CALL_ERROR
     )
 
+@profiled
 def update_response_evaluation(messages):
     """Update the ongoing evaluation of the vendor's response"""
     recent_vendor_message = next((msg for msg in reversed(messages) 
@@ -187,49 +400,125 @@ def update_response_evaluation(messages):
     if not recent_vendor_message:
         return
     
-    previous_customer_message = next((msg for msg in reversed(messages[:-1]) 
-                           if msg['role'] == 'assistant'), None)
-    
-    context_message = (
-        CHAT_CUSTOMER_PREVIOUS_MESSAGE.format(previous_customer_message['content'])
-        if previous_customer_message else CHAT_INITIAL_VENDOR_PITCH
-    )
+    # Graded with the customer's previous reply, or every panelist's previous reply
+    turn_content = conversation_turn_contents(messages)[-1]
+
+    # Batched cadences queue the turn; the queue is graded in one call after the reply
+    if st.session_state.evaluation_cadence != "every_turn":
+        st.session_state.pending_evaluation_turns.append(turn_content)
+        return
     
     eval_messages = [
-        {"role": "system", "content": st.session_state.response_evaluation_model},
-        {"role": "user", "content": context_message + CHAT_VENDOR_RESPONSE.format(recent_vendor_message['content'])}
+        {"role": "system", "content": meeting_prompt('response_evaluation_model')},
+        {"role": "user", "content": turn_content}
     ]
     
+    # Evaluations are matched to vendor turns by position, so a failed grading keeps its
+    # place with None
+    if structured_output_enabled():
+        scores = get_structured_evaluation(eval_messages, mode="response_evaluation")
+        st.session_state.evaluation_scores.append(scores or None)
+        st.session_state.evaluations.append(render_response_evaluation(scores) if scores else None)
+        return
+
     evaluation = get_chat_response(eval_messages, mode="response_evaluation")
-    if evaluation:
-        st.session_state.evaluations.append(evaluation)
+    st.session_state.evaluations.append(evaluation or None)
+
+@profiled
+def evaluate_pending_turns():
+    """Grade all pending vendor turns in one batched call and split the results back per turn"""
+    pending = st.session_state.pending_evaluation_turns
+    if not pending:
+        return
+    
+    results = safe_file_operation(
+        lambda: request_batched_response_evaluations(
+            meeting_prompt('response_evaluation_model'),
+            pending,
+            persona=st.session_state.get("customer_profile")
+        ),
+        error_message=API_CALL_ERROR
+    )
+    if results is None:
+        # Keep the turns queued so the next batch retries them
+        return
+    
+    for scores in results:
+        st.session_state.evaluation_scores.append(scores)
+        st.session_state.evaluations.append(render_response_evaluation(scores))
+    st.session_state.pending_evaluation_turns = []
 
 def generate_meeting_evaluation():
     """Generate meeting evaluation using all conversation data"""
-    vendor_messages = [msg for msg in st.session_state.messages if msg["role"] == "user"]
-    
-    messages = [
-        {"role": "system", "content": st.session_state.meeting_evaluation_model},
-        {"role": "user", "content": CHAT_CUSTOMER_CONTEXT.format(st.session_state.customer_model)}
-    ]
-    messages.extend({"role": "user", "content": msg["content"]} for msg in vendor_messages)
+    messages = [{"role": "system", "content": meeting_prompt('meeting_evaluation_model')}]
+    messages.extend(meeting_evaluation_messages(customer_model(), st.session_state.messages))
     
+    if structured_output_enabled():
+        scores = get_structured_evaluation(messages, mode="meeting_evaluation")
+        if not scores:
+            return None
+        st.session_state.meeting_evaluation_scores = scores
+        return render_meeting_evaluation(scores)
+
     return get_chat_response(messages, mode="meeting_evaluation")
 
+def rolling_evaluation_args():
+    """Inputs shared by rolling meeting evaluation updates and finalization"""
+    return (
+        meeting_prompt('meeting_evaluation_model'),
+        customer_model(),
+        vendor_turn_contents(st.session_state.messages),
+        list(st.session_state.evaluations)
+    )
+
+def schedule_rolling_evaluation():
+    """Fold the latest turns into the draft meeting evaluation in the background"""
+    if not EVALUATION_CONFIG["rolling"]:
+        return
+    meeting_id = st.session_state.current_meeting_id
+    st.session_state.rolling_evaluation = rolling_evaluation.latest_draft(
+        meeting_id, st.session_state.rolling_evaluation
+    )
+    rolling_evaluation.schedule_update(
+        meeting_id,
+        st.session_state.rolling_evaluation,
+        *rolling_evaluation_args(),
+        structured_output_enabled(),
+        persona=st.session_state.customer_profile
+    )
+
+@profiled
+def finalize_meeting_evaluation():
+    """Final meeting evaluation from the rolling draft, or a full evaluation when there is none"""
+    if EVALUATION_CONFIG["rolling"]:
+        draft = safe_file_operation(
+            rolling_evaluation.finalize_draft,
+            st.session_state.current_meeting_id,
+            st.session_state.rolling_evaluation,
+            *rolling_evaluation_args(),
+            list(st.session_state.evaluation_scores),
+            structured_output_enabled(),
+            persona=st.session_state.customer_profile,
+            error_message=API_CALL_ERROR
+        )
+        rolling_evaluation.discard(st.session_state.current_meeting_id)
+        if draft:
+            st.session_state.rolling_evaluation = draft
+            st.session_state.meeting_evaluation_scores = draft["scores"]
+            return draft["text"]
+    return generate_meeting_evaluation()
+
 def save_report(report):
     """Save report to file"""
     if not report:
         return None
         
-    filename = REPORT_FILENAME.format(
-        st.session_state.customer_profile,
-        format_timestamp(),
-        REPORT_EXTENSION
-    )
-    filepath = MEETING_EVALUATIONS_DIR / filename
+    filepath = get_meeting_item_path("report", st.session_state.customer_profile)
+    filename = filepath.name
     
     return safe_file_operation(
-        filepath.write_text,
+        atomic_write_text,
+        filepath,
         report,
         error_message=MEETING_SAVE_ERROR
     ) and filename
@@ -241,112 +530,249 @@ def initialize_session():
         st.session_state.conversation_ended = False
         st.session_state.messages = []
         st.session_state.evaluations = []
+        st.session_state.evaluation_scores = []
+        st.session_state.meeting_evaluation_scores = None
+        st.session_state.rolling_evaluation = rolling_evaluation.empty_draft()
+        st.session_state.pending_evaluation_turns = []
+        st.session_state.evaluation_cadence = EVALUATION_CONFIG["cadence"]
+        st.session_state.evaluation_cadence_turns = EVALUATION_CONFIG["cadence_turns"]
         st.session_state.customer_profile = None
+        st.session_state.panel_profiles = []
+        st.session_state.panel_histories = {}
         st.session_state.current_meeting_timestamp = None
-        st.session_state.customer_model = None
-        st.session_state.response_evaluation_model = None
-        st.session_state.meeting_evaluation_model = None
+        st.session_state.current_meeting_id = None
+        st.session_state.prompt_snapshot = None
+
+@profiled
+def persist_session():
+    """Save the current meeting's session state to the shared store"""
+    if st.session_state.get('current_meeting_id'):
+        safe_file_operation(
+            save_session,
+            st.session_state.current_meeting_id,
+            {key: st.session_state.get(key) for key in PERSISTED_STATE_KEYS},
+            error_message=SESSION_SAVE_ERROR
+        )
+
+@profiled
+def resume_session():
+    """Restore the meeting named in the URL when this worker has no state for it"""
+    meeting_id = st.query_params.get("meeting")
+    if not meeting_id or st.session_state.initialized:
+        return
+    state = safe_file_operation(load_session, meeting_id, error_message=SESSION_LOAD_ERROR)
+    if state:
+        for key, value in state.items():
+            # Sessions saved by older versions may carry keys no longer kept in state
+            if key in PERSISTED_STATE_KEYS:
+                st.session_state[key] = value
+    else:
+        st.query_params.pop("meeting", None)
 
 def handle_new_meeting():
     """Handle new meeting button click"""
-    if st.session_state.initialized and len(st.session_state.messages) > 1:
+    if st.session_state.initialized and any(msg['role'] != 'system' for msg in st.session_state.messages):
         save_meeting(st.session_state.customer_profile)
+    if st.session_state.get('current_meeting_id'):
+        safe_file_operation(delete_session, st.session_state.current_meeting_id, error_message=SESSION_SAVE_ERROR)
+        rolling_evaluation.discard(st.session_state.current_meeting_id)
+    st.query_params.pop("meeting", None)
     
     st.session_state.initialized = False
     st.session_state.messages = []
     st.session_state.evaluations = []
+    st.session_state.evaluation_scores = []
+    st.session_state.meeting_evaluation_scores = None
+    st.session_state.rolling_evaluation = rolling_evaluation.empty_draft()
+    st.session_state.pending_evaluation_turns = []
     st.session_state.conversation_ended = False
     st.session_state.customer_profile = None
+    st.session_state.panel_profiles = []
+    st.session_state.panel_histories = {}
     st.session_state.current_meeting_timestamp = None
+    st.session_state.current_meeting_id = None
+    st.session_state.prompt_snapshot = None
     st.rerun()
 
 def initialize_meeting(selected_profile):
-    """Initialize meeting with selected profile"""
+    """Initialize meeting with selected profile, or a panel meeting with a list of profiles"""
+    if isinstance(selected_profile, list):
+        st.session_state.panel_profiles = selected_profile
+        st.session_state.panel_histories = {}
+        profiles = selected_profile
+        selected_profile = PANEL_CUSTOMER_NAME.format(" + ".join(selected_profile))
+    else:
+        profiles = [selected_profile]
     st.session_state.customer_profile = selected_profile
     st.session_state.current_meeting_timestamp = format_timestamp()
+    st.session_state.current_meeting_id = new_meeting_id(st.session_state.current_meeting_timestamp)
     
-    st.session_state.customer_model = read_prompt(selected_profile, is_customer=True)
-    st.session_state.response_evaluation_model = read_prompt('response_evaluation_model')
-    st.session_state.meeting_evaluation_model = read_prompt('meeting_evaluation_model')
-    
-    st.session_state.messages = [{
-        "role": "system",
-        "content": "\n\n".join([
-            read_prompt('core_instruction'),
-            st.session_state.customer_model,
-            read_prompt('vendor_model'),
-            read_prompt('meeting_context')
-        ])
-    }]
+    # The meeting keeps the prompt and profile versions it starts with, even when the files
+    # are edited mid-meeting; session state holds their hashes and the shared content
+    # cache their text
+    st.session_state.prompt_snapshot = safe_file_operation(
+        snapshot_meeting_prompts,
+        profiles,
+        error_message=SESSION_SAVE_ERROR
+    )
+    st.session_state.messages = []
     st.session_state.initialized = True
+    st.query_params["meeting"] = st.session_state.current_meeting_id
+    persist_session()
     st.rerun()
 
-def main():
-    initialize_session()
-
-    # Main UI - Title Section
-    st.title(
-        TITLE_WITH_CUSTOMER.format(st.session_state.customer_profile)
-        if st.session_state.initialized and st.session_state.customer_profile
-        else TITLE_DEFAULT
-    )
-
-    # Sidebar
-    with st.sidebar:
-        if st.button(NEW_MEETING_BUTTON, use_container_width=True):
-            handle_new_meeting()
-
-    # Customer Profile Selection
-    if not st.session_state.initialized:
-        st.markdown(COMMON_TABLE_CSS, unsafe_allow_html=True)
-        selected_profile = display_customer_profiles_table()
-        if selected_profile:
-            initialize_meeting(selected_profile)
+@profiled
+def render_messages(messages):
+    """Render conversation messages as chat bubbles"""
+    for message in messages:
+        if message["role"] != "system":
+            with st.chat_message(message["role"]):
+                if message.get("persona"):
+                    st.markdown(f"**{message['persona']}**")
+                st.write(message["content"])
 
-    # Chat Interface
-    if st.session_state.initialized:
-        # Display chat history
-        for message in st.session_state.messages:
-            if message["role"] != "system":
-                with st.chat_message(message["role"]):
-                    st.write(message["content"])
+@st.fragment
+def chat_area():
+    """Newest messages and the chat input; reruns on its own when a message is sent"""
+    with profile_run("meet_chat", fragment=True):
+        started = time.perf_counter()
+        tail = st.session_state.messages[st.session_state.get('rendered_messages', 0):]
+        if len(tail) > FRAGMENT_CONFIG["meet_tail_messages"]:
+            # Fold the tail into the page-rendered history with one full rerun
+            st.rerun()
+        render_messages(tail)
+        render_seconds = time.perf_counter() - started
 
         # Chat input
         if not st.session_state.conversation_ended:
             user_input = st.chat_input(CHAT_INPUT_PLACEHOLDER)
-            
+        
             if user_input:
                 # Display user message
                 st.session_state.messages.append({"role": "user", "content": user_input})
                 with st.chat_message("user"):
                     st.write(user_input)
-                
-                update_response_evaluation(st.session_state.messages)
-
+            
                 if user_input.lower().strip() == FREEZE_COMMAND:
-                    meeting_evaluation = generate_meeting_evaluation()
+                    evaluate_pending_turns()
+                    meeting_evaluation = finalize_meeting_evaluation()
                     if meeting_evaluation:
                         filename = save_report(meeting_evaluation)
                         save_meeting(st.session_state.customer_profile)
                         if st.session_state.evaluations:
                             save_evaluation(st.session_state.evaluations[-1], st.session_state.customer_profile)
-                        
+                    
                         with st.chat_message("assistant"):
                             st.write(meeting_evaluation)
                             st.write(CHAT_REPORT_SAVED.format(filename))
                             st.write(CHAT_MEETING_SAVED.format(st.session_state.current_meeting_filename))
                             st.write(CHAT_EVALUATIONS_SAVED.format(st.session_state.current_evaluation_filename))
                     st.session_state.conversation_ended = True
+                    persist_session()
                 else:
-                    response = get_chat_response(st.session_state.messages)
-                    if response:
-                        st.session_state.messages.append({"role": "assistant", "content": response})
-                        with st.chat_message("assistant"):
-                            st.write(response)
-                        
+                    update_response_evaluation(st.session_state.messages)
+                    if st.session_state.panel_profiles:
+                        answered = ask_panel(user_input)
+                    else:
+                        response = get_chat_response(meeting_messages())
+                        if response:
+                            st.session_state.messages.append({"role": "assistant", "content": response})
+                            with st.chat_message("assistant"):
+                                st.write(response)
+                        answered = bool(response)
+                    if answered:
+                        # Graded after the reply, so the customer's answer does not wait for the batch
+                        pending = len(st.session_state.pending_evaluation_turns)
+                        if (st.session_state.evaluation_cadence == "every_n_turns" and
+                                pending >= st.session_state.evaluation_cadence_turns):
+                            evaluate_pending_turns()
                         save_meeting(st.session_state.customer_profile)
                         if st.session_state.evaluations:
                             save_evaluation(st.session_state.evaluations[-1], st.session_state.customer_profile)
+                        schedule_rolling_evaluation()
+                        persist_session()
+
+        # Within a full page run the page's own record covers this
+        if not st.session_state.get('page_run_active'):
+            record_rerun(
+                page="meet",
+                scope="fragment",
+                seconds=round(time.perf_counter() - started, 4),
+                render_seconds=round(render_seconds, 4),
+                messages=len(st.session_state.messages)
+            )
+
+def main():
+    started = time.perf_counter()
+    render_seconds = 0.0
+    initialize_session()
+    resume_session()
+
+    # Main UI - Title Section
+    st.title(
+        TITLE_WITH_CUSTOMER.format(st.session_state.customer_profile)
+        if st.session_state.initialized and st.session_state.customer_profile
+        else TITLE_DEFAULT
+    )
+
+    # Sidebar
+    with st.sidebar:
+        if st.button(NEW_MEETING_BUTTON, use_container_width=True):
+            handle_new_meeting()
+
+        # Evaluations are matched to vendor turns by position; switching cadence mid-meeting
+        # would append queued turns' evaluations after newer ones, so it is fixed per meeting
+        locked = st.session_state.initialized
+        cadences = list(EVALUATION_CADENCE_OPTIONS)
+        st.session_state.evaluation_cadence = st.selectbox(
+            EVALUATION_CADENCE_LABEL,
+            cadences,
+            index=cadences.index(st.session_state.evaluation_cadence),
+            format_func=EVALUATION_CADENCE_OPTIONS.get,
+            disabled=locked,
+            help=EVALUATION_CADENCE_LOCKED_HELP if locked else None
+        )
+        if st.session_state.evaluation_cadence == "every_n_turns":
+            st.session_state.evaluation_cadence_turns = st.number_input(
+                EVALUATION_CADENCE_TURNS_LABEL,
+                min_value=2,
+                max_value=20,
+                value=st.session_state.evaluation_cadence_turns,
+                disabled=locked,
+                help=EVALUATION_CADENCE_LOCKED_HELP if locked else None
+            )
+
+    # Customer Profile Selection
+    if not st.session_state.initialized:
+        st.markdown(COMMON_TABLE_CSS, unsafe_allow_html=True)
+        selected_profile = display_customer_profiles_table()
+        if selected_profile:
+            initialize_meeting(selected_profile)
+
+    # Chat Interface
+    if st.session_state.initialized:
+        # History up to here renders once per page run; the chat fragment renders
+        # only newer messages, so a turn's rerun does not grow with the meeting
+        st.session_state.rendered_messages = len(st.session_state.messages)
+        render_started = time.perf_counter()
+        render_messages(st.session_state.messages)
+        render_seconds = time.perf_counter() - render_started
+        # Fragment reruns replay chat_area's arguments, so the page run is marked in
+        # session state instead
+        st.session_state.page_run_active = True
+        try:
+            chat_area()
+        finally:
+            st.session_state.page_run_active = False
+
+    record_rerun(
+        page="meet",
+        scope="app",
+        seconds=round(time.perf_counter() - started, 4),
+        render_seconds=round(render_seconds, 4),
+        messages=len(st.session_state.messages)
+    )
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with profile_run("meet"):
+        main()
\ No newline at end of file
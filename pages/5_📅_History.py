@@ -2,10 +2,17 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 import json
+import os
+import tempfile
+from pathlib import Path
 
 from core.strings import *
 from core.styles import *
-from core.config import MEETINGS_DIR, MEETING_EXTENSION
+from core.config import MEETINGS_DIR, TRANSCRIPT_WINDOW_SIZE
+from core.storage import list_customers, list_entries
+from core.export import DATASETS, FORMATS, export_dataset
+from core.transcript import count_turns, read_turns
+from core.profiling import profiled, render_overlay, start_run
 
 def parse_timestamp(timestamp_str, input_format="%Y%m%d_%H%M%S", output_format="%Y-%m-%d"):
     """Parse timestamp string to desired format"""
@@ -20,40 +27,185 @@ def parse_timestamp(timestamp_str, input_format="%Y%m%d_%H%M%S", output_format="
         except ValueError:
             return "Unknown Date"
 
-def load_meeting(filename):
-    """Load meeting data from file"""
-    filepath = MEETINGS_DIR / filename
+def load_meeting_window(entry):
+    """Bounds of the most recent window of a meeting's conversation"""
     try:
-        with open(filepath) as f:
-            return json.load(f)
+        total = count_turns(entry)
+        return {
+            'total': total,
+            'start': max(0, total - TRANSCRIPT_WINDOW_SIZE)
+        }
     except Exception as e:
         st.error(MEETING_FILE_ERROR.format(str(e)))
         return None
 
+def load_earlier_turns(selected):
+    """Extend the selected meeting's window by the previous window of turns"""
+    selected['start'] = max(0, selected['start'] - TRANSCRIPT_WINDOW_SIZE)
+
+@profiled
+def read_window(selected):
+    """Turns of the selected meeting's window; only the window bounds live in session state"""
+    try:
+        return read_turns(selected['entry'], selected['start'], selected['total'])
+    except Exception as e:
+        st.error(MEETING_FILE_ERROR.format(str(e)))
+        return []
+
+@profiled
 def list_saved_meetings():
     """List all saved meetings with their metadata"""
     if not MEETINGS_DIR.exists():
         st.error(MEETINGS_DIR_ERROR.format(MEETINGS_DIR))
         return []
     
-    meetings = []
-    for file in MEETINGS_DIR.glob(f"*{MEETING_EXTENSION}"):
-        try:
-            meeting_data = json.loads(file.read_text())
-            # Get timestamp from meeting_start field instead of filename
-            timestamp = meeting_data.get('meeting_start', '')
-            
-            meetings.append({
-                'filename': file.name,
-                'customer_profile': meeting_data.get('customer_profile', 'Unknown'),
-                'timestamp': timestamp,
-                'formatted_date': parse_timestamp(timestamp) if timestamp else "Unknown Date"
-            })
-        except Exception as e:
-            st.error(MEETING_FILE_ERROR.format(str(e)))
-            continue
-    
-    return sorted(meetings, key=lambda x: x['timestamp'], reverse=True)
+    # Customer and start time come from the storage layout or archive index,
+    # so files are only opened on "View"
+    return [
+        {
+            'entry': entry,
+            'customer_profile': entry['customer'],
+            'timestamp': entry['timestamp'],
+            'formatted_date': parse_timestamp(entry['timestamp']) if entry['timestamp'] else "Unknown Date"
+        }
+        for entry in list_entries("meeting")
+    ]
+
+def prepare_export(dataset, fmt, customer, date_range):
+    """Stream the selected data to a temporary file for download"""
+    since, until = (list(date_range) + [None, None])[:2] if date_range else (None, None)
+    # Drop the file from this session's previous export
+    previous = st.session_state.get("history_export")
+    if previous:
+        previous['path'].unlink(missing_ok=True)
+
+    fd, name = tempfile.mkstemp(suffix=FORMATS[fmt])
+    os.close(fd)
+    path = Path(name)
+    try:
+        count = export_dataset(dataset, fmt, path, customer, since, until or since)
+    except Exception as e:
+        path.unlink(missing_ok=True)
+        st.error(EXPORT_ERROR.format(str(e)))
+        return None
+    return {'path': path, 'count': count, 'file_name': f"{dataset}{FORMATS[fmt]}"}
+
+def serve_export(path):
+    """Contents of a prepared export, deleting its temporary file"""
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return b""
+    finally:
+        path.unlink(missing_ok=True)
+
+def clear_export():
+    """Forget the served export"""
+    st.session_state.history_export = None
+
+def render_export():
+    """Export controls: stream filtered data to a file and offer it for download"""
+    with st.expander(EXPORT_EXPANDER_TITLE):
+        cols = st.columns(3)
+        dataset = cols[0].selectbox(
+            EXPORT_DATASET_LABEL,
+            list(DATASETS),
+            format_func=EXPORT_DATASET_OPTIONS.get,
+            key="export_dataset"
+        )
+        fmt = cols[1].selectbox(EXPORT_FORMAT_LABEL, list(FORMATS), key="export_format")
+        customer = cols[2].selectbox(
+            EXPORT_CUSTOMER_LABEL,
+            [EXPORT_ALL_CUSTOMERS] + list_customers("meeting"),
+            key="export_customer"
+        )
+        date_range = st.date_input(EXPORT_DATE_RANGE_LABEL, value=(), key="export_dates")
+
+        if st.button(EXPORT_PREPARE_BUTTON, key="export_prepare"):
+            st.session_state.history_export = prepare_export(
+                dataset,
+                fmt,
+                None if customer == EXPORT_ALL_CUSTOMERS else customer,
+                date_range
+            )
+
+        export = st.session_state.get("history_export")
+        if export and export['path'].exists():
+            st.caption(EXPORT_READY.format(export['count']))
+            # The file is read only when the download is clicked, not on every rerun,
+            # and removed once it has been served; the click's rerun drops the export
+            # first, so the button is not offered again for a deleted file
+            st.download_button(
+                EXPORT_DOWNLOAD_BUTTON,
+                lambda: serve_export(export['path']),
+                file_name=export['file_name'],
+                key="export_download",
+                on_click=clear_export
+            )
+        elif export:
+            st.session_state.history_export = None
+
+@st.fragment
+def meeting_table():
+    """Meeting list and viewer; reruns on its own when a meeting is opened or paged"""
+    # Get meetings and create dataframe
+    meetings = list_saved_meetings()
+    if meetings:
+        # Create DataFrame with formatted dates
+        df = pd.DataFrame(meetings)
+
+        # Create columns with predefined layout
+        cols = st.columns(TABLE_LAYOUTS['history'])
+
+        # Table headers with consistent styling
+        for col, header in zip(cols, [
+            MEETING_TABLE_HEADERS['customer'],
+            MEETING_TABLE_HEADERS['date'],
+            MEETING_TABLE_HEADERS['action']
+        ]):
+            col.markdown(f"<div class='table-header col-{header.lower()}'>{header}</div>", unsafe_allow_html=True)
+
+        # Display each meeting as a row with a button
+        for idx, row in df.iterrows():
+            cols = st.columns(TABLE_LAYOUTS['history'])
+            cols[0].markdown(f"<div class='meeting-cell'>{row['customer_profile']}</div>", unsafe_allow_html=True)
+            cols[1].markdown(f"<div class='meeting-cell'>{row['formatted_date']}</div>", unsafe_allow_html=True)
+            if cols[2].button(VIEW_REPORT_BUTTON_TEXT, key=f"view_{idx}"):
+                window = load_meeting_window(row['entry'])
+                if window:
+                    st.session_state.selected_meeting = {
+                        'customer': row['customer_profile'],
+                        'entry': row['entry'],
+                        **window
+                    }
+
+        # Display selected meeting content
+        if st.session_state.selected_meeting is not None:
+            st.markdown("---")
+            with st.expander(MEETING_EXPANDER_TITLE.format(st.session_state.selected_meeting['customer']), expanded=True):
+                selected = st.session_state.selected_meeting
+                if selected['start'] > 0:
+                    st.caption(TRANSCRIPT_WINDOW_CAPTION.format(selected['start'] + 1, selected['total'], selected['total']))
+                    if st.button(LOAD_EARLIER_BUTTON, key="load_earlier"):
+                        load_earlier_turns(selected)
+                        st.rerun()
+
+                # Display conversation (only the loaded window)
+                for msg in read_window(selected):
+                    with st.chat_message(msg['role']):
+                        if msg.get('persona'):
+                            st.markdown(f"**{msg['persona']}**")
+                        st.write(msg['content'])
+
+                col1, col2, col3 = st.columns([1, 1, 4])
+                if col1.button(CLOSE_BUTTON, key="close_meeting"):
+                    st.session_state.selected_meeting = None
+                    st.rerun()
+
+    else:
+        st.write(NO_MEETINGS_FOUND)
+
+start_run("history")
 
 # Custom CSS for vertical alignment
 st.markdown(COMMON_TABLE_CSS, unsafe_allow_html=True)
@@ -64,49 +216,8 @@ st.title(VIEW_HISTORY_TITLE)
 if "selected_meeting" not in st.session_state:
     st.session_state.selected_meeting = None
 
-# Get meetings and create dataframe
-meetings = list_saved_meetings()
-if meetings:
-    # Create DataFrame with formatted dates
-    df = pd.DataFrame(meetings)
-    
-    # Create columns with predefined layout
-    cols = st.columns(TABLE_LAYOUTS['history'])
-
-    # Table headers with consistent styling
-    for col, header in zip(cols, [
-        MEETING_TABLE_HEADERS['customer'],
-        MEETING_TABLE_HEADERS['date'],
-        MEETING_TABLE_HEADERS['action']
-    ]):
-        col.markdown(f"<div class='table-header col-{header.lower()}'>{header}</div>", unsafe_allow_html=True)
-    
-    # Display each meeting as a row with a button
-    for idx, row in df.iterrows():
-        cols = st.columns(TABLE_LAYOUTS['history'])
-        cols[0].markdown(f"<div class='meeting-cell'>{row['customer_profile']}</div>", unsafe_allow_html=True)
-        cols[1].markdown(f"<div class='meeting-cell'>{row['formatted_date']}</div>", unsafe_allow_html=True)
-        if cols[2].button(VIEW_REPORT_BUTTON_TEXT, key=f"view_{idx}"):
-            meeting_data = load_meeting(row['filename'])
-            if meeting_data:
-                st.session_state.selected_meeting = {
-                    'customer': row['customer_profile'],
-                    'data': meeting_data
-                }
-    
-    # Display selected meeting content
-    if st.session_state.selected_meeting is not None:
-        st.markdown("---")
-        with st.expander(MEETING_EXPANDER_TITLE.format(st.session_state.selected_meeting['customer']), expanded=True):
-            # Display conversation
-            for msg in st.session_state.selected_meeting['data']['conversation']:
-                with st.chat_message(msg['role']):
-                    st.write(msg['content'])
-            
-            col1, col2, col3 = st.columns([1, 1, 4])
-            if col1.button(CLOSE_BUTTON, key="close_meeting"):
-                st.session_state.selected_meeting = None
-                st.rerun()
-
-else:
-    st.write(NO_MEETINGS_FOUND)
\ No newline at end of file
+render_export()
+
+meeting_table()
+
+render_overlay()
\ No newline at end of file
@@ -5,8 +5,17 @@ from datetime import datetime
 
 from core.strings import *
 from core.styles import *
-from core.config import PROMPTS_DIR
+from core.config import CUSTOMERS_DIR, PROFILE_EXTENSION, PROMPT_BUDGET_CONFIG, PROMPTS_DIR
+from core.rate_limiter import rate_limiter
+from core.fileio import atomic_write_text, file_version, WriteConflictError
+from core.content_cache import cache_stats, load_files, read_text
+from core.memory import process_rss_bytes, session_state_sizes
+from core.prompt_history import list_prompt_versions, record_prompt_version
+from core.reevaluate import REEVALUATION_PROMPTS
+from core.prompt_budget import MEETING_PROMPT_FILES, file_tokens, meeting_projection
+from core.profiling import profiled, render_overlay, start_run
 
+@profiled
 def list_prompts():
     """Get list of available prompts with their details"""
     prompts = []
@@ -15,24 +24,157 @@ def list_prompts():
         st.error(PROMPTS_DIR_ERROR.format(PROMPTS_DIR))
         return prompts
         
-    for file in PROMPTS_DIR.glob("*.txt"):
-        if file.is_file():
-            content = file.read_text()
-            # Convert filename to display name (e.g., customer_creation_model -> Customer Creation Model)
-            display_name = " ".join(
-                word.capitalize()
-                for word in file.stem.replace('_', ' ').split()
-            )
-            
-            prompts.append({
-                "Name": display_name,
-                "File": file.name,
-                "Content": content,
-                "Last Modified": datetime.fromtimestamp(file.stat().st_mtime)
-            })
+    # Token counts are API calls on a cold cache, so they run with the concurrent reads
+    count = lambda item: file_tokens(item["path"], item["text"], item["version"])
+    for item in load_files(PROMPTS_DIR, ".txt", parse=count):
+        file = item["path"]
+        # Convert filename to display name (e.g., customer_creation_model -> Customer Creation Model)
+        display_name = " ".join(
+            word.capitalize()
+            for word in file.stem.replace('_', ' ').split()
+        )
+        
+        tokens, estimated = item["parsed"]
+        prompts.append({
+            "Name": display_name,
+            "File": file.name,
+            "Tokens": tokens,
+            "Tokens Estimated": estimated,
+            "Content": item["text"],
+            "Version": item["version"],
+            "Last Modified": datetime.fromtimestamp(item["stat"].st_mtime)
+        })
     
     return prompts
 
+@profiled
+def meeting_budget_rows():
+    """Meeting system prompt size and projected input tokens of every profile"""
+    profiles = sorted(f.stem for f in CUSTOMERS_DIR.glob(f"*{PROFILE_EXTENSION}") if f.is_file())
+    return [meeting_projection(profile) for profile in profiles]
+
+def render_prompt_budget(rows):
+    """Warn about profiles whose meeting prompt is over budget and show the projection table"""
+    over_budget = [row['profile'] for row in rows if row['over_budget']]
+    if over_budget:
+        st.warning(PROMPT_BUDGET_WARNING.format(
+            PROMPT_BUDGET_CONFIG['meeting_prompt_max_tokens'],
+            ", ".join(over_budget)
+        ))
+    with st.expander(PROMPT_BUDGET_TITLE):
+        st.caption(PROMPT_BUDGET_CAPTION.format(
+            PROMPT_BUDGET_CONFIG['projected_turns'],
+            PROMPT_BUDGET_CONFIG['turn_tokens'],
+            PROMPT_BUDGET_CONFIG['meeting_prompt_max_tokens']
+        ))
+        if rows:
+            st.dataframe(
+                pd.DataFrame(rows)[list(PROMPT_BUDGET_HEADERS)].rename(columns=PROMPT_BUDGET_HEADERS),
+                hide_index=True,
+                use_container_width=True
+            )
+
+@st.fragment
+def prompt_table():
+    """Prompt list and editor; reruns on its own when a prompt is opened or edited"""
+    # Get prompts and create dataframe
+    prompts = list_prompts()
+    if prompts:
+        # Create DataFrame
+        df = pd.DataFrame(prompts)
+
+        # Format the Last Modified column
+        df['Last Modified'] = df['Last Modified'].dt.strftime('%Y-%m-%d')
+
+        # Create columns with predefined layout
+        cols = st.columns(TABLE_LAYOUTS['settings'])
+
+        # Table headers with consistent styling
+        for col, header in zip(cols, [
+            PROMPTS_TABLE_HEADERS['name'],
+            PROMPTS_TABLE_HEADERS['tokens'],
+            PROMPTS_TABLE_HEADERS['last_modified'],
+            PROMPTS_TABLE_HEADERS['action']
+        ]):
+            col.markdown(f"<div class='table-header'>{header}</div>", unsafe_allow_html=True)
+
+        # Display each prompt as a row with a button
+        for idx, row in df.iterrows():
+            cols = st.columns(TABLE_LAYOUTS['settings'])
+            cols[0].markdown(f"<div class='table-cell'>{row['Name']}</div>", unsafe_allow_html=True)
+            cols[1].markdown(f"<div class='table-cell'>{row['Tokens']:,}</div>", unsafe_allow_html=True)
+            cols[2].markdown(f"<div class='table-cell'>{row['Last Modified']}</div>", unsafe_allow_html=True)
+            if cols[3].button(VIEW_PROMPT_BUTTON, key=f"view_{idx}"):
+                # Keep a small handle; the content is read through the shared cache
+                st.session_state.selected_prompt = {'Name': row['Name'], 'File': row['File'], 'Version': row['Version']}
+                st.session_state.edit_mode = False
+
+        # Display selected prompt content
+        if st.session_state.selected_prompt is not None:
+            st.markdown("---")
+            with st.expander(PROMPT_EXPANDER_TITLE.format(st.session_state.selected_prompt['Name']), expanded=True):
+                if st.session_state.edit_mode:
+                    edited_content = st.text_area(
+                        EDIT_PROMPT_LABEL,
+                        value=read_text(PROMPTS_DIR / st.session_state.selected_prompt['File']),
+                        height=400
+                    )
+
+                    col1, col2, col3 = st.columns([1, 1, 4])
+
+                    if col1.button(CANCEL_BUTTON, key="cancel_edit"):
+                        st.session_state.edit_mode = False
+                        st.rerun()
+
+                    if col2.button(SAVE_BUTTON, key="save_prompt"):
+                        # Get the file path
+                        file_path = PROMPTS_DIR / st.session_state.selected_prompt['File']
+                        try:
+                            # Keep the version being replaced so score shifts can be measured against it
+                            if file_version(file_path) == st.session_state.selected_prompt['Version']:
+                                record_prompt_version(file_path)
+                            # Save the edited content, refusing to overwrite a newer edit
+                            st.session_state.selected_prompt['Version'] = atomic_write_text(
+                                file_path,
+                                edited_content,
+                                expected_version=st.session_state.selected_prompt['Version']
+                            )
+                            st.success(PROMPT_SAVE_SUCCESS)
+                            st.session_state.edit_mode = False
+                            st.rerun()
+                        except WriteConflictError:
+                            st.error(FILE_CHANGED_ERROR)
+                        except Exception as e:
+                            st.error(PROMPT_SAVE_ERROR.format(str(e)))
+                else:
+                    st.text(read_text(PROMPTS_DIR / st.session_state.selected_prompt['File']))
+                    tokens, estimated = file_tokens(PROMPTS_DIR / st.session_state.selected_prompt['File'])
+                    st.caption(PROMPT_TOKENS_CAPTION.format(
+                        tokens,
+                        (PROMPT_TOKENS_ESTIMATED if estimated else "") +
+                        (PROMPT_TOKENS_PER_TURN if st.session_state.selected_prompt['File'] in MEETING_PROMPT_FILES else "")
+                    ))
+                    prompt_name = Path(st.session_state.selected_prompt['File']).stem
+                    if prompt_name in REEVALUATION_PROMPTS and list_prompt_versions(prompt_name):
+                        st.caption(REEVALUATE_HINT.format(REEVALUATION_PROMPTS[prompt_name]))
+                    col1, col2, col3 = st.columns([1, 1, 4])
+
+                    if col1.button(CLOSE_BUTTON, key="close_prompt"):
+                        st.session_state.selected_prompt = None
+                        st.rerun()
+
+                    if col2.button(EDIT_BUTTON, key="edit_prompt"):
+                        st.session_state.edit_mode = True
+                        st.rerun()
+
+    else:
+        st.write(NO_PROMPTS_FOUND)
+
+    # Re-evaluated on every rerun of the table, so a save that pushes a profile over budget warns at once
+    render_prompt_budget(meeting_budget_rows())
+
+start_run("settings")
+
 # Custom CSS for vertical alignment
 st.markdown(COMMON_TABLE_CSS, unsafe_allow_html=True)
 
@@ -43,76 +185,38 @@ if "selected_prompt" not in st.session_state:
     st.session_state.selected_prompt = None
     st.session_state.edit_mode = False
 
-# Get prompts and create dataframe
-prompts = list_prompts()
-if prompts:
-    # Create DataFrame
-    df = pd.DataFrame(prompts)
-    
-    # Format the Last Modified column
-    df['Last Modified'] = df['Last Modified'].dt.strftime('%Y-%m-%d')
-    
-    # Create columns with predefined layout
-    cols = st.columns(TABLE_LAYOUTS['settings'])
-    
-    # Table headers with consistent styling
-    for col, header in zip(cols, [
-        PROMPTS_TABLE_HEADERS['name'],
-        PROMPTS_TABLE_HEADERS['last_modified'],
-        PROMPTS_TABLE_HEADERS['action']
-    ]):
-        col.markdown(f"<div class='table-header'>{header}</div>", unsafe_allow_html=True)
-    
-    # Display each prompt as a row with a button
-    for idx, row in df.iterrows():
-        cols = st.columns(TABLE_LAYOUTS['settings'])
-        cols[0].markdown(f"<div class='table-cell'>{row['Name']}</div>", unsafe_allow_html=True)
-        cols[1].markdown(f"<div class='table-cell'>{row['Last Modified']}</div>", unsafe_allow_html=True)
-        if cols[2].button(VIEW_PROMPT_BUTTON, key=f"view_{idx}"):
-            st.session_state.selected_prompt = row
-            st.session_state.edit_mode = False
-    
-    # Display selected prompt content
-    if st.session_state.selected_prompt is not None:
-        st.markdown("---")
-        with st.expander(PROMPT_EXPANDER_TITLE.format(st.session_state.selected_prompt['Name']), expanded=True):
-            if st.session_state.edit_mode:
-                edited_content = st.text_area(
-                    EDIT_PROMPT_LABEL,
-                    value=st.session_state.selected_prompt['Content'],
-                    height=400
-                )
-                
-                col1, col2, col3 = st.columns([1, 1, 4])
-                
-                if col1.button(CANCEL_BUTTON, key="cancel_edit"):
-                    st.session_state.edit_mode = False
-                    st.rerun()
-                
-                if col2.button(SAVE_BUTTON, key="save_prompt"):
-                    # Get the file path
-                    file_path = PROMPTS_DIR / st.session_state.selected_prompt['File']
-                    try:
-                        # Save the edited content
-                        file_path.write_text(edited_content)
-                        st.success(PROMPT_SAVE_SUCCESS)
-                        # Update the content in session state
-                        st.session_state.selected_prompt['Content'] = edited_content
-                        st.session_state.edit_mode = False
-                        st.rerun()
-                    except Exception as e:
-                        st.error(PROMPT_SAVE_ERROR.format(str(e)))
-            else:
-                st.text(st.session_state.selected_prompt['Content'])
-                col1, col2, col3 = st.columns([1, 1, 4])
-                
-                if col1.button(CLOSE_BUTTON, key="close_prompt"):
-                    st.session_state.selected_prompt = None
-                    st.rerun()
-                
-                if col2.button(EDIT_BUTTON, key="edit_prompt"):
-                    st.session_state.edit_mode = True
-                    st.rerun()
-
-else:
-    st.write(NO_PROMPTS_FOUND)
\ No newline at end of file
+prompt_table()
+
+# Shared API queue status
+with st.expander(API_QUEUE_TITLE):
+    queue = rate_limiter.snapshot()
+    st.caption(API_QUEUE_CAPACITY.format(queue['available_requests'], queue['available_tokens']))
+    st.dataframe(
+        pd.DataFrame(queue['modes']).rename(columns=API_QUEUE_TABLE_HEADERS),
+        hide_index=True,
+        use_container_width=True
+    )
+
+# Memory held by this browser session, by session state key
+with st.expander(SESSION_MEMORY_TITLE):
+    sizes = session_state_sizes(st.session_state)
+    st.caption(SESSION_MEMORY_SUMMARY.format(
+        sum(row['bytes'] for row in sizes) / 1024,
+        len(sizes),
+        process_rss_bytes() / 2 ** 20
+    ))
+    cache = cache_stats()
+    st.caption(CONTENT_CACHE_SUMMARY.format(
+        cache['entries'],
+        cache['bytes'] / 1024,
+        cache['max_bytes'] / 1024,
+        cache['hits'],
+        cache['misses']
+    ))
+    st.dataframe(
+        pd.DataFrame(sizes).rename(columns=SESSION_MEMORY_TABLE_HEADERS),
+        hide_index=True,
+        use_container_width=True
+    )
+
+render_overlay()
\ No newline at end of file
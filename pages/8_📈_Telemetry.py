@@ -0,0 +1,117 @@
+import streamlit as st
+import pandas as pd
+
+from core.strings import *
+from core.styles import *
+from core.telemetry import iter_llm_calls, iter_reruns
+from core.profiling import profiled, render_overlay, start_run
+
+TOKEN_COLUMNS = [
+    "input_tokens",
+    "output_tokens",
+    "cache_read_input_tokens",
+    "cache_creation_input_tokens"
+]
+
+@profiled
+def summarize_calls(df, group_by):
+    """Latency percentiles and token spend per group"""
+    grouped = df.groupby(group_by)
+    summary = pd.DataFrame({
+        "calls": grouped.size(),
+        "errors": grouped["error"].count(),
+        "latency_p50": grouped["latency_s"].quantile(0.50),
+        "latency_p95": grouped["latency_s"].quantile(0.95),
+        "latency_p99": grouped["latency_s"].quantile(0.99),
+        "ttft_p50": grouped["ttft_s"].quantile(0.50),
+        "ttft_p95": grouped["ttft_s"].quantile(0.95)
+    })
+    summary = summary.join(grouped[TOKEN_COLUMNS].sum().astype(int))
+    return summary.round(2).rename(columns=TELEMETRY_TABLE_HEADERS)
+
+@profiled
+def summarize_reruns(df):
+    """Run and render time percentiles per page, rerun scope and meeting length (10-message buckets)"""
+    df = df.assign(length=(df["messages"].fillna(0) // 10 * 10).astype(int))
+    grouped = df.groupby(["page", "scope", "length"])
+    summary = pd.DataFrame({
+        "runs": grouped.size(),
+        "seconds_p50": grouped["seconds"].quantile(0.50),
+        "seconds_p95": grouped["seconds"].quantile(0.95),
+        "render_p50": grouped["render_seconds"].quantile(0.50),
+        "render_p95": grouped["render_seconds"].quantile(0.95)
+    })
+    return summary.round(3).rename(columns=TELEMETRY_RERUN_HEADERS)
+
+@profiled
+def summarize_hedging(df):
+    """Hedge rate, first token percentiles and the token cost of cancelled duplicates per mode"""
+    cancelled = df[df["hedge"] == "cancelled"]
+    served = df[df["hedge"].isin(["none", "primary", "duplicate"])]
+    grouped = served.groupby("mode")
+    tokens = served.groupby("mode")[["input_tokens", "output_tokens"]].sum().sum(axis=1)
+    hedge_tokens = cancelled.groupby("mode")[["input_tokens", "output_tokens"]].sum().sum(axis=1)
+    summary = pd.DataFrame({
+        "calls": grouped.size(),
+        "hedged": grouped["hedge"].apply(lambda hedge: hedge.isin(["primary", "duplicate"]).sum()),
+        "duplicate_wins": grouped["hedge"].apply(lambda hedge: (hedge == "duplicate").sum()),
+        "ttft_p50": grouped["ttft_s"].quantile(0.50),
+        "ttft_p99": grouped["ttft_s"].quantile(0.99)
+    })
+    summary["hedge_rate"] = summary["hedged"] / summary["calls"]
+    summary["hedge_tokens"] = hedge_tokens.reindex(summary.index).fillna(0).astype(int)
+    summary["hedge_token_share"] = summary["hedge_tokens"] / tokens.reindex(summary.index).replace(0, pd.NA)
+    summary = summary[list(TELEMETRY_HEDGING_HEADERS)]
+    return summary.round(3).rename(columns=TELEMETRY_HEDGING_HEADERS)
+
+start_run("telemetry")
+
+st.title(TELEMETRY_PAGE_TITLE)
+
+calls = list(iter_llm_calls())
+if calls:
+    df = pd.DataFrame(calls)
+    for column in TOKEN_COLUMNS:
+        df[column] = pd.to_numeric(df.get(column), errors="coerce").fillna(0)
+    df["ttft_s"] = pd.to_numeric(df["ttft_s"], errors="coerce")
+    df["persona"] = df["persona"].fillna(TELEMETRY_NO_PERSONA)
+    # Calls recorded before model routing were all served by the first tier
+    df["tier"] = pd.to_numeric(df["tier"], errors="coerce").fillna(0).astype(int) if "tier" in df else 0
+
+    st.caption(TELEMETRY_SUMMARY.format(
+        len(df),
+        int(df["error"].count()),
+        int(df["input_tokens"].sum()),
+        int(df["output_tokens"].sum()),
+        int(df["cache_read_input_tokens"].sum())
+    ))
+
+    # Duplicates cancelled by hedging never served a reply; the hedging table accounts for them
+    served = df[df["hedge"] != "cancelled"] if "hedge" in df else df
+
+    st.subheader(TELEMETRY_BY_MODE_TITLE)
+    st.dataframe(summarize_calls(served, "mode"), use_container_width=True)
+
+    st.subheader(TELEMETRY_BY_TIER_TITLE)
+    st.dataframe(summarize_calls(served, ["mode", "tier", "model"]), use_container_width=True)
+
+    # Only calls made with hedging enabled carry a hedge outcome
+    if "hedge" in df and df["hedge"].notna().any():
+        st.subheader(TELEMETRY_HEDGING_TITLE)
+        st.dataframe(summarize_hedging(df), use_container_width=True)
+
+    st.subheader(TELEMETRY_BY_PERSONA_TITLE)
+    st.dataframe(summarize_calls(served, "persona"), use_container_width=True)
+
+    st.subheader(TELEMETRY_BY_DAY_TITLE)
+    st.dataframe(summarize_calls(served, "day").sort_index(ascending=False), use_container_width=True)
+else:
+    st.write(NO_TELEMETRY_FOUND)
+
+
+reruns = list(iter_reruns())
+if reruns:
+    st.subheader(TELEMETRY_RERUNS_TITLE)
+    st.dataframe(summarize_reruns(pd.DataFrame(reruns)), use_container_width=True)
+
+render_overlay()
\ No newline at end of file